@@ -0,0 +1,60 @@
+"""Checkout idempotency and library uniqueness
+
+Revision ID: 4f2c9a7e1b3d
+Revises: d0a3a181d787
+Create Date: 2026-10-19 09:12:40.118302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f2c9a7e1b3d'
+down_revision = 'd0a3a181d787'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'uq_orders_payment_intent_id',
+        'orders',
+        ['payment_intent_id'],
+        unique=True,
+        postgresql_where=sa.text('payment_intent_id IS NOT NULL'),
+    )
+    # Merge duplicate library rows into the earliest purchase before the
+    # unique index can be built, keeping their combined download history
+    op.execute("""
+        UPDATE user_library AS kept
+        SET download_count = merged.download_count,
+            last_downloaded_at = merged.last_downloaded_at
+        FROM (
+            SELECT user_id, audiobook_id,
+                   SUM(COALESCE(download_count, 0)) AS download_count,
+                   MAX(last_downloaded_at) AS last_downloaded_at
+            FROM user_library
+            GROUP BY user_id, audiobook_id
+            HAVING COUNT(*) > 1
+        ) AS merged
+        WHERE kept.user_id = merged.user_id AND kept.audiobook_id = merged.audiobook_id
+    """)
+    op.execute("""
+        DELETE FROM user_library AS duplicate
+        USING user_library AS kept
+        WHERE duplicate.user_id = kept.user_id
+          AND duplicate.audiobook_id = kept.audiobook_id
+          AND (duplicate.purchased_at, duplicate.id) > (kept.purchased_at, kept.id)
+    """)
+    op.create_index(
+        'uq_user_library_user_audiobook',
+        'user_library',
+        ['user_id', 'audiobook_id'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_user_library_user_audiobook', table_name='user_library')
+    op.drop_index('uq_orders_payment_intent_id', table_name='orders')
@@ -0,0 +1,47 @@
+"""Composite and partial indexes for hot queries
+
+Revision ID: 8b1e5d3c7a92
+Revises: 4f2c9a7e1b3d
+Create Date: 2026-10-19 14:03:27.551930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1e5d3c7a92'
+down_revision = '4f2c9a7e1b3d'
+branch_labels = None
+depends_on = None
+
+# name, table, columns, partial index predicate
+INDEXES = [
+    ('ix_audio_files_audiobook_id_chapter_number', 'audio_files', ['audiobook_id', 'chapter_number'], None),
+    ('ix_cart_items_user_id_audiobook_id', 'cart_items', ['user_id', 'audiobook_id'], None),
+    ('ix_reviews_user_id_audiobook_id', 'reviews', ['user_id', 'audiobook_id'], None),
+    ('ix_download_logs_user_id_created_at', 'download_logs', ['user_id', 'created_at'], None),
+    ('ix_user_library_user_id_purchased_at', 'user_library', ['user_id', 'purchased_at', 'id'], None),
+    ('ix_audiobooks_published_created_at', 'audiobooks', ['created_at'], "status = 'published'"),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction. If it fails
+    # it leaves an INVALID index behind; drop it before retrying.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
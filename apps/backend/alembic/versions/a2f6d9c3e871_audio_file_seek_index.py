@@ -0,0 +1,24 @@
+"""Audio file seek index
+
+Revision ID: a2f6d9c3e871
+Revises: e7a94c2b6d15
+Create Date: 2026-10-19 20:41:07.214583
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2f6d9c3e871'
+down_revision = 'e7a94c2b6d15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('audio_files', sa.Column('seek_index', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('audio_files', 'seek_index')
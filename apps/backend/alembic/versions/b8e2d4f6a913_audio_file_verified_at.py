@@ -0,0 +1,28 @@
+"""Audio file verified_at
+
+Revision ID: b8e2d4f6a913
+Revises: f3b7c1d9a5e2
+Create Date: 2026-10-19 23:14:52.803165
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e2d4f6a913'
+down_revision = 'f3b7c1d9a5e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('audio_files', sa.Column('verified_at', sa.DateTime(timezone=True), nullable=True))
+    # Only the verifier writes seek indexes, so those rows were read back from
+    # storage. A checksum alone may have come from the client; such rows are
+    # picked up by the next verification backfill.
+    op.execute("UPDATE audio_files SET verified_at = now() WHERE seek_index IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.drop_column('audio_files', 'verified_at')
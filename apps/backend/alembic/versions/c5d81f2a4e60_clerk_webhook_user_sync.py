@@ -0,0 +1,28 @@
+"""Clerk webhook user sync
+
+Revision ID: c5d81f2a4e60
+Revises: 8b1e5d3c7a92
+Create Date: 2026-10-19 16:48:05.207114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d81f2a4e60'
+down_revision = '8b1e5d3c7a92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('user_profiles', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    # The model has always declared created_by nullable; profiles synced
+    # from Clerk have no creator.
+    op.alter_column('user_profiles', 'created_by', existing_type=sa.UUID(), nullable=True)
+
+
+def downgrade() -> None:
+    op.alter_column('user_profiles', 'created_by', existing_type=sa.UUID(), nullable=False)
+    op.drop_column('user_profiles', 'deleted_at')
@@ -0,0 +1,26 @@
+"""Audio file stream properties
+
+Revision ID: e7a94c2b6d15
+Revises: c5d81f2a4e60
+Create Date: 2026-10-19 18:12:40.531902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a94c2b6d15'
+down_revision = 'c5d81f2a4e60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('audio_files', sa.Column('bitrate_bps', sa.Integer(), nullable=True))
+    op.add_column('audio_files', sa.Column('sample_rate_hz', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('audio_files', 'sample_rate_hz')
+    op.drop_column('audio_files', 'bitrate_bps')
@@ -0,0 +1,24 @@
+"""Clerk user updated_at
+
+Revision ID: f3b7c1d9a5e2
+Revises: a2f6d9c3e871
+Create Date: 2026-10-19 22:06:31.540218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b7c1d9a5e2'
+down_revision = 'a2f6d9c3e871'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('user_profiles', sa.Column('clerk_updated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('user_profiles', 'clerk_updated_at')
@@ -1,9 +1,14 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import health, categories, audiobooks, audio_files
+from app.api.v1.endpoints import health, categories, audiobooks, audio_files, cart, library, admin, webhooks, storage
 
 api_router = APIRouter()
 api_router.include_router(health.router, prefix="/health", tags=["health"])
 api_router.include_router(categories.router, prefix="/categories", tags=["categories"])
 api_router.include_router(audiobooks.router, prefix="/audiobooks", tags=["audiobooks"])
 api_router.include_router(audio_files.router, prefix="/audio-files", tags=["audio-files"])
+api_router.include_router(cart.router, prefix="/cart", tags=["cart"])
+api_router.include_router(library.router, prefix="/library", tags=["library"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
+api_router.include_router(storage.router, prefix="/storage", tags=["storage"])
@@ -0,0 +1,97 @@
+from typing import Dict
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import get_clerk_auth, get_current_admin_user
+from app.core.entitlements import entitlement_cache
+from app.core.sample_clips import sample_clip_generator
+from app.core.storage import get_storage
+from app.core.storage_gc import storage_deleter, storage_reconciler
+from app.core.upload_verifier import audio_file_verifier
+from app.core.user_cache import user_cache
+from app.db.database import get_async_db, get_async_engine, get_engine, get_replica_engine, get_replica_monitor
+from app.db.pool import pool_status
+from app.repositories.audio_file import AsyncAudioFileRepository
+from app.schemas.auth import UserProfileResponse
+
+router = APIRouter()
+
+
+@router.get("/db/pool")
+async def get_pool_metrics(
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
+) -> Dict[str, Dict]:
+    """Get live connection pool metrics (Admin only)."""
+    metrics = {
+        "async": pool_status(get_async_engine().pool),
+        "sync": pool_status(get_engine().pool),
+    }
+    replica_engine = get_replica_engine()
+    if replica_engine is not None:
+        metrics["replica"] = {
+            **pool_status(replica_engine.pool),
+            **get_replica_monitor().status(),
+        }
+    return metrics
+
+
+@router.get("/caches")
+async def get_cache_metrics(
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
+) -> Dict[str, Dict]:
+    """Get hit/miss counters for the in-process caches (Admin only)."""
+    return {
+        "verified_tokens": get_clerk_auth().token_cache.stats(),
+        "clerk_identities": get_clerk_auth().identity_cache.stats(),
+        "user_profiles": user_cache.stats(),
+        "entitlements": entitlement_cache.stats(),
+        "download_urls": get_storage().download_url_cache.stats(),
+    }
+
+
+@router.get("/storage")
+async def get_storage_gc_status(
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
+) -> Dict[str, Dict]:
+    """Get background deletion and verification counters and the last reconcile and sample runs (Admin only)."""
+    return {
+        "deletes": storage_deleter.stats(),
+        "verification": audio_file_verifier.stats(),
+        "last_reconcile": storage_reconciler.last_run or {},
+        "last_samples": sample_clip_generator.last_run or {},
+    }
+
+
+@router.post("/storage/reconcile")
+async def reconcile_storage(
+    dry_run: bool = Query(True, description="Only report orphaned objects"),
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
+) -> Dict:
+    """Find objects no row references and queue them for deletion (Admin only)."""
+    return await storage_reconciler.run_once(dry_run=dry_run)
+
+
+@router.post("/audio-files/verify")
+async def verify_audio_files(
+    limit: int = Query(1000, ge=1, le=10000, description="Most files to queue"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
+) -> Dict[str, int]:
+    """Queue audio files that were never verified for verification (Admin only)."""
+    audio_file_ids = await AsyncAudioFileRepository(db).get_unverified_ids(limit)
+    audio_file_verifier.enqueue(audio_file_ids)
+    return {"queued": len(audio_file_ids)}
+
+
+@router.post("/audiobooks/samples", status_code=status.HTTP_202_ACCEPTED)
+async def generate_audiobook_samples(
+    limit: int = Query(100, ge=1, le=1000, description="Most audiobooks to process"),
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
+) -> Dict[str, bool]:
+    """Start cutting samples from first chapters for audiobooks without an up-to-date one (Admin only).
+
+    The batch runs in the background; its counts appear under ``last_samples``
+    on GET /admin/storage when it finishes.
+    """
+    return {"started": sample_clip_generator.start(limit)}
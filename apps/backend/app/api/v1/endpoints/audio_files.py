@@ -1,43 +1,79 @@
+import math
+import time
 from typing import List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.db.database import get_async_db
+from app.core.config import settings
 from app.core.auth import get_current_admin_user, get_current_user_response
-from app.core.spaces import spaces_client
-from app.models.user import UserProfile
-from app.repositories.audio_file import AudioFileRepository
-from app.repositories.audiobook import AudiobookRepository
+from app.core.storage import get_storage
+from app.core.seek_index import lookup_seek_index
+from app.core.storage_gc import storage_deleter
+from app.core.streaming import stream_object
+from app.core.upload_verifier import audio_file_verifier
+from app.models.enums import UserRole
+from app.schemas.auth import UserProfileResponse
+from app.repositories.audio_file import AsyncAudioFileRepository
+from app.repositories.audiobook import AsyncAudiobookRepository
+from app.repositories.library import AsyncLibraryRepository
 from app.schemas.audio_file import (
     AudioFileCreate, 
     AudioFileUpdate, 
     AudioFileResponse,
+    AudioFileDownloadResponse,
+    AudioFileSeekResponse,
     PreSignedUrlRequest,
-    PreSignedUrlResponse
+    PreSignedUrlResponse,
+    PreSignedUrlBatchRequest,
+    PreSignedUrlBatchResponse,
+    MultipartUploadCreateRequest,
+    MultipartUploadCreateResponse,
+    MultipartUploadRef,
+    MultipartUploadPartsRequest,
+    MultipartUploadPartsResponse,
+    MultipartUploadListPartsResponse,
+    MultipartUploadCompleteRequest,
+    MultipartUploadCompleteResponse
 )
 
 router = APIRouter()
 
 
+def _upload_folder(file_type: str) -> str:
+    """Determine folder based on file type."""
+    if file_type.startswith("image/"):
+        return "images"
+    return "audio-files"
+
+
+# S3 multipart limits
+MIN_PART_SIZE_BYTES = 5 * 1024 * 1024
+MAX_PART_COUNT = 10000
+
+
+def _check_multipart_upload(upload: MultipartUploadRef) -> None:
+    """Only allow multipart calls on keys this API hands out."""
+    if not upload.object_key.startswith(("audio-files/", "images/")) or ".." in upload.object_key:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid upload object key"
+        )
+
+
 @router.post("/presigned-url", response_model=PreSignedUrlResponse)
 async def get_presigned_url(
     request: PreSignedUrlRequest,
-    current_user: UserProfile = Depends(get_current_admin_user)
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
 ):
     """Generate presigned URL for file upload (Admin only)."""
     try:
-        # Determine folder based on file type
-        folder = "audio-files"
-        if request.file_type.startswith("image/"):
-            folder = "images"
-        elif request.file_type.startswith("audio/"):
-            folder = "audio-files"
-        
-        result = spaces_client.generate_presigned_url(
+        result = get_storage().generate_presigned_url(
             file_name=request.file_name,
             file_type=request.file_type,
-            folder=folder
+            folder=_upload_folder(request.file_type)
         )
         
         return PreSignedUrlResponse(
@@ -53,18 +89,199 @@ async def get_presigned_url(
         )
 
 
+@router.post("/presigned-urls", response_model=PreSignedUrlBatchResponse)
+async def get_presigned_urls(
+    request: PreSignedUrlBatchRequest,
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
+):
+    """Generate presigned upload URLs for several files in one call (Admin only).
+
+    Signing is local HMAC work (no storage round trips), so a whole book's
+    chapters are presigned in a few milliseconds.
+    """
+    if not request.files:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No files to presign"
+        )
+    if len(request.files) > settings.PRESIGN_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.PRESIGN_BATCH_MAX_FILES} files can be presigned per request"
+        )
+
+    results = get_storage().generate_presigned_urls(
+        (file.file_name, file.file_type, _upload_folder(file.file_type))
+        for file in request.files
+    )
+
+    return PreSignedUrlBatchResponse(
+        uploads=[
+            PreSignedUrlResponse(
+                upload_url=result["upload_url"],
+                file_url=result["file_url"],
+                expires_in=result["expires_in"]
+            )
+            for result in results
+        ]
+    )
+
+
+@router.post("/multipart-uploads", response_model=MultipartUploadCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_multipart_upload(
+    request: MultipartUploadCreateRequest,
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
+):
+    """Start a resumable multipart upload for a large file (Admin only).
+
+    The client presigns and uploads ``part_count`` parts of ``part_size``
+    bytes (the last one may be shorter), in parallel and in any order.
+    """
+    if request.file_size <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File size must be positive"
+        )
+
+    part_size = max(
+        settings.MULTIPART_PART_SIZE_BYTES,
+        MIN_PART_SIZE_BYTES,
+        math.ceil(request.file_size / MAX_PART_COUNT)
+    )
+    try:
+        result = await run_in_threadpool(
+            get_storage().create_multipart_upload,
+            file_name=request.file_name,
+            file_type=request.file_type,
+            folder=_upload_folder(request.file_type)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+    return MultipartUploadCreateResponse(
+        upload_id=result["upload_id"],
+        object_key=result["object_key"],
+        file_url=result["file_url"],
+        part_size=part_size,
+        part_count=math.ceil(request.file_size / part_size)
+    )
+
+
+@router.post("/multipart-uploads/parts", response_model=MultipartUploadPartsResponse)
+async def get_multipart_upload_part_urls(
+    request: MultipartUploadPartsRequest,
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
+):
+    """Presign upload URLs for a batch of parts (Admin only)."""
+    _check_multipart_upload(request)
+    if not request.part_numbers or len(request.part_numbers) > settings.MULTIPART_PRESIGN_MAX_PARTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Between 1 and {settings.MULTIPART_PRESIGN_MAX_PARTS} parts can be presigned per request"
+        )
+    if any(not 1 <= part_number <= MAX_PART_COUNT for part_number in request.part_numbers):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Part numbers must be between 1 and {MAX_PART_COUNT}"
+        )
+
+    expires_in = 3600
+    parts = get_storage().generate_part_upload_urls(
+        request.object_key,
+        request.upload_id,
+        request.part_numbers,
+        expires_in=expires_in
+    )
+    return MultipartUploadPartsResponse(parts=parts, expires_in=expires_in)
+
+
+@router.get("/multipart-uploads/parts", response_model=MultipartUploadListPartsResponse)
+async def list_multipart_upload_parts(
+    upload: MultipartUploadRef = Depends(),
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
+):
+    """List the parts already uploaded, so an interrupted upload can resume (Admin only)."""
+    _check_multipart_upload(upload)
+    try:
+        parts = await run_in_threadpool(get_storage().list_parts, upload.object_key, upload.upload_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    return MultipartUploadListPartsResponse(parts=parts)
+
+
+@router.post("/multipart-uploads/complete", response_model=MultipartUploadCompleteResponse)
+async def complete_multipart_upload(
+    request: MultipartUploadCompleteRequest,
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
+):
+    """Assemble the uploaded parts into the final object (Admin only).
+
+    Parts are read back from storage rather than trusted from the client, so
+    browsers do not need access to the per-part ETag response headers.
+    """
+    _check_multipart_upload(request)
+    try:
+        parts = await run_in_threadpool(get_storage().list_parts, request.object_key, request.upload_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+    uploaded = {part["part_number"] for part in parts}
+    missing = [number for number in range(1, request.part_count + 1) if number not in uploaded]
+    if missing or len(parts) != request.part_count:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Upload is incomplete; missing parts: {missing[:20]}" if missing
+            else "Upload has more parts than expected"
+        )
+
+    try:
+        await run_in_threadpool(
+            get_storage().complete_multipart_upload, request.object_key, request.upload_id, parts
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+    return MultipartUploadCompleteResponse(
+        object_key=request.object_key,
+        file_url=get_storage().public_url(request.object_key),
+        file_size=sum(part["size"] for part in parts)
+    )
+
+
+@router.post("/multipart-uploads/abort", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_multipart_upload(
+    request: MultipartUploadRef,
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
+):
+    """Abort a multipart upload and discard its parts (Admin only)."""
+    _check_multipart_upload(request)
+    await run_in_threadpool(get_storage().abort_multipart_upload, request.object_key, request.upload_id)
+
+
 @router.post("/", response_model=AudioFileResponse, status_code=status.HTTP_201_CREATED)
 async def create_audio_file(
     audio_file_data: AudioFileCreate,
-    db: Session = Depends(get_db),
-    current_user: UserProfile = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
 ):
     """Create a new audio file (Admin only)."""
-    audio_file_repo = AudioFileRepository(db)
-    audiobook_repo = AudiobookRepository(db)
+    audio_file_repo = AsyncAudioFileRepository(db)
+    audiobook_repo = AsyncAudiobookRepository(db)
     
     # Validate audiobook exists
-    audiobook = audiobook_repo.get(audio_file_data.audiobook_id)
+    audiobook = await audiobook_repo.get(audio_file_data.audiobook_id)
     if not audiobook:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -73,7 +290,7 @@ async def create_audio_file(
     
     # Check if chapter number already exists for this audiobook
     if audio_file_data.chapter_number:
-        existing_file = audio_file_repo.get_by_chapter(
+        existing_file = await audio_file_repo.get_by_chapter(
             audio_file_data.audiobook_id, 
             audio_file_data.chapter_number
         )
@@ -83,7 +300,7 @@ async def create_audio_file(
                 detail="Chapter number already exists for this audiobook"
             )
     
-    audio_file = audio_file_repo.create_audio_file(
+    audio_file = await audio_file_repo.create_audio_file(
         audiobook_id=audio_file_data.audiobook_id,
         file_url=audio_file_data.file_url,
         chapter_number=audio_file_data.chapter_number,
@@ -93,6 +310,12 @@ async def create_audio_file(
         mime_type=audio_file_data.mime_type,
         checksum=audio_file_data.checksum
     )
+
+    if audio_file.duration_seconds is not None:
+        await audiobook_repo.refresh_duration(audio_file.audiobook_id)
+
+    # Size, type, checksum and duration are read back from the stored file
+    audio_file_verifier.enqueue([audio_file.id])
     
     return AudioFileResponse(
         id=audio_file.id,
@@ -104,6 +327,8 @@ async def create_audio_file(
         duration_seconds=audio_file.duration_seconds,
         mime_type=audio_file.mime_type,
         checksum=audio_file.checksum,
+        bitrate_bps=audio_file.bitrate_bps,
+        sample_rate_hz=audio_file.sample_rate_hz,
         created_at=audio_file.created_at.isoformat()
     )
 
@@ -111,22 +336,22 @@ async def create_audio_file(
 @router.get("/audiobook/{audiobook_id}", response_model=List[AudioFileResponse])
 async def get_audiobook_files(
     audiobook_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: UserProfile = Depends(get_current_user_response)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_user_response)
 ):
     """Get all audio files for an audiobook."""
-    audio_file_repo = AudioFileRepository(db)
-    audiobook_repo = AudiobookRepository(db)
+    audio_file_repo = AsyncAudioFileRepository(db)
+    audiobook_repo = AsyncAudiobookRepository(db)
     
     # Validate audiobook exists
-    audiobook = audiobook_repo.get(audiobook_id)
+    audiobook = await audiobook_repo.get(audiobook_id)
     if not audiobook:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Audiobook not found"
         )
     
-    audio_files = audio_file_repo.get_chapters_ordered(audiobook_id)
+    audio_files = await audio_file_repo.get_chapters_ordered(audiobook_id)
     
     return [
         AudioFileResponse(
@@ -139,6 +364,8 @@ async def get_audiobook_files(
             duration_seconds=audio_file.duration_seconds,
             mime_type=audio_file.mime_type,
             checksum=audio_file.checksum,
+            bitrate_bps=audio_file.bitrate_bps,
+            sample_rate_hz=audio_file.sample_rate_hz,
             created_at=audio_file.created_at.isoformat()
         )
         for audio_file in audio_files
@@ -148,12 +375,12 @@ async def get_audiobook_files(
 @router.get("/{audio_file_id}", response_model=AudioFileResponse)
 async def get_audio_file(
     audio_file_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: UserProfile = Depends(get_current_user_response)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_user_response)
 ):
     """Get a specific audio file."""
-    audio_file_repo = AudioFileRepository(db)
-    audio_file = audio_file_repo.get(audio_file_id)
+    audio_file_repo = AsyncAudioFileRepository(db)
+    audio_file = await audio_file_repo.get(audio_file_id)
     
     if not audio_file:
         raise HTTPException(
@@ -171,20 +398,128 @@ async def get_audio_file(
         duration_seconds=audio_file.duration_seconds,
         mime_type=audio_file.mime_type,
         checksum=audio_file.checksum,
+        bitrate_bps=audio_file.bitrate_bps,
+        sample_rate_hz=audio_file.sample_rate_hz,
         created_at=audio_file.created_at.isoformat()
     )
 
 
+async def _get_entitled_audio_file(
+    audio_file_id: UUID,
+    db: AsyncSession,
+    current_user: UserProfileResponse
+):
+    """Get an audio file, checking the user owns its audiobook (admins may access any)."""
+    audio_file_repo = AsyncAudioFileRepository(db)
+    audio_file = await audio_file_repo.get(audio_file_id)
+
+    if not audio_file:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audio file not found"
+        )
+
+    if current_user.role not in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
+        library_repo = AsyncLibraryRepository(db)
+        if not await library_repo.has_audiobook(current_user.id, audio_file.audiobook_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Audiobook not in library"
+            )
+
+    return audio_file
+
+
+@router.get("/{audio_file_id}/download-url", response_model=AudioFileDownloadResponse)
+async def get_audio_file_download_url(
+    audio_file_id: UUID,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_user_response)
+):
+    """Get a signed, expiring download URL for an audio file the user owns."""
+    audio_file = await _get_entitled_audio_file(audio_file_id, db, current_user)
+
+    storage = get_storage()
+    download = storage.get_download_url(storage.object_key_from_url(audio_file.file_url))
+
+    # The same URL is returned until its bucket ends, so clients may reuse it
+    max_age = max(0, int(download["refresh_at"] - time.time()))
+    response.headers["Cache-Control"] = f"private, max-age={max_age}"
+
+    return AudioFileDownloadResponse(
+        download_url=download["url"],
+        expires_at=download["expires_at"]
+    )
+
+
+@router.get("/{audio_file_id}/stream")
+async def stream_audio_file(
+    audio_file_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_user_response)
+):
+    """Stream an audio file the user owns.
+
+    Honors ``Range`` and ``If-Range``, so a seek costs one small ranged read
+    from storage rather than a transfer of the whole file.
+    """
+    audio_file = await _get_entitled_audio_file(audio_file_id, db, current_user)
+    # Hand the connection back before streaming; the session would otherwise
+    # hold it until the last byte is sent.
+    await db.close()
+
+    storage = get_storage()
+    object_key = storage.object_key_from_url(audio_file.file_url)
+    info = await run_in_threadpool(storage.get_file_info, object_key)
+    if info is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audio file not found in storage"
+        )
+
+    return stream_object(storage, object_key, info, request.headers)
+
+
+@router.get("/{audio_file_id}/seek", response_model=AudioFileSeekResponse)
+async def seek_audio_file(
+    audio_file_id: UUID,
+    t: float = Query(..., ge=0, description="Playback position in seconds"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_user_response)
+):
+    """Translate a playback position into the byte range to request from ``/stream``.
+
+    Uses the seek table built when the MP3 was verified, so the player can
+    start decoding at a frame boundary with a single ranged read.
+    """
+    await _get_entitled_audio_file(audio_file_id, db, current_user)
+    seek_index = await AsyncAudioFileRepository(db).get_seek_index(audio_file_id)
+    if seek_index is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audio file has no seek index"
+        )
+
+    time_seconds, byte_offset = lookup_seek_index(seek_index, t)
+    return AudioFileSeekResponse(
+        time_seconds=time_seconds,
+        byte_offset=byte_offset,
+        range=f"bytes={byte_offset}-"
+    )
+
+
 @router.put("/{audio_file_id}", response_model=AudioFileResponse)
 async def update_audio_file(
     audio_file_id: UUID,
     audio_file_data: AudioFileUpdate,
-    db: Session = Depends(get_db),
-    current_user: UserProfile = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
 ):
     """Update an audio file (Admin only)."""
-    audio_file_repo = AudioFileRepository(db)
-    audio_file = audio_file_repo.get(audio_file_id)
+    audio_file_repo = AsyncAudioFileRepository(db)
+    audio_file = await audio_file_repo.get(audio_file_id)
     
     if not audio_file:
         raise HTTPException(
@@ -194,7 +529,7 @@ async def update_audio_file(
     
     # Check if chapter number already exists for this audiobook (excluding current file)
     if audio_file_data.chapter_number and audio_file_data.chapter_number != audio_file.chapter_number:
-        existing_file = audio_file_repo.get_by_chapter(
+        existing_file = await audio_file_repo.get_by_chapter(
             audio_file.audiobook_id, 
             audio_file_data.chapter_number
         )
@@ -206,7 +541,15 @@ async def update_audio_file(
     
     # Update audio file
     update_data = audio_file_data.model_dump(exclude_unset=True)
-    updated_audio_file = audio_file_repo.update(audio_file, update_data)
+    previous_file_url = audio_file.file_url
+    if update_data.get("file_url", previous_file_url) != previous_file_url:
+        # The new object has not been read back yet
+        update_data["verified_at"] = None
+    updated_audio_file = await audio_file_repo.update(audio_file, update_data)
+    if "duration_seconds" in update_data:
+        await AsyncAudiobookRepository(db).refresh_duration(updated_audio_file.audiobook_id)
+    if updated_audio_file.file_url != previous_file_url:
+        audio_file_verifier.enqueue([updated_audio_file.id])
     
     return AudioFileResponse(
         id=updated_audio_file.id,
@@ -218,6 +561,8 @@ async def update_audio_file(
         duration_seconds=updated_audio_file.duration_seconds,
         mime_type=updated_audio_file.mime_type,
         checksum=updated_audio_file.checksum,
+        bitrate_bps=updated_audio_file.bitrate_bps,
+        sample_rate_hz=updated_audio_file.sample_rate_hz,
         created_at=updated_audio_file.created_at.isoformat()
     )
 
@@ -225,12 +570,12 @@ async def update_audio_file(
 @router.delete("/{audio_file_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_audio_file(
     audio_file_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: UserProfile = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
 ):
     """Delete an audio file (Admin only)."""
-    audio_file_repo = AudioFileRepository(db)
-    audio_file = audio_file_repo.get(audio_file_id)
+    audio_file_repo = AsyncAudioFileRepository(db)
+    audio_file = await audio_file_repo.get(audio_file_id)
     
     if not audio_file:
         raise HTTPException(
@@ -238,16 +583,8 @@ async def delete_audio_file(
             detail="Audio file not found"
         )
     
-    # Extract object key from file URL for deletion from Spaces
-    try:
-        # Assuming file_url format: https://cdn.example.com/folder/filename.ext
-        # Extract the path after the domain
-        file_url = audio_file.file_url
-        if "/" in file_url:
-            object_key = "/".join(file_url.split("/")[3:])  # Remove domain part
-            spaces_client.delete_file(object_key)
-    except Exception as e:
-        print(f"Error deleting file from Spaces: {e}")
-        # Continue with database deletion even if Spaces deletion fails
-    
-    audio_file_repo.delete(audio_file_id)
+    await audio_file_repo.delete(audio_file_id)
+    await AsyncAudiobookRepository(db).refresh_duration(audio_file.audiobook_id)
+
+    # Remove the file from storage in the background once the row is gone
+    storage_deleter.enqueue([get_storage().owned_object_key(audio_file.file_url)])
@@ -1,14 +1,17 @@
 from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
-from app.core.auth import get_current_admin_user, get_current_user_response
-from app.core.spaces import spaces_client
-from app.models.user import UserProfile
-from app.repositories.audiobook import AudiobookRepository
-from app.repositories.category import CategoryRepository
+from app.db.database import get_async_db, get_read_db
+from app.core.auth import get_current_admin_user, get_current_user_response, get_optional_current_user
+from app.core.storage import get_storage
+from app.core.storage_gc import storage_deleter
+from app.schemas.auth import UserProfileResponse
+from app.repositories.audio_file import AsyncAudioFileRepository
+from app.repositories.audiobook import AsyncAudiobookRepository
+from app.repositories.category import AsyncCategoryRepository
+from app.repositories.library import AsyncLibraryRepository
 from app.schemas.audiobook import AudiobookCreate, AudiobookUpdate, AudiobookResponse, AudiobookListResponse
 from app.schemas.audio_file import PreSignedUrlRequest, PreSignedUrlResponse
 
@@ -18,7 +21,7 @@ router = APIRouter()
 @router.post("/presigned-url", response_model=PreSignedUrlResponse)
 async def get_presigned_url(
     request: PreSignedUrlRequest,
-    current_user: UserProfile = Depends(get_current_admin_user)
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
 ):
     """Generate presigned URL for file upload (Admin only)."""
     try:
@@ -29,7 +32,7 @@ async def get_presigned_url(
         elif request.file_type.startswith("audio/"):
             folder = "audio-files"
         
-        result = spaces_client.generate_presigned_url(
+        result = get_storage().generate_presigned_url(
             file_name=request.file_name,
             file_type=request.file_type,
             folder=folder
@@ -51,15 +54,15 @@ async def get_presigned_url(
 @router.post("/", response_model=AudiobookResponse, status_code=status.HTTP_201_CREATED)
 async def create_audiobook(
     audiobook_data: AudiobookCreate,
-    db: Session = Depends(get_db),
-    current_user: UserProfile = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
 ):
     """Create a new audiobook (Admin only)."""
-    audiobook_repo = AudiobookRepository(db)
-    category_repo = CategoryRepository(db)
+    audiobook_repo = AsyncAudiobookRepository(db)
+    category_repo = AsyncCategoryRepository(db)
     
     # Check if slug already exists
-    existing_audiobook = audiobook_repo.get_by_slug(audiobook_data.slug)
+    existing_audiobook = await audiobook_repo.get_by_slug(audiobook_data.slug)
     if existing_audiobook:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -68,7 +71,7 @@ async def create_audiobook(
     
     # Validate categories exist
     for category_id in audiobook_data.category_ids:
-        category = category_repo.get(category_id)
+        category = await category_repo.get(category_id)
         if not category:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -76,7 +79,7 @@ async def create_audiobook(
             )
     
     # Create audiobook
-    audiobook = audiobook_repo.create_audiobook(
+    audiobook = await audiobook_repo.create_audiobook(
         title=audiobook_data.title,
         slug=audiobook_data.slug,
         author_name=audiobook_data.author_name,
@@ -92,10 +95,10 @@ async def create_audiobook(
     
     # Add categories
     for category_id in audiobook_data.category_ids:
-        audiobook_repo.add_category(audiobook.id, category_id)
+        await audiobook_repo.add_category(audiobook.id, category_id)
     
     # Get categories for response
-    categories = audiobook_repo.get_categories(audiobook.id)
+    categories = await audiobook_repo.get_categories(audiobook.id)
     
     return AudiobookResponse(
         id=audiobook.id,
@@ -126,10 +129,11 @@ async def get_audiobooks_public(
     status_filter: Optional[str] = Query(None, description="Filter by status"),
     category_id: Optional[UUID] = Query(None, description="Filter by category"),
     search: Optional[str] = Query(None, description="Search term"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Optional[UserProfileResponse] = Depends(get_optional_current_user)
 ):
     """Get audiobooks with pagination and filtering (public endpoint for development)."""
-    audiobook_repo = AudiobookRepository(db)
+    audiobook_repo = AsyncAudiobookRepository(db)
     
     # Build filters - only show published audiobooks for public endpoint
     filters = {"status": "published"}
@@ -140,53 +144,56 @@ async def get_audiobooks_public(
     skip = (page - 1) * size
     
     if category_id:
-        audiobooks = audiobook_repo.get_audiobooks_by_category(category_id)
+        audiobooks = await audiobook_repo.get_audiobooks_by_category(category_id)
         # Filter for published only
         audiobooks = [ab for ab in audiobooks if ab.status == "published"]
         total = len(audiobooks)
         audiobooks = audiobooks[skip:skip + size]
     elif search:
-        audiobooks = audiobook_repo.search_audiobooks(search)
+        audiobooks = await audiobook_repo.search_audiobooks(search)
         # Filter for published only
         audiobooks = [ab for ab in audiobooks if ab.status == "published"]
         total = len(audiobooks)
         audiobooks = audiobooks[skip:skip + size]
     else:
-        audiobooks = audiobook_repo.get_multi(skip=skip, limit=size, filters=filters)
-        total = audiobook_repo.count(filters)
+        audiobooks = await audiobook_repo.get_multi(skip=skip, limit=size, filters=filters)
+        total = await audiobook_repo.count(filters)
+    
+    # Mark owned audiobooks for the whole page from the cached entitlement set
+    owned_ids = set()
+    if current_user:
+        owned_ids = await AsyncLibraryRepository(db).owned_ids(
+            current_user.id, [audiobook.id for audiobook in audiobooks]
+        )
     
     # Build response
     audiobook_responses = []
     for audiobook in audiobooks:
-        categories = audiobook_repo.get_categories(audiobook.id)
+        categories = await audiobook_repo.get_categories(audiobook.id)
         audiobook_responses.append(AudiobookResponse(
             id=audiobook.id,
             title=audiobook.title,
-            subtitle=audiobook.subtitle,
-            author=audiobook.author,
-            narrator=audiobook.narrator,
-            description=audiobook.description,
+            slug=audiobook.slug,
             isbn=audiobook.isbn,
-            language=audiobook.language,
-            duration=audiobook.duration,
-            file_size=audiobook.file_size,
-            price=audiobook.price,
-            currency=audiobook.currency,
+            description=audiobook.description,
+            ai_summary=audiobook.ai_summary,
+            duration_seconds=audiobook.duration_seconds,
+            price_cents=audiobook.price_cents,
+            sample_url=audiobook.sample_url,
             cover_image_url=audiobook.cover_image_url,
-            sample_audio_url=audiobook.sample_audio_url,
-            status=audiobook.status,
-            slug=audiobook.slug,
-            publisher=audiobook.publisher,
             publication_date=audiobook.publication_date,
-            series_name=audiobook.series_name,
-            series_number=audiobook.series_number,
-            categories=[{"id": cat.id, "name": cat.name, "slug": cat.slug} for cat in categories],
-            created_at=audiobook.created_at,
-            updated_at=audiobook.updated_at
+            language=audiobook.language,
+            author_name=audiobook.author_name,
+            narrator_name=audiobook.narrator_name,
+            status=audiobook.status,
+            created_at=audiobook.created_at.isoformat(),
+            updated_at=audiobook.updated_at.isoformat(),
+            categories=[{"id": cat.category_id, "name": cat.category.name} for cat in categories],
+            is_owned=audiobook.id in owned_ids if current_user else None
         ))
     
     return AudiobookListResponse(
-        audiobooks=audiobook_responses,
+        items=audiobook_responses,
         total=total,
         page=page,
         size=size,
@@ -201,11 +208,12 @@ async def get_audiobooks(
     status_filter: Optional[str] = Query(None, description="Filter by status"),
     category_id: Optional[UUID] = Query(None, description="Filter by category"),
     search: Optional[str] = Query(None, description="Search term"),
-    db: Session = Depends(get_db)
-    # current_user: UserProfile = Depends(get_current_user_response)  # Temporarily disabled for testing
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[UserProfileResponse] = Depends(get_optional_current_user)
+    # current_user: UserProfileResponse = Depends(get_current_user_response)  # Temporarily disabled for testing
 ):
     """Get audiobooks with pagination and filtering."""
-    audiobook_repo = AudiobookRepository(db)
+    audiobook_repo = AsyncAudiobookRepository(db)
     
     # Build filters
     filters = {}
@@ -216,21 +224,28 @@ async def get_audiobooks(
     skip = (page - 1) * size
     
     if category_id:
-        audiobooks = audiobook_repo.get_audiobooks_by_category(category_id)
+        audiobooks = await audiobook_repo.get_audiobooks_by_category(category_id)
         total = len(audiobooks)
         audiobooks = audiobooks[skip:skip + size]
     elif search:
-        audiobooks = audiobook_repo.search_audiobooks(search)
+        audiobooks = await audiobook_repo.search_audiobooks(search)
         total = len(audiobooks)
         audiobooks = audiobooks[skip:skip + size]
     else:
-        audiobooks = audiobook_repo.get_multi(skip=skip, limit=size, filters=filters)
-        total = audiobook_repo.count(filters)
+        audiobooks = await audiobook_repo.get_multi(skip=skip, limit=size, filters=filters)
+        total = await audiobook_repo.count(filters)
+    
+    # Mark owned audiobooks for the whole page from the cached entitlement set
+    owned_ids = set()
+    if current_user:
+        owned_ids = await AsyncLibraryRepository(db).owned_ids(
+            current_user.id, [audiobook.id for audiobook in audiobooks]
+        )
     
     # Build response
     audiobook_responses = []
     for audiobook in audiobooks:
-        categories = audiobook_repo.get_categories(audiobook.id)
+        categories = await audiobook_repo.get_categories(audiobook.id)
         audiobook_responses.append(AudiobookResponse(
             id=audiobook.id,
             title=audiobook.title,
@@ -249,7 +264,8 @@ async def get_audiobooks(
             status=audiobook.status,
             created_at=audiobook.created_at.isoformat(),
             updated_at=audiobook.updated_at.isoformat(),
-            categories=[{"id": cat.category_id, "name": cat.category.name} for cat in categories]
+            categories=[{"id": cat.category_id, "name": cat.category.name} for cat in categories],
+            is_owned=audiobook.id in owned_ids if current_user else None
         ))
     
     pages = (total + size - 1) // size
@@ -266,12 +282,12 @@ async def get_audiobooks(
 @router.get("/{audiobook_id}", response_model=AudiobookResponse)
 async def get_audiobook(
     audiobook_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: UserProfile = Depends(get_current_user_response)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_user_response)
 ):
     """Get a specific audiobook."""
-    audiobook_repo = AudiobookRepository(db)
-    audiobook = audiobook_repo.get(audiobook_id)
+    audiobook_repo = AsyncAudiobookRepository(db)
+    audiobook = await audiobook_repo.get(audiobook_id)
     
     if not audiobook:
         raise HTTPException(
@@ -279,7 +295,7 @@ async def get_audiobook(
             detail="Audiobook not found"
         )
     
-    categories = audiobook_repo.get_categories(audiobook.id)
+    categories = await audiobook_repo.get_categories(audiobook.id)
     
     return AudiobookResponse(
         id=audiobook.id,
@@ -307,13 +323,13 @@ async def get_audiobook(
 async def update_audiobook(
     audiobook_id: UUID,
     audiobook_data: AudiobookUpdate,
-    db: Session = Depends(get_db),
-    current_user: UserProfile = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
 ):
     """Update an audiobook (Admin only)."""
-    audiobook_repo = AudiobookRepository(db)
-    category_repo = CategoryRepository(db)
-    audiobook = audiobook_repo.get(audiobook_id)
+    audiobook_repo = AsyncAudiobookRepository(db)
+    category_repo = AsyncCategoryRepository(db)
+    audiobook = await audiobook_repo.get(audiobook_id)
     
     if not audiobook:
         raise HTTPException(
@@ -323,7 +339,7 @@ async def update_audiobook(
     
     # Check if slug already exists (excluding current audiobook)
     if audiobook_data.slug and audiobook_data.slug != audiobook.slug:
-        existing_audiobook = audiobook_repo.get_by_slug(audiobook_data.slug)
+        existing_audiobook = await audiobook_repo.get_by_slug(audiobook_data.slug)
         if existing_audiobook:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -333,7 +349,7 @@ async def update_audiobook(
     # Validate categories exist if provided
     if audiobook_data.category_ids:
         for category_id in audiobook_data.category_ids:
-            category = category_repo.get(category_id)
+            category = await category_repo.get(category_id)
             if not category:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -342,21 +358,21 @@ async def update_audiobook(
     
     # Update audiobook
     update_data = audiobook_data.model_dump(exclude_unset=True, exclude={"category_ids"})
-    updated_audiobook = audiobook_repo.update(audiobook, update_data)
+    updated_audiobook = await audiobook_repo.update(audiobook, update_data)
     
     # Update categories if provided
     if audiobook_data.category_ids is not None:
         # Remove existing categories
-        existing_categories = audiobook_repo.get_categories(audiobook_id)
+        existing_categories = await audiobook_repo.get_categories(audiobook_id)
         for cat in existing_categories:
-            audiobook_repo.remove_category(audiobook_id, cat.category_id)
+            await audiobook_repo.remove_category(audiobook_id, cat.category_id)
         
         # Add new categories
         for category_id in audiobook_data.category_ids:
-            audiobook_repo.add_category(audiobook_id, category_id)
+            await audiobook_repo.add_category(audiobook_id, category_id)
     
     # Get updated categories
-    categories = audiobook_repo.get_categories(audiobook_id)
+    categories = await audiobook_repo.get_categories(audiobook_id)
     
     return AudiobookResponse(
         id=updated_audiobook.id,
@@ -383,12 +399,12 @@ async def update_audiobook(
 @router.post("/{audiobook_id}/publish", response_model=AudiobookResponse)
 async def publish_audiobook(
     audiobook_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: UserProfile = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
 ):
     """Publish an audiobook (Admin only)."""
-    audiobook_repo = AudiobookRepository(db)
-    audiobook = audiobook_repo.publish_audiobook(audiobook_id)
+    audiobook_repo = AsyncAudiobookRepository(db)
+    audiobook = await audiobook_repo.publish_audiobook(audiobook_id)
     
     if not audiobook:
         raise HTTPException(
@@ -396,7 +412,7 @@ async def publish_audiobook(
             detail="Audiobook not found"
         )
     
-    categories = audiobook_repo.get_categories(audiobook_id)
+    categories = await audiobook_repo.get_categories(audiobook_id)
     
     return AudiobookResponse(
         id=audiobook.id,
@@ -423,12 +439,12 @@ async def publish_audiobook(
 @router.delete("/{audiobook_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_audiobook(
     audiobook_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: UserProfile = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
 ):
     """Delete an audiobook (Admin only)."""
-    audiobook_repo = AudiobookRepository(db)
-    audiobook = audiobook_repo.get(audiobook_id)
+    audiobook_repo = AsyncAudiobookRepository(db)
+    audiobook = await audiobook_repo.get(audiobook_id)
     
     if not audiobook:
         raise HTTPException(
@@ -436,4 +452,11 @@ async def delete_audiobook(
             detail="Audiobook not found"
         )
     
-    audiobook_repo.delete(audiobook_id)
+    # Chapters go with the audiobook; their files, the cover and the sample
+    # are removed from storage in the background after the commit. URLs
+    # outside our storage (e.g. an external cover image) are left alone.
+    file_urls = await AsyncAudioFileRepository(db).delete_by_audiobook(audiobook_id)
+    file_urls += [url for url in (audiobook.cover_image_url, audiobook.sample_url) if url]
+    await audiobook_repo.delete(audiobook_id)
+    storage = get_storage()
+    storage_deleter.enqueue(storage.owned_object_key(url) for url in file_urls)
@@ -0,0 +1,125 @@
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Cookie, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_async_db
+from app.core.auth import get_current_user
+from app.core.cart_token import CartTokenCodec, CartTokenError, CartTokenItem, get_cart_token_codec
+from app.core.config import settings
+from app.models.enums import AudiobookStatus
+from app.schemas.auth import UserProfileResponse
+from app.repositories.audiobook import AsyncAudiobookRepository
+from app.repositories.cart import AsyncCartRepository
+from app.schemas.cart import CartItemAdd, CartItemResponse, CartResponse, CartMergeResponse
+
+router = APIRouter()
+
+
+def get_codec() -> CartTokenCodec:
+    """Get the anonymous cart token codec."""
+    try:
+        return get_cart_token_codec()
+    except CartTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+
+def _cart_response(items: List[CartTokenItem]) -> CartResponse:
+    return CartResponse(
+        items=[
+            CartItemResponse(audiobook_id=item.audiobook_id, price_cents=item.price_cents)
+            for item in items
+        ],
+        total_cents=sum(item.price_cents for item in items)
+    )
+
+
+def _set_cart_cookie(response: Response, codec: CartTokenCodec, items: List[CartTokenItem]):
+    response.set_cookie(
+        key=settings.CART_COOKIE_NAME,
+        value=codec.encode(items),
+        max_age=codec.max_age_seconds,
+        httponly=True,
+        secure=settings.CART_COOKIE_SECURE,
+        samesite="lax",
+    )
+
+
+@router.get("/", response_model=CartResponse)
+async def get_anonymous_cart(
+    cart: Optional[str] = Cookie(None, alias=settings.CART_COOKIE_NAME),
+    codec: CartTokenCodec = Depends(get_codec)
+):
+    """Get the anonymous cart stored in the signed cart cookie."""
+    return _cart_response(codec.load(cart))
+
+
+@router.post("/items", response_model=CartResponse)
+async def add_to_anonymous_cart(
+    item_data: CartItemAdd,
+    response: Response,
+    cart: Optional[str] = Cookie(None, alias=settings.CART_COOKIE_NAME),
+    codec: CartTokenCodec = Depends(get_codec),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Add an audiobook to the anonymous cart without writing to the database."""
+    items = codec.load(cart)
+    if any(item.audiobook_id == item_data.audiobook_id for item in items):
+        return _cart_response(items)
+
+    audiobook = await AsyncAudiobookRepository(db).get(item_data.audiobook_id)
+    if not audiobook or audiobook.status != AudiobookStatus.PUBLISHED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audiobook not found"
+        )
+
+    items.append(CartTokenItem(audiobook.id, audiobook.price_cents))
+    try:
+        _set_cart_cookie(response, codec, items)
+    except CartTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return _cart_response(items)
+
+
+@router.delete("/items/{audiobook_id}", response_model=CartResponse)
+async def remove_from_anonymous_cart(
+    audiobook_id: UUID,
+    response: Response,
+    cart: Optional[str] = Cookie(None, alias=settings.CART_COOKIE_NAME),
+    codec: CartTokenCodec = Depends(get_codec)
+):
+    """Remove an audiobook from the anonymous cart."""
+    items = [item for item in codec.load(cart) if item.audiobook_id != audiobook_id]
+    _set_cart_cookie(response, codec, items)
+    return _cart_response(items)
+
+
+@router.post("/merge", response_model=CartMergeResponse)
+async def merge_anonymous_cart(
+    response: Response,
+    cart: Optional[str] = Cookie(None, alias=settings.CART_COOKIE_NAME),
+    codec: CartTokenCodec = Depends(get_codec),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_user)
+):
+    """Materialize the anonymous cart into the logged-in user's cart."""
+    items = codec.load(cart)
+    transferred = 0
+    if items:
+        cart_repo = AsyncCartRepository(db)
+        transferred = await cart_repo.transfer_session_cart_to_user(
+            session_id=None,
+            user_id=current_user.id,
+            token_items=items
+        )
+
+    response.delete_cookie(settings.CART_COOKIE_NAME)
+    return CartMergeResponse(transferred=transferred)
@@ -1,12 +1,12 @@
 from typing import List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.db.database import get_async_db, get_read_db
 from app.core.auth import get_current_admin_user, get_current_user_response
-from app.models.user import UserProfile
-from app.repositories.category import CategoryRepository
+from app.schemas.auth import UserProfileResponse
+from app.repositories.category import AsyncCategoryRepository
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryTreeResponse
 
 router = APIRouter()
@@ -15,14 +15,14 @@ router = APIRouter()
 @router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
 async def create_category(
     category_data: CategoryCreate,
-    db: Session = Depends(get_db)
-    # current_user: UserProfile = Depends(get_current_admin_user)  # Temporarily disabled for testing
+    db: AsyncSession = Depends(get_async_db)
+    # current_user: UserProfileResponse = Depends(get_current_admin_user)  # Temporarily disabled for testing
 ):
     """Create a new category (Admin only)."""
-    category_repo = CategoryRepository(db)
+    category_repo = AsyncCategoryRepository(db)
     
     # Check if slug already exists
-    existing_category = category_repo.get_by_slug(category_data.slug)
+    existing_category = await category_repo.get_by_slug(category_data.slug)
     if existing_category:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -31,14 +31,14 @@ async def create_category(
     
     # Validate parent category exists if provided
     if category_data.parent_id:
-        parent_category = category_repo.get(category_data.parent_id)
+        parent_category = await category_repo.get(category_data.parent_id)
         if not parent_category:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Parent category not found"
             )
     
-    category = category_repo.create_category(
+    category = await category_repo.create_category(
         name=category_data.name,
         slug=category_data.slug,
         description=category_data.description,
@@ -62,16 +62,16 @@ async def create_category(
 @router.get("/", response_model=List[CategoryResponse])
 async def get_categories(
     active_only: bool = Query(True, description="Return only active categories"),
-    db: Session = Depends(get_db)
-    # current_user: UserProfile = Depends(get_current_user_response)  # Temporarily disabled for testing
+    db: AsyncSession = Depends(get_read_db)
+    # current_user: UserProfileResponse = Depends(get_current_user_response)  # Temporarily disabled for testing
 ):
     """Get all categories."""
-    category_repo = CategoryRepository(db)
+    category_repo = AsyncCategoryRepository(db)
     
     if active_only:
-        categories = category_repo.get_active_categories()
+        categories = await category_repo.get_active_categories()
     else:
-        categories = category_repo.get_multi()
+        categories = await category_repo.get_multi()
     
     return [
         CategoryResponse(
@@ -91,15 +91,15 @@ async def get_categories(
 
 @router.get("/tree", response_model=List[CategoryTreeResponse])
 async def get_category_tree(
-    db: Session = Depends(get_db),
-    current_user: UserProfile = Depends(get_current_user_response)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserProfileResponse = Depends(get_current_user_response)
 ):
     """Get category tree structure."""
-    category_repo = CategoryRepository(db)
-    root_categories = category_repo.get_root_categories()
+    category_repo = AsyncCategoryRepository(db)
+    root_categories = await category_repo.get_root_categories()
     
-    def build_tree(category):
-        children = category_repo.get_child_categories(category.id)
+    async def build_tree(category):
+        children = await category_repo.get_child_categories(category.id)
         return CategoryTreeResponse(
             id=category.id,
             name=category.name,
@@ -110,21 +110,21 @@ async def get_category_tree(
             is_active=category.is_active,
             created_at=category.created_at.isoformat(),
             updated_at=category.updated_at.isoformat(),
-            children=[build_tree(child) for child in children if child.is_active]
+            children=[await build_tree(child) for child in children if child.is_active]
         )
     
-    return [build_tree(category) for category in root_categories if category.is_active]
+    return [await build_tree(category) for category in root_categories if category.is_active]
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
 async def get_category(
     category_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: UserProfile = Depends(get_current_user_response)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserProfileResponse = Depends(get_current_user_response)
 ):
     """Get a specific category."""
-    category_repo = CategoryRepository(db)
-    category = category_repo.get(category_id)
+    category_repo = AsyncCategoryRepository(db)
+    category = await category_repo.get(category_id)
     
     if not category:
         raise HTTPException(
@@ -149,12 +149,12 @@ async def get_category(
 async def update_category(
     category_id: UUID,
     category_data: CategoryUpdate,
-    db: Session = Depends(get_db),
-    current_user: UserProfile = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
 ):
     """Update a category (Admin only)."""
-    category_repo = CategoryRepository(db)
-    category = category_repo.get(category_id)
+    category_repo = AsyncCategoryRepository(db)
+    category = await category_repo.get(category_id)
     
     if not category:
         raise HTTPException(
@@ -164,7 +164,7 @@ async def update_category(
     
     # Check if slug already exists (excluding current category)
     if category_data.slug and category_data.slug != category.slug:
-        existing_category = category_repo.get_by_slug(category_data.slug)
+        existing_category = await category_repo.get_by_slug(category_data.slug)
         if existing_category:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -173,7 +173,7 @@ async def update_category(
     
     # Validate parent category exists if provided
     if category_data.parent_id:
-        parent_category = category_repo.get(category_data.parent_id)
+        parent_category = await category_repo.get(category_data.parent_id)
         if not parent_category:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -182,7 +182,7 @@ async def update_category(
     
     # Update category
     update_data = category_data.model_dump(exclude_unset=True)
-    updated_category = category_repo.update(category, update_data)
+    updated_category = await category_repo.update(category, update_data)
     
     return CategoryResponse(
         id=updated_category.id,
@@ -200,12 +200,12 @@ async def update_category(
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_category(
     category_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: UserProfile = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_admin_user)
 ):
     """Delete a category (Admin only)."""
-    category_repo = CategoryRepository(db)
-    category = category_repo.get(category_id)
+    category_repo = AsyncCategoryRepository(db)
+    category = await category_repo.get(category_id)
     
     if not category:
         raise HTTPException(
@@ -214,11 +214,11 @@ async def delete_category(
         )
     
     # Check if category has children
-    children = category_repo.get_child_categories(category_id)
+    children = await category_repo.get_child_categories(category_id)
     if children:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete category with child categories"
         )
     
-    category_repo.delete(category_id)
+    await category_repo.delete(category_id)
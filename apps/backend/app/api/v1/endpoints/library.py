@@ -0,0 +1,57 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_async_db
+from app.core.auth import get_current_user
+from app.schemas.auth import UserProfileResponse
+from app.repositories.library import AsyncLibraryRepository
+from app.schemas.library import (
+    LibrarySort,
+    LibraryItemResponse,
+    LibraryPageResponse,
+    LibraryStatsResponse
+)
+
+router = APIRouter()
+
+
+@router.get("/", response_model=LibraryPageResponse)
+async def get_library(
+    sort: LibrarySort = Query(LibrarySort.PURCHASED, description="Sort order"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_user)
+):
+    """Get the current user's library, one page at a time."""
+    library_repo = AsyncLibraryRepository(db)
+    
+    try:
+        rows, next_cursor = await library_repo.get_user_library_page(
+            user_id=current_user.id,
+            sort=sort,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return LibraryPageResponse(
+        items=[LibraryItemResponse.model_validate(row) for row in rows],
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/stats", response_model=LibraryStatsResponse)
+async def get_library_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserProfileResponse = Depends(get_current_user)
+):
+    """Get library statistics for the current user."""
+    library_repo = AsyncLibraryRepository(db)
+    stats = await library_repo.get_library_stats(current_user.id)
+    return LibraryStatsResponse(**stats)
@@ -0,0 +1,82 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.storage import get_storage
+from app.core.storage.local import LocalStorage
+from app.core.streaming import stream_object
+
+router = APIRouter()
+
+
+def _local_storage() -> LocalStorage:
+    storage = get_storage()
+    if not isinstance(storage, LocalStorage):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not found"
+        )
+    return storage
+
+
+@router.get("/{object_key:path}")
+async def download_object(
+    object_key: str,
+    request: Request,
+    expires: Optional[int] = None,
+    token: Optional[str] = None
+):
+    """Serve a stored file from the local storage backend.
+
+    Supports ``Range`` requests, and uses zero-copy ``sendfile`` when the
+    server offers it.
+    """
+    storage = _local_storage()
+    if not storage.is_public(object_key) and not storage.verify("GET", object_key, expires, token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired signature"
+        )
+
+    info = await run_in_threadpool(storage.get_file_info, object_key)
+    if info is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+
+    return stream_object(storage, object_key, info, request.headers)
+
+
+@router.put("/{object_key:path}")
+async def upload_object(
+    object_key: str,
+    request: Request,
+    expires: Optional[int] = None,
+    token: Optional[str] = None,
+    upload_id: Optional[str] = Query(None, alias="uploadId"),
+    part_number: Optional[int] = Query(None, alias="partNumber", ge=1)
+):
+    """Store a file (or a multipart part) PUT to a signed upload URL."""
+    storage = _local_storage()
+    if not storage.verify("PUT", object_key, expires, token, upload_id, part_number):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired signature"
+        )
+
+    try:
+        info = await storage.write(object_key, request.stream(), upload_id, part_number)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+    return Response(status_code=status.HTTP_200_OK, headers={"ETag": info["etag"]})
@@ -0,0 +1,66 @@
+import json
+from typing import List, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_async_db
+from app.core.auth import get_clerk_auth
+from app.core.config import settings
+from app.core.webhooks import WebhookVerificationError, verify_svix_signature
+from app.repositories.user import AsyncUserRepository
+from app.schemas.auth import ClerkUser, ClerkWebhookEvent, ClerkWebhookResponse
+
+router = APIRouter()
+
+_events_adapter = TypeAdapter(Union[ClerkWebhookEvent, List[ClerkWebhookEvent]])
+
+
+@router.post("/clerk", response_model=ClerkWebhookResponse)
+async def clerk_webhook(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Sync user profiles from Clerk user.created/updated/deleted events.
+
+    Accepts a single Svix delivery or a signed list of events (backfills);
+    all upserts and deletions are applied as one statement each.
+    """
+    body = await request.body()
+    try:
+        verify_svix_signature(settings.CLERK_WEBHOOK_SECRET, request.headers, body)
+    except WebhookVerificationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    try:
+        events = _events_adapter.validate_python(json.loads(body))
+        if not isinstance(events, list):
+            events = [events]
+        upserts = [
+            ClerkUser(**event.data)
+            for event in events
+            if event.type in ("user.created", "user.updated")
+        ]
+    except (ValueError, ValidationError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid webhook payload"
+        )
+    deleted_ids = [
+        event.data["id"]
+        for event in events
+        if event.type == "user.deleted" and event.data.get("id")
+    ]
+
+    user_repo = AsyncUserRepository(db)
+    upserted = await user_repo.upsert_from_clerk(upserts)
+    deleted = await user_repo.mark_deleted(deleted_ids)
+
+    for clerk_user_id in [clerk_user.id for clerk_user in upserts] + deleted_ids:
+        get_clerk_auth().identity_cache.pop(clerk_user_id)
+
+    return ClerkWebhookResponse(upserted=upserted, deleted=deleted)
@@ -0,0 +1,296 @@
+import struct
+from typing import Callable, Dict, Optional, Tuple
+
+# Bytes of the start of a file needed to recognise its container
+SNIFF_BYTES = 64
+
+_MP4_AUDIO_BRANDS = {b"M4A ", b"M4B ", b"M4P ", b"mp41", b"mp42", b"isom", b"iso2", b"dash"}
+
+
+def sniff_mime_type(head: bytes) -> Optional[str]:
+    """Recognise an audio container from its first bytes; None if unknown."""
+    if head.startswith(b"ID3"):
+        # ID3v2 tags precede MPEG audio
+        return "audio/mpeg"
+    if len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0:
+        # Frame sync; layer bits 00 mean AAC in ADTS framing, anything else MPEG audio
+        return "audio/aac" if head[1] & 0x06 == 0 else "audio/mpeg"
+    if head[4:8] == b"ftyp":
+        return "audio/mp4" if head[8:12] in _MP4_AUDIO_BRANDS else None
+    if head.startswith(b"OggS"):
+        return "audio/ogg"
+    if head.startswith(b"fLaC"):
+        return "audio/flac"
+    if head.startswith(b"RIFF") and head[8:12] == b"WAVE":
+        return "audio/wav"
+    return None
+
+
+class RangeReader:
+    """Random access to a file through ranged reads, fetched in aligned blocks.
+
+    ``fetch(start, end)`` returns bytes ``start`` to ``end`` inclusive (e.g.
+    one ranged GET). Blocks are kept, so the many small reads a header walk
+    makes cost one fetch per block touched; ``bytes_read`` counts the total.
+    """
+
+    def __init__(self, fetch: Callable[[int, int], bytes], size: int, block_size: int = 8192):
+        self.fetch = fetch
+        self.size = size
+        self.block_size = block_size
+        self.bytes_read = 0
+        self._blocks: Dict[int, bytes] = {}
+
+    def _block(self, index: int) -> bytes:
+        block = self._blocks.get(index)
+        if block is None:
+            start = index * self.block_size
+            block = self.fetch(start, min(start + self.block_size, self.size) - 1)
+            self.bytes_read += len(block)
+            self._blocks[index] = block
+        return block
+
+    def read(self, offset: int, length: int) -> bytes:
+        """Read up to ``length`` bytes at ``offset`` (fewer at the end of the file)."""
+        end = min(offset + length, self.size)
+        if offset < 0 or offset >= end:
+            return b""
+        first, last = offset // self.block_size, (end - 1) // self.block_size
+        data = b"".join(self._block(index) for index in range(first, last + 1))
+        start = offset - first * self.block_size
+        return data[start:start + end - offset]
+
+
+def read_audio_metadata(reader: RangeReader) -> Optional[dict]:
+    """Get ``duration_seconds`` (float), ``bitrate`` (bits/s) and ``sample_rate`` from headers.
+
+    Supports MP3 (Xing/Info and VBRI headers, or constant bitrate) and
+    MP4/M4A/M4B (``mvhd``). Only headers are read, a few kilobytes however
+    long the file is. Returns None for other formats or unparseable files.
+    """
+    kind = sniff_mime_type(reader.read(0, SNIFF_BYTES))
+    try:
+        if kind == "audio/mpeg":
+            return _mp3_metadata(reader)
+        if kind == "audio/mp4":
+            return _mp4_metadata(reader)
+    except struct.error:
+        # A header field ran past the end of the file
+        pass
+    return None
+
+
+# MP3
+
+# kbit/s by (MPEG version 1 or 2, layer) and bitrate index
+_MPEG_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Hz by version bits (0: MPEG 2.5, 2: MPEG 2, 3: MPEG 1) and sample rate index
+_MPEG_SAMPLE_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+# How far past the ID3 tag to look for the first frame
+_MP3_SYNC_SEARCH_BYTES = 16 * 1024
+
+
+def parse_mpeg_frame_header(header: bytes) -> Optional[dict]:
+    """Decode a 4-byte MPEG audio frame header; None if it is not a valid one."""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version_bits = (header[1] >> 3) & 3
+    layer = 4 - ((header[1] >> 1) & 3)
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 3
+    if version_bits == 1 or layer == 4 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    mpeg1 = version_bits == 3
+    bitrate = _MPEG_BITRATES[(1 if mpeg1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = _MPEG_SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = (header[2] >> 1) & 1
+    if layer == 1:
+        samples_per_frame = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples_per_frame = 1152 if mpeg1 or layer == 2 else 576
+        frame_length = samples_per_frame // 8 * bitrate // sample_rate + padding
+    return {
+        "mpeg1": mpeg1,
+        "layer": layer,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "samples_per_frame": samples_per_frame,
+        "frame_length": frame_length,
+        "mono": header[3] >> 6 == 3,
+    }
+
+
+def _id3v2_size(reader: RangeReader) -> int:
+    """Size of the ID3v2 tag at the start of the file (0 if none)."""
+    header = reader.read(0, 10)
+    if len(header) < 10 or not header.startswith(b"ID3"):
+        return 0
+    # Sync-safe integer: 7 bits per byte
+    size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def find_first_mpeg_frame(reader: RangeReader) -> Optional[Tuple[int, dict]]:
+    """Find the first audio frame after any ID3v2 tag: its offset and decoded header.
+
+    A sync word only counts when another valid frame follows it, so stray
+    0xFF bytes in padding are skipped.
+    """
+    start = _id3v2_size(reader)
+    # The first frame almost always follows the tag directly; look further only if not
+    for window_size in (_MP3_SYNC_SEARCH_BYTES // 4, _MP3_SYNC_SEARCH_BYTES):
+        window = reader.read(start, window_size)
+        position = window.find(b"\xff")
+        while 0 <= position < len(window) - 3:
+            frame = parse_mpeg_frame_header(window[position:position + 4])
+            if frame is not None:
+                offset = start + position
+                following = parse_mpeg_frame_header(reader.read(offset + frame["frame_length"], 4))
+                if following is not None or offset + frame["frame_length"] >= reader.size:
+                    return offset, frame
+            position = window.find(b"\xff", position + 1)
+        if len(window) < window_size:
+            break
+    return None
+
+
+def _mp3_metadata(reader: RangeReader) -> Optional[dict]:
+    found = find_first_mpeg_frame(reader)
+    if found is None:
+        return None
+    offset, frame = found
+    sample_rate = frame["sample_rate"]
+    audio_end = reader.size
+    if reader.size >= 128 and reader.read(reader.size - 128, 3) == b"TAG":
+        audio_end -= 128  # ID3v1 tag
+    audio_bytes = audio_end - offset
+
+    # The Xing/Info header sits after the side information of the first frame
+    if frame["mpeg1"]:
+        side_info = 17 if frame["mono"] else 32
+    else:
+        side_info = 9 if frame["mono"] else 17
+    data = reader.read(offset, 4 + side_info + 120 + 36)
+    xing = data[4 + side_info:]
+    frames = None
+    samples_trimmed = 0
+    if xing[:4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", xing[4:8])[0]
+        position = 8
+        if flags & 1:
+            frames = struct.unpack(">I", xing[position:position + 4])[0]
+            position += 4
+        if flags & 2:
+            audio_bytes = struct.unpack(">I", xing[position:position + 4])[0] or audio_bytes
+            position += 4
+        position += (100 if flags & 4 else 0) + (4 if flags & 8 else 0)
+        encoder = xing[position:position + 36]
+        if len(encoder) == 36 and encoder[:4] in (b"LAME", b"Lavf", b"Lavc"):
+            # Encoder delay and padding (12 bits each), trimmed by gapless players
+            delay = (encoder[21] << 4) | (encoder[22] >> 4)
+            padding = ((encoder[22] & 0x0F) << 8) | encoder[23]
+            samples_trimmed = delay + padding
+    elif data[36:40] == b"VBRI":
+        audio_bytes, frames = struct.unpack(">II", data[46:54])
+
+    if frames:
+        samples = max(0, frames * frame["samples_per_frame"] - samples_trimmed)
+        duration = samples / sample_rate
+        bitrate = round(audio_bytes * 8 / duration) if duration else frame["bitrate"]
+    else:
+        # Constant bitrate: every frame has the first frame's bitrate
+        bitrate = frame["bitrate"]
+        duration = audio_bytes * 8 / bitrate
+    return {"duration_seconds": duration, "bitrate": bitrate, "sample_rate": sample_rate}
+
+
+# MP4
+
+def _boxes(reader: RangeReader, start: int, end: int):
+    """Yield ``(type, payload start, box end)`` for the boxes between two offsets."""
+    offset = start
+    while offset + 8 <= end:
+        header = reader.read(offset, 16)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header[:8])
+        payload = offset + 8
+        if size == 1:
+            if len(header) < 16:
+                return
+            size = struct.unpack(">Q", header[8:16])[0]
+            payload = offset + 16
+        elif size == 0:
+            size = end - offset
+        if size < payload - offset:
+            return
+        yield box_type, payload, offset + size
+        offset += size
+
+
+def _find_box(reader: RangeReader, start: int, end: int, box_type: bytes) -> Optional[Tuple[int, int]]:
+    for found_type, payload, box_end in _boxes(reader, start, end):
+        if found_type == box_type:
+            return payload, box_end
+    return None
+
+
+def _find_path(reader: RangeReader, start: int, end: int, *path: bytes) -> Optional[Tuple[int, int]]:
+    span = (start, end)
+    for box_type in path:
+        span = _find_box(reader, span[0], span[1], box_type)
+        if span is None:
+            return None
+    return span
+
+
+def _timescale_and_duration(reader: RangeReader, payload: int) -> Tuple[int, int]:
+    """Read timescale and duration from an ``mvhd`` or ``mdhd`` full box."""
+    if reader.read(payload, 1) == b"\x01":
+        timescale, duration = struct.unpack(">IQ", reader.read(payload + 20, 12))
+    else:
+        timescale, duration = struct.unpack(">II", reader.read(payload + 12, 8))
+    return timescale, duration
+
+
+def _mp4_metadata(reader: RangeReader) -> Optional[dict]:
+    # moov may come after mdat; walking the top level reads only box headers
+    moov = _find_box(reader, 0, reader.size, b"moov")
+    mvhd = moov and _find_box(reader, moov[0], moov[1], b"mvhd")
+    if mvhd is None:
+        return None
+    timescale, duration = _timescale_and_duration(reader, mvhd[0])
+    if not timescale:
+        return None
+    seconds = duration / timescale
+
+    sample_rate = None
+    for box_type, payload, box_end in _boxes(reader, moov[0], moov[1]):
+        if box_type != b"trak":
+            continue
+        mdia = _find_box(reader, payload, box_end, b"mdia")
+        hdlr = mdia and _find_box(reader, mdia[0], mdia[1], b"hdlr")
+        if hdlr is None or reader.read(hdlr[0] + 8, 4) != b"soun":
+            continue
+        stsd = _find_path(reader, mdia[0], mdia[1], b"minf", b"stbl", b"stsd")
+        if stsd is not None:
+            # First sample entry: 8-byte box header, then AudioSampleEntry fields;
+            # the rate is 16.16 fixed point
+            sample_rate = struct.unpack(">H", reader.read(stsd[0] + 8 + 8 + 24, 2))[0] or None
+        if sample_rate is None:
+            mdhd = _find_box(reader, mdia[0], mdia[1], b"mdhd")
+            sample_rate = mdhd and _timescale_and_duration(reader, mdhd[0])[0]
+        break
+
+    bitrate = round(reader.size * 8 / seconds) if seconds else None
+    return {"duration_seconds": seconds, "bitrate": bitrate, "sample_rate": sample_rate}
@@ -1,64 +1,134 @@
-from typing import Optional
-import httpx
+import hashlib
+import time
+from typing import TYPE_CHECKING, Optional
 import jwt
-from jwt import PyJWKClient
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
-from app.models.user import UserProfile
+from app.db.database import get_async_db
 from app.models.enums import UserRole
-from app.repositories.user import UserRepository
+from app.repositories.user import AsyncUserRepository
 from app.schemas.auth import UserProfileResponse, ClerkUser
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.jwks import JWKSKeyStore
+from app.core.user_cache import user_cache
+
+if TYPE_CHECKING:
+    import httpx
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 class ClerkAuth:
-    def __init__(self, secret_key: str):
+    def __init__(self, secret_key: str, key_store: Optional[JWKSKeyStore] = None):
         self.secret_key = secret_key
-        self.base_url = "https://api.clerk.com/v1"
-        # Cache for JWKS client - will be initialized when needed
-        self._jwks_clients = {}
-
-    def _get_jwks_client(self, issuer: str) -> PyJWKClient:
-        """Get or create JWKS client for the given issuer."""
-        if issuer not in self._jwks_clients:
-            jwks_url = f"{issuer}/.well-known/jwks.json"
-            self._jwks_clients[issuer] = PyJWKClient(jwks_url)
-        return self._jwks_clients[issuer]
-
-    def verify_jwt_token(self, token: str) -> Optional[dict]:
-        """Verify Clerk JWT token locally."""
+        self.base_url = settings.CLERK_API_URL
+        self.trusted_issuers = set(settings.CLERK_ISSUER_LIST)
+        self.key_store = key_store or JWKSKeyStore(
+            refresh_interval_seconds=settings.CLERK_JWKS_REFRESH_INTERVAL_SECONDS,
+            min_refetch_seconds=settings.CLERK_JWKS_MIN_REFETCH_SECONDS,
+        )
+        # sha256(token) -> decoded claims, so repeat requests skip RS256
+        # verification. Entries never outlive the token's exp and are dropped
+        # when signing keys rotate.
+        self.token_cache: TTLCache = TTLCache(
+            maxsize=settings.VERIFIED_TOKEN_CACHE_SIZE,
+            ttl=settings.VERIFIED_TOKEN_CACHE_TTL_SECONDS,
+        )
+        self.key_store.on_rotate(lambda issuer: self.token_cache.clear())
+        # Pooled keep-alive client for the Clerk API, created on first use
+        self._http_client: Optional["httpx.AsyncClient"] = None
+        # Clerk user id (token "sub") -> ClerkUser, bounded by token expiry
+        self.identity_cache: TTLCache = TTLCache(
+            maxsize=settings.CLERK_IDENTITY_CACHE_SIZE,
+            ttl=settings.CLERK_IDENTITY_CACHE_TTL_SECONDS,
+        )
+
+    def _get_http_client(self) -> "httpx.AsyncClient":
+        """Get the shared Clerk API client."""
+        # httpx is imported on first use to keep it out of app startup
+        import httpx
+
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "Authorization": f"Bearer {self.secret_key}",
+                    "Content-Type": "application/json"
+                },
+                timeout=settings.CLERK_API_TIMEOUT_SECONDS,
+            )
+        return self._http_client
+
+    async def start(self):
+        """Prefetch signing keys for trusted issuers and keep them refreshed."""
+        await self.key_store.start(self.trusted_issuers)
+
+    async def close(self):
+        """Stop key refresh and close the shared HTTP clients."""
+        await self.key_store.close()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    def _is_trusted_issuer(self, issuer: str) -> bool:
+        return not self.trusted_issuers or issuer.rstrip("/") in self.trusted_issuers
+
+    async def verify_jwt_token(self, token: str) -> Optional[dict]:
+        """Verify Clerk JWT token locally.
+
+        Known keys are served from memory, so this only does CPU work; the
+        token payload is decoded (and its signature checked) exactly once.
+        Tokens verified before are answered from the token cache.
+        """
+        token_digest = hashlib.sha256(token.encode()).digest()
+        cached_claims = self.token_cache.get(token_digest)
+        if cached_claims is not None:
+            if cached_claims["exp"] > time.time():
+                return cached_claims
+            self.token_cache.pop(token_digest)
+
         try:
-            # Decode header to get issuer and key ID
-            unverified_header = jwt.get_unverified_header(token)
-            unverified_payload = jwt.decode(token, options={"verify_signature": False})
-            
-            issuer = unverified_payload.get("iss")
+            key_id = jwt.get_unverified_header(token).get("kid")
+            if not key_id:
+                print("No key ID found in token")
+                return None
+
+            # Keys are per issuer: read it (unverified) to pick the key, then
+            # verify the signature and the issuer claim against that key
+            issuer = jwt.decode(token, options={"verify_signature": False}).get("iss")
             if not issuer:
                 print("No issuer found in token")
                 return None
-            
-            # Get signing key from JWKS
-            jwks_client = self._get_jwks_client(issuer)
-            signing_key = jwks_client.get_signing_key_from_jwt(token)
-            
+            if not self._is_trusted_issuer(issuer):
+                print(f"Untrusted token issuer: {issuer}")
+                return None
+
+            signing_key = self.key_store.get_cached_key(issuer, key_id)
+            if signing_key is None:
+                signing_key = await self.key_store.get_signing_key(issuer, key_id)
+            if signing_key is None:
+                print(f"Unknown signing key: {key_id}")
+                return None
+
             # Verify and decode the token
             decoded_token = jwt.decode(
                 token,
-                signing_key.key,
+                signing_key,
                 algorithms=["RS256"],
                 issuer=issuer,
                 options={
                     "verify_exp": True,
                     "verify_iat": True,
                     "verify_nbf": True,
+                    "require": ["exp"],
                 }
             )
-            
+
+            self.token_cache.set(token_digest, decoded_token, ttl=decoded_token["exp"] - time.time())
             return decoded_token
             
         except jwt.ExpiredSignatureError:
@@ -71,10 +141,39 @@ class ClerkAuth:
             print(f"Error verifying JWT token: {e}")
             return None
 
+    async def get_clerk_user(self, user_id: str, expires_at: Optional[float] = None) -> Optional[ClerkUser]:
+        """Get user details from the Clerk API, cached until the token expires."""
+        clerk_user = self.identity_cache.get(user_id)
+        if clerk_user:
+            return clerk_user
+
+        import httpx
+
+        try:
+            user_response = await self._get_http_client().get(f"/users/{user_id}")
+        except httpx.HTTPError as e:
+            print(f"Error getting user from Clerk API: {e}")
+            return None
+
+        if user_response.status_code != 200:
+            print(f"Failed to get user from Clerk API: {user_response.status_code}")
+            return None
+
+        try:
+            clerk_user = ClerkUser.model_validate(user_response.json())
+        except ValueError as e:
+            # Covers malformed JSON and pydantic's ValidationError
+            print(f"Unexpected user payload from Clerk API: {e}")
+            return None
+
+        ttl = expires_at - time.time() if expires_at else None
+        self.identity_cache.set(user_id, clerk_user, ttl=ttl)
+        return clerk_user
+
     async def verify_token(self, token: str) -> Optional[ClerkUser]:
         """Verify Clerk JWT token and return user data."""
         # First verify the JWT token locally
-        decoded_token = self.verify_jwt_token(token)
+        decoded_token = await self.verify_jwt_token(token)
         if not decoded_token:
             return None
         
@@ -84,64 +183,79 @@ class ClerkAuth:
             print("No user ID found in token")
             return None
         
-        try:
-            # Get user details from Clerk API
-            async with httpx.AsyncClient() as client:
-                user_response = await client.get(
-                    f"{self.base_url}/users/{user_id}",
-                    headers={
-                        "Authorization": f"Bearer {self.secret_key}",
-                        "Content-Type": "application/json"
-                    }
-                )
-                
-                if user_response.status_code == 200:
-                    return ClerkUser(**user_response.json())
-                else:
-                    print(f"Failed to get user from Clerk API: {user_response.status_code}")
-                    return None
-                    
-        except Exception as e:
-            print(f"Error getting user from Clerk API: {e}")
+        return await self.get_clerk_user(user_id, decoded_token.get("exp"))
+
+    async def get_user_from_token(self, token: str, db: AsyncSession) -> Optional[UserProfileResponse]:
+        """Get user profile from Clerk token.
+
+        Known users are answered from the verified claims and a cached
+        snapshot of their local row, so the steady state needs no database or
+        Clerk round trips. The Clerk API is only called when a profile has not
+        been synced yet.
+        """
+        decoded_token = await self.verify_jwt_token(token)
+        if not decoded_token:
             return None
 
-    async def get_user_from_token(self, token: str, db: Session) -> Optional[UserProfile]:
-        """Get user profile from Clerk token."""
-        clerk_user = await self.verify_token(token)
-        if not clerk_user:
+        clerk_user_id = decoded_token.get("sub")
+        if not clerk_user_id:
+            print("No user ID found in token")
             return None
 
-        user_repo = UserRepository(db)
-        
-        # Try to get existing user
-        user = user_repo.get_by_clerk_id(clerk_user.id)
+        cached_user = user_cache.get(clerk_user_id)
+        if cached_user:
+            return cached_user
+
+        user_repo = AsyncUserRepository(db)
         
+        # Profiles are normally created by the Clerk webhook
+        user = await user_repo.get_by_clerk_id(clerk_user_id)
+        if user and user.deleted_at:
+            return None
+
         if not user:
-            # Create new user if doesn't exist
-            email = clerk_user.email_addresses[0]["email_address"] if clerk_user.email_addresses else ""
-            user = user_repo.create_user_from_clerk(
+            if not settings.CLERK_JIT_PROVISIONING:
+                print(f"No profile synced yet for Clerk user {clerk_user_id}")
+                return None
+
+            clerk_user = await self.get_clerk_user(clerk_user_id, decoded_token.get("exp"))
+            if not clerk_user:
+                return None
+
+            # Create new user if the webhook has not delivered yet
+            user = await user_repo.create_user_from_clerk(
                 clerk_user_id=clerk_user.id,
-                email=email,
+                email=clerk_user.primary_email,
                 first_name=clerk_user.first_name,
                 last_name=clerk_user.last_name,
-                avatar_url=clerk_user.image_url
+                avatar_url=clerk_user.image_url,
+                clerk_updated_at=clerk_user.updated_at_datetime
             )
-        
-        return user
 
+        snapshot = UserProfileResponse.model_validate(user)
+        user_cache.set(clerk_user_id, snapshot)
+        return snapshot
+
+
+_clerk_auth: Optional[ClerkAuth] = None
 
-# Initialize Clerk auth
-clerk_auth = ClerkAuth(settings.CLERK_SECRET_KEY)
+
+def get_clerk_auth() -> ClerkAuth:
+    """Get the shared Clerk auth instance, creating it on first use."""
+    global _clerk_auth
+    if _clerk_auth is None:
+        _clerk_auth = ClerkAuth(settings.CLERK_SECRET_KEY)
+    return _clerk_auth
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> UserProfile:
-    """Get current authenticated user."""
+    db: AsyncSession = Depends(get_async_db)
+) -> UserProfileResponse:
+    """Get current authenticated user (a cached profile snapshot)."""
     token = credentials.credentials
     
-    user = await clerk_auth.get_user_from_token(token, db)
+    user = await get_clerk_auth().get_user_from_token(token, db)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -152,9 +266,20 @@ async def get_current_user(
     return user
 
 
+async def get_optional_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[UserProfileResponse]:
+    """Get current user if a valid token was sent, otherwise None."""
+    if not credentials:
+        return None
+    
+    return await get_clerk_auth().get_user_from_token(credentials.credentials, db)
+
+
 async def get_current_admin_user(
-    current_user: UserProfile = Depends(get_current_user)
-) -> UserProfile:
+    current_user: UserProfileResponse = Depends(get_current_user)
+) -> UserProfileResponse:
     """Get current authenticated admin user."""
     if current_user.role not in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
         raise HTTPException(
@@ -166,15 +291,7 @@ async def get_current_admin_user(
 
 
 def get_current_user_response(
-    current_user: UserProfile = Depends(get_current_user)
+    current_user: UserProfileResponse = Depends(get_current_user)
 ) -> UserProfileResponse:
     """Get current user as response model."""
-    return UserProfileResponse(
-        id=current_user.id,
-        clerk_user_id=current_user.clerk_user_id,
-        email=current_user.email,
-        first_name=current_user.first_name,
-        last_name=current_user.last_name,
-        role=current_user.role,
-        avatar_url=current_user.avatar_url
-    )
+    return current_user
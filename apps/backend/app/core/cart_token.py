@@ -0,0 +1,115 @@
+import base64
+import hashlib
+import hmac
+import struct
+import time
+from typing import List, NamedTuple, Optional
+from uuid import UUID
+
+from app.core.config import settings
+
+# Token layout (before base64url): version (1 byte), issued_at (uint32),
+# then one 20-byte record per item: audiobook UUID (16 bytes) + price_cents (uint32).
+_VERSION = 1
+_HEADER = struct.Struct(">BI")
+_ITEM = struct.Struct(">16sI")
+_SIGNATURE_BYTES = 16
+
+
+class CartTokenItem(NamedTuple):
+    audiobook_id: UUID
+    price_cents: int
+
+
+class CartTokenError(Exception):
+    """Raised when a cart token cannot be encoded or trusted."""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class CartTokenCodec:
+    """Encode anonymous carts as compact, signed, size-bounded tokens.
+
+    Anonymous carts live entirely in a cookie and never touch the database;
+    they are materialized into ``cart_items`` only when the shopper logs in.
+    """
+
+    def __init__(self, secret: str, max_items: int = 50, max_age_seconds: int = 2592000):
+        if not secret:
+            raise CartTokenError("Cart token secret is not configured")
+        self._key = hashlib.sha256(f"cart-token:{secret}".encode()).digest()
+        self.max_items = max_items
+        self.max_age_seconds = max_age_seconds
+        # base64url of header + items + separator + signature
+        self.max_token_length = (
+            len(_b64encode(b"\0" * (_HEADER.size + _ITEM.size * max_items)))
+            + 1
+            + len(_b64encode(b"\0" * _SIGNATURE_BYTES))
+        )
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self._key, payload, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+
+    def encode(self, items: List[CartTokenItem], issued_at: Optional[int] = None) -> str:
+        """Serialize and sign cart items."""
+        if len(items) > self.max_items:
+            raise CartTokenError(f"Cart cannot hold more than {self.max_items} items")
+
+        issued_at = int(time.time()) if issued_at is None else issued_at
+        payload = _HEADER.pack(_VERSION, issued_at) + b"".join(
+            _ITEM.pack(item.audiobook_id.bytes, item.price_cents) for item in items
+        )
+        return f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def decode(self, token: str) -> List[CartTokenItem]:
+        """Verify a token and return its items."""
+        if not token or len(token) > self.max_token_length:
+            raise CartTokenError("Cart token is missing or too large")
+
+        try:
+            encoded_payload, encoded_signature = token.split(".", 1)
+            payload = _b64decode(encoded_payload)
+            signature = _b64decode(encoded_signature)
+        except (ValueError, TypeError):
+            raise CartTokenError("Malformed cart token")
+
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise CartTokenError("Invalid cart token signature")
+
+        if len(payload) < _HEADER.size or (len(payload) - _HEADER.size) % _ITEM.size:
+            raise CartTokenError("Malformed cart token")
+
+        version, issued_at = _HEADER.unpack_from(payload)
+        if version != _VERSION:
+            raise CartTokenError("Unsupported cart token version")
+        if time.time() - issued_at > self.max_age_seconds:
+            raise CartTokenError("Cart token has expired")
+
+        return [
+            CartTokenItem(UUID(bytes=raw_id), price_cents)
+            for raw_id, price_cents in _ITEM.iter_unpack(payload[_HEADER.size:])
+        ]
+
+    def load(self, token: Optional[str]) -> List[CartTokenItem]:
+        """Decode a token, treating a missing or untrusted token as an empty cart."""
+        if not token:
+            return []
+        try:
+            return self.decode(token)
+        except CartTokenError:
+            return []
+
+
+def get_cart_token_codec() -> CartTokenCodec:
+    """Build the cart token codec from settings."""
+    return CartTokenCodec(
+        secret=settings.CART_TOKEN_SECRET,
+        max_items=settings.CART_TOKEN_MAX_ITEMS,
+        max_age_seconds=settings.CART_TOKEN_MAX_AGE_SECONDS,
+    )
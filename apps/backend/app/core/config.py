@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import List, Optional, Union
 
 from pydantic import AnyHttpUrl, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,6 +28,46 @@ class Settings(BaseSettings):
             f"@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return self.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    # Read replica (optional). Read-only endpoints use it while it is healthy
+    # and within the lag tolerance; otherwise they fall back to the primary.
+    POSTGRES_REPLICA_SERVER: str = ""
+    POSTGRES_REPLICA_PORT: str = ""
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = 10.0
+    # Clients that just wrote read from the primary for this long; keep it
+    # above REPLICA_MAX_LAG_SECONDS.
+    READ_AFTER_WRITE_SECONDS: int = 15
+    READ_AFTER_WRITE_COOKIE_NAME: str = "db_primary"
+
+    @property
+    def ASYNC_REPLICA_DATABASE_URL(self) -> Optional[str]:
+        if not self.POSTGRES_REPLICA_SERVER:
+            return None
+        return (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_REPLICA_SERVER}:{self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT}"
+            f"/{self.POSTGRES_DB}"
+        )
+
+    # Database connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Per-connection server timeouts in milliseconds (0 disables)
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = 60000
+
+    # SQL instrumentation
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    # Log requests issuing more queries than this (likely N+1 patterns)
+    REQUEST_QUERY_COUNT_WARNING: int = 30
+
     # CORS - Allow all origins for now
     BACKEND_CORS_ORIGINS: str = "*"
 
@@ -42,6 +82,67 @@ class Settings(BaseSettings):
 
     # Clerk Authentication
     CLERK_SECRET_KEY: str = ""
+    CLERK_API_URL: str = "https://api.clerk.com/v1"
+    CLERK_API_TIMEOUT_SECONDS: float = 5.0
+    # Comma-separated trusted token issuers (e.g. https://clerk.example.com).
+    # Their signing keys are prefetched at startup; empty trusts any issuer.
+    CLERK_ISSUERS: str = ""
+    CLERK_JWKS_REFRESH_INTERVAL_SECONDS: int = 3600
+    CLERK_JWKS_MIN_REFETCH_SECONDS: int = 30
+
+    @property
+    def CLERK_ISSUER_LIST(self) -> List[str]:
+        return [i.strip().rstrip("/") for i in self.CLERK_ISSUERS.split(",") if i.strip()]
+
+    # Decoded claims of verified tokens, cached until the token's exp
+    VERIFIED_TOKEN_CACHE_SIZE: int = 10000
+    VERIFIED_TOKEN_CACHE_TTL_SECONDS: int = 300
+
+    # Clerk user sync webhook (Svix signing secret, "whsec_...")
+    CLERK_WEBHOOK_SECRET: str = ""
+    # Create profiles on first sign-in when the webhook has not delivered yet.
+    # Disable to rely on the webhook alone and keep Clerk off the auth path.
+    CLERK_JIT_PROVISIONING: bool = True
+    # Comma-separated emails that get the admin role when their profile is
+    # created. When empty, the first profile ever created becomes admin.
+    BOOTSTRAP_ADMIN_EMAILS: str = ""
+
+    @property
+    def BOOTSTRAP_ADMIN_EMAIL_LIST(self) -> List[str]:
+        return [e.strip().lower() for e in self.BOOTSTRAP_ADMIN_EMAILS.split(",") if e.strip()]
+
+    # Authenticated user profile snapshots (see app/core/user_cache.py)
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+
+    # Clerk user lookups, cached per token subject and never past token expiry
+    CLERK_IDENTITY_CACHE_SIZE: int = 10000
+    CLERK_IDENTITY_CACHE_TTL_SECONDS: int = 600
+
+    # Storage backend: "s3" (DigitalOcean Spaces, below) or "local", which
+    # keeps files under LOCAL_STORAGE_ROOT and serves them from /storage
+    STORAGE_BACKEND: str = "s3"
+    LOCAL_STORAGE_ROOT: str = "./storage"
+    LOCAL_STORAGE_BASE_URL: str = "http://localhost:8000/api/v1/storage"
+    # Signs local upload/download URLs. Required with the local backend and
+    # must not be shared with other services.
+    LOCAL_STORAGE_SECRET: str = ""
+    # Comma-separated key prefixes readable without a signed URL
+    LOCAL_STORAGE_PUBLIC_PREFIXES: str = "images/,samples/"
+
+    @property
+    def LOCAL_STORAGE_PUBLIC_PREFIX_LIST(self) -> List[str]:
+        return [p.strip() for p in self.LOCAL_STORAGE_PUBLIC_PREFIXES.split(",") if p.strip()]
+
+    @property
+    def STORAGE_CONFIGURED(self) -> bool:
+        return self.STORAGE_BACKEND == "local" or bool(self.DO_SPACES_BUCKET)
+
+    # Streaming: open-ended ranges ("bytes=N-", what players send on a seek)
+    # are answered with at most this many bytes; the player asks for the next
+    # range as it goes, so a seek never turns into a whole-file transfer.
+    STREAM_MAX_RANGE_BYTES: int = 4 * 1024 * 1024
+    STREAM_CHUNK_BYTES: int = 64 * 1024
 
     # DigitalOcean Spaces
     DIGITAL_OCEAN_ACCESS_KEY: str = ""
@@ -50,6 +151,66 @@ class Settings(BaseSettings):
     DO_SPACES_REGION: str = "nyc3"
     DO_SPACES_BUCKET: str = ""
     DO_SPACES_CDN_URL: str = ""
+    # Download URLs are signed as of the start of a time bucket and reused
+    # until the bucket ends, so repeat requests get identical, cacheable URLs
+    # that are always valid for at least EXPIRES - BUCKET seconds.
+    DOWNLOAD_URL_EXPIRES_SECONDS: int = 3600
+    DOWNLOAD_URL_BUCKET_SECONDS: int = 900
+    DOWNLOAD_URL_CACHE_SIZE: int = 50000
+    # When set, download URLs point at DO_SPACES_CDN_URL with an HMAC token
+    # the CDN validates (see CDNTokenSigner) instead of presigned Spaces URLs.
+    CDN_URL_SIGNING_KEY: str = ""
+    # Most upload URLs a single /audio-files/presigned-urls call may request
+    PRESIGN_BATCH_MAX_FILES: int = 200
+    # Multipart uploads: part size (S3 minimum is 5 MiB; raised automatically
+    # so a file never needs more than 10,000 parts) and how long an unfinished
+    # upload is kept before the janitor aborts it.
+    MULTIPART_PART_SIZE_BYTES: int = 16 * 1024 * 1024
+    MULTIPART_UPLOAD_MAX_AGE_HOURS: int = 24
+    MULTIPART_JANITOR_INTERVAL_SECONDS: int = 3600
+    # Most part URLs a single presign call may request
+    MULTIPART_PRESIGN_MAX_PARTS: int = 1000
+
+    # Post-upload verification: concurrent files and read chunk size
+    AUDIO_VERIFY_WORKERS: int = 4
+    AUDIO_VERIFY_CHUNK_BYTES: int = 1024 * 1024
+    # Spacing of entries in MP3 seek tables, built during verification
+    SEEK_INDEX_INTERVAL_SECONDS: float = 1.0
+
+    # Generated audiobook samples: length cut from the first chapter and
+    # worker processes per run
+    SAMPLE_CLIP_SECONDS: int = 300
+    SAMPLE_CLIP_PROCESSES: int = 2
+
+    # Storage garbage collection. Deleted files are removed in background
+    # batches; the reconciler periodically deletes objects under these
+    # prefixes that no row references and that are older than the grace period
+    # (uploads are stored before the rows pointing at them are created).
+    # The periodic reconciler is opt-in; POST /admin/storage/reconcile with
+    # dry_run=true previews what it would delete.
+    STORAGE_DELETE_BATCH_SIZE: int = 1000
+    STORAGE_GC_ENABLED: bool = False
+    STORAGE_GC_PREFIXES: str = "audio-files/,images/,uploads/,samples/"
+    STORAGE_GC_GRACE_HOURS: int = 24
+    STORAGE_GC_INTERVAL_SECONDS: int = 6 * 3600
+    STORAGE_GC_MAX_DELETES_PER_RUN: int = 10000
+
+    @property
+    def STORAGE_GC_PREFIX_LIST(self) -> List[str]:
+        return [p.strip() for p in self.STORAGE_GC_PREFIXES.split(",") if p.strip()]
+
+    # Anonymous carts (signed client-side token). The secret is required and
+    # must not be shared with other services; the cookie is HTTPS-only unless
+    # CART_COOKIE_SECURE is turned off for local development over plain HTTP.
+    CART_TOKEN_SECRET: str = ""
+    CART_TOKEN_MAX_ITEMS: int = 50
+    CART_TOKEN_MAX_AGE_SECONDS: int = 60 * 60 * 24 * 30
+    CART_COOKIE_NAME: str = "cart"
+    CART_COOKIE_SECURE: bool = True
+
+    # Per-user entitlement (owned audiobooks) cache
+    ENTITLEMENT_CACHE_SIZE: int = 10000
+    ENTITLEMENT_CACHE_TTL_SECONDS: int = 300
 
 
 settings = Settings()
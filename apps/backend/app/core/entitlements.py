@@ -0,0 +1,12 @@
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# user_id -> frozenset of owned audiobook IDs, used to mark owned books on
+# catalog pages. Loaded on first access by LibraryRepository and invalidated
+# on purchase or refund; the TTL bounds staleness for writes made by other
+# workers. Access checks use LibraryRepository.has_audiobook, which is not
+# cached.
+entitlement_cache: TTLCache = TTLCache(
+    maxsize=settings.ENTITLEMENT_CACHE_SIZE,
+    ttl=settings.ENTITLEMENT_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,143 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import jwt
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class JWKSFetchError(Exception):
+    """Raised when an issuer's JWKS cannot be fetched or parsed."""
+
+
+class JWKSKeyStore:
+    """Async, in-memory store of JWT signing keys per issuer.
+
+    Keys are prefetched at startup and refreshed in the background, so
+    verifying a token is a dictionary lookup plus CPU-only signature checks.
+    A token signed with an unknown ``kid`` triggers at most one fetch per
+    issuer at a time (concurrent callers wait on the same fetch), and at most
+    one every ``min_refetch_seconds`` so junk ``kid`` values cannot be used to
+    hammer the issuer. Keys are looked up by ``(issuer, kid)``, so one issuer
+    can never shadow another's keys, and at most ``max_issuers`` issuers are
+    tracked.
+    """
+
+    def __init__(
+        self,
+        refresh_interval_seconds: float = 3600,
+        min_refetch_seconds: float = 30,
+        max_issuers: int = 10,
+        http_client: Optional["httpx.AsyncClient"] = None,
+    ):
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.min_refetch_seconds = min_refetch_seconds
+        self.max_issuers = max_issuers
+        self.fetches = 0
+        self._http_client = http_client
+        # (issuer, kid) -> key
+        self._keys: Dict[Tuple[str, str], Any] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._rotation_callbacks: List[Callable[[str], None]] = []
+
+    async def _get_jwks(self, issuer: str) -> "jwt.PyJWKSet":
+        # httpx is imported on first use to keep it out of app startup
+        import httpx
+
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(timeout=5.0)
+        try:
+            response = await self._http_client.get(f"{issuer}/.well-known/jwks.json")
+            response.raise_for_status()
+            return jwt.PyJWKSet.from_dict(response.json())
+        except (httpx.HTTPError, jwt.PyJWKSetError, ValueError) as e:
+            raise JWKSFetchError(f"Error fetching JWKS for {issuer}: {e}") from e
+
+    def on_rotate(self, callback: Callable[[str], None]) -> None:
+        """Call ``callback(issuer)`` whenever an issuer's key set changes."""
+        self._rotation_callbacks.append(callback)
+
+    def get_cached_key(self, issuer: str, kid: str) -> Optional[Any]:
+        """Get an issuer's key for a known key ID without any I/O."""
+        return self._keys.get((issuer, kid))
+
+    async def _fetch(self, issuer: str) -> None:
+        self.fetches += 1
+        key_set = await self._get_jwks(issuer)
+
+        keys = {(issuer, key.key_id): key.key for key in key_set.keys if key.key_id}
+        previous = {key_id for key_id in self._keys if key_id[0] == issuer}
+        for key_id in previous - keys.keys():
+            del self._keys[key_id]
+        self._keys.update(keys)
+        self._fetched_at[issuer] = time.monotonic()
+
+        if previous and previous != keys.keys():
+            for callback in self._rotation_callbacks:
+                callback(issuer)
+
+    async def refresh(self, issuer: str) -> None:
+        """Fetch an issuer's keys, sharing an in-flight fetch if there is one."""
+        task = self._inflight.get(issuer)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(issuer))
+            self._inflight[issuer] = task
+            task.add_done_callback(lambda _: self._inflight.pop(issuer, None))
+        await asyncio.shield(task)
+
+    async def get_signing_key(self, issuer: str, kid: str) -> Optional[Any]:
+        """Get the key for ``kid``, fetching the issuer's JWKS if it is unknown."""
+        key = self._keys.get((issuer, kid))
+        if key is not None:
+            return key
+
+        fetched_at = self._fetched_at.get(issuer)
+        if fetched_at is None and issuer not in self._inflight \
+                and len(self._fetched_at) + len(self._inflight) >= self.max_issuers:
+            print(f"Not fetching JWKS for {issuer}: already tracking {self.max_issuers} issuers")
+            return None
+        if fetched_at is None or time.monotonic() - fetched_at >= self.min_refetch_seconds \
+                or issuer in self._inflight:
+            try:
+                await self.refresh(issuer)
+            except JWKSFetchError as e:
+                print(e)
+                return None
+
+        return self._keys.get((issuer, kid))
+
+    async def prefetch(self, issuers: Iterable[str]) -> None:
+        """Load keys for the given issuers, logging (not raising) failures."""
+        for issuer in issuers:
+            try:
+                await self.refresh(issuer)
+            except JWKSFetchError as e:
+                print(e)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval_seconds)
+            await self.prefetch(list(self._fetched_at))
+
+    async def start(self, issuers: Iterable[str]) -> None:
+        """Prefetch keys and start the background refresh task."""
+        await self.prefetch(issuers)
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def close(self) -> None:
+        """Stop background refresh and close the HTTP client."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
@@ -0,0 +1,203 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.seek_index import Mp3SeekIndexBuilder
+from app.core.storage import StorageBackend, get_storage
+from app.core.storage_gc import storage_deleter
+from app.db.database import AsyncSessionLocal, get_async_engine
+from app.repositories.audiobook import AsyncAudiobookRepository
+
+SAMPLE_PREFIX = "samples/"
+# Junk allowed between the ID3v2 tag and the first audio frame before a source is rejected
+_MAX_BYTES_BEFORE_AUDIO = 64 * 1024
+
+
+def cut_mp3_sample(storage: StorageBackend, object_key: str, seconds: float, chunk_size: int) -> Optional[bytes]:
+    """Cut the first ``seconds`` of a stored MP3 at a frame boundary, without re-encoding.
+
+    The object is streamed only up to the first frame that starts at or after
+    ``seconds``. The ID3v2 tag is kept; an Xing/Info frame is dropped, as its
+    frame count describes the whole chapter. Returns None if no MPEG audio
+    frame starts within ``_MAX_BYTES_BEFORE_AUDIO`` bytes of the tag's end.
+    """
+    builder = Mp3SeekIndexBuilder(interval_seconds=seconds)
+    tag = b""
+    # The object from byte 0 until the first audio frame is found; then only
+    # the bytes from that frame (received_start) on, with the tag kept aside
+    received = bytearray()
+    received_start = None
+    chunks = storage.iter_range(object_key, 0, None, chunk_size)
+    try:
+        for chunk in chunks:
+            received += chunk
+            builder.feed(chunk)
+            if not builder.offsets:
+                if len(received) > builder.tag_size + _MAX_BYTES_BEFORE_AUDIO:
+                    return None
+                continue
+            if received_start is None:
+                tag = bytes(received[:builder.tag_size])
+                received_start = builder.offsets[0]
+                del received[:received_start]
+            if len(builder.offsets) > 1:
+                break
+    finally:
+        chunks.close()
+
+    if received_start is None:
+        return None
+    # Chapters shorter than the sample are used whole, less any trailing tags
+    end = builder.offsets[1] if len(builder.offsets) > 1 else builder.end_offset
+    return tag + bytes(received[:end - received_start])
+
+
+def build_sample(source_key: str, sample_key: str, seconds: float, chunk_size: int) -> bool:
+    """Cut a sample and store it under ``sample_key``; runs in a worker process.
+
+    Does nothing if the sample already exists, so an interrupted run can be
+    repeated cheaply. Returns False if the source has no MPEG audio.
+    """
+    storage = get_storage()
+    if storage.get_file_info(sample_key) is not None:
+        return True
+    clip = cut_mp3_sample(storage, source_key, seconds, chunk_size)
+    if clip is None:
+        return False
+    storage.put_object(sample_key, clip, "audio/mpeg")
+    return True
+
+
+class SampleClipGenerator:
+    """Generates audiobook samples from the start of each book's first chapter.
+
+    Samples are cut from verified MP3 chapters and stored under a key derived
+    from the chapter's checksum and the sample length, so a book is only
+    processed again when its first chapter changes. Cutting runs in a pool
+    of ``processes`` worker processes; only books without a sample, or whose
+    sample was generated earlier, are touched, so uploaded samples are kept.
+    ``start`` runs a batch as a background task, one batch at a time.
+    """
+
+    def __init__(
+        self,
+        processes: int = 2,
+        seconds: float = 300,
+        chunk_size: int = 1024 * 1024,
+        storage: Optional[StorageBackend] = None,
+    ):
+        self._storage = storage
+        self.processes = processes
+        self.seconds = seconds
+        self.chunk_size = chunk_size
+        self.last_run: Optional[dict] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def storage(self) -> StorageBackend:
+        return self._storage or get_storage()
+
+    def sample_key(self, audiobook_id: UUID, checksum: str) -> str:
+        return f"{SAMPLE_PREFIX}{audiobook_id}/{checksum[:16]}-{self.seconds:g}s.mp3"
+
+    async def pending(self, limit: int) -> list:
+        """Get up to ``limit`` (audiobook ID, current sample URL, source key, sample key) to generate."""
+        get_async_engine()
+        async with AsyncSessionLocal() as db:
+            sources = await AsyncAudiobookRepository(db).get_sample_sources()
+
+        storage = self.storage
+        jobs = []
+        for audiobook_id, sample_url, file_url, mime_type, checksum in sources:
+            if mime_type != "audio/mpeg" or not checksum:
+                continue
+            current_key = storage.owned_object_key(sample_url) if sample_url else None
+            # Samples uploaded by hand, here or hosted elsewhere, are kept
+            if sample_url and (current_key is None or not current_key.startswith(SAMPLE_PREFIX)):
+                continue
+            sample_key = self.sample_key(audiobook_id, checksum)
+            if current_key != sample_key:
+                jobs.append((audiobook_id, sample_url, storage.object_key_from_url(file_url), sample_key))
+                if len(jobs) >= limit:
+                    break
+        return jobs
+
+    async def run_once(self, limit: int = 100) -> dict:
+        """Generate samples for up to ``limit`` audiobooks and point them at the new files."""
+        async with self._lock:
+            jobs = await self.pending(limit)
+            results = []
+            if jobs:
+                loop = asyncio.get_running_loop()
+                # Spawned rather than forked, so workers do not inherit the
+                # event loop, database pool or storage clients
+                pool = ProcessPoolExecutor(
+                    max_workers=min(self.processes, len(jobs)),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                try:
+                    results = await asyncio.gather(
+                        *(
+                            loop.run_in_executor(pool, build_sample, source_key, sample_key, self.seconds, self.chunk_size)
+                            for _, _, source_key, sample_key in jobs
+                        ),
+                        return_exceptions=True,
+                    )
+                finally:
+                    # Never wait for the workers to exit on the event loop
+                    pool.shutdown(wait=False, cancel_futures=True)
+
+            generated = skipped = failed = 0
+            storage = self.storage
+            async with AsyncSessionLocal() as db:
+                audiobook_repo = AsyncAudiobookRepository(db)
+                for (audiobook_id, sample_url, source_key, sample_key), result in zip(jobs, results):
+                    if isinstance(result, BaseException):
+                        failed += 1
+                        print(f"Error generating sample for audiobook {audiobook_id}: {result}")
+                    elif not result:
+                        skipped += 1
+                    elif await audiobook_repo.set_generated_sample(audiobook_id, storage.public_url(sample_key), sample_url):
+                        generated += 1
+                        if sample_url:
+                            storage_deleter.enqueue([storage.owned_object_key(sample_url)])
+                    else:
+                        # The sample was replaced meanwhile; the new clip is left for the reconciler
+                        skipped += 1
+
+            self.last_run = {"generated": generated, "skipped": skipped, "failed": failed}
+            return self.last_run
+
+    async def _run(self, limit: int) -> None:
+        try:
+            await self.run_once(limit)
+        except Exception as e:
+            print(f"Error generating audiobook samples: {e}")
+
+    def start(self, limit: int = 100) -> bool:
+        """Run a batch in the background; returns False if one is already running."""
+        if self._task is not None and not self._task.done():
+            return False
+        self._task = asyncio.create_task(self._run(limit))
+        return True
+
+    async def close(self) -> None:
+        """Cancel a batch still running."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+sample_clip_generator = SampleClipGenerator(
+    processes=settings.SAMPLE_CLIP_PROCESSES,
+    seconds=settings.SAMPLE_CLIP_SECONDS,
+    chunk_size=settings.AUDIO_VERIFY_CHUNK_BYTES,
+)
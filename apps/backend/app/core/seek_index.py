@@ -0,0 +1,105 @@
+import struct
+from typing import List, Optional, Tuple
+
+from app.core.audio_formats import parse_mpeg_frame_header
+
+# Packed index: interval in milliseconds, then one offset per interval (little-endian uint32)
+_HEADER = struct.Struct("<I")
+# Bytes of a frame needed to tell an Xing/Info/VBRI header frame from audio
+_INFO_FRAME_BYTES = 40
+
+
+class Mp3SeekIndexBuilder:
+    """Builds a time-to-byte seek table while an MP3 streams past once.
+
+    ``feed`` takes the file's bytes in order, in chunks of any size. Frame
+    headers are decoded and payloads skipped, so only a few bytes are kept
+    between chunks. The table holds the byte offset of the first frame that
+    starts at or after every ``interval_seconds``; a player seeking to ``t``
+    requests from that offset and lands within one frame (~26 ms) of it.
+    """
+
+    def __init__(self, interval_seconds: float = 1.0):
+        self.interval_ms = max(1, round(interval_seconds * 1000))
+        self.offsets: List[int] = []
+        self.samples = 0
+        self.sample_rate: Optional[int] = None
+        # Bytes of the leading ID3v2 tag, and the end of the last audio frame seen
+        self.tag_size = 0
+        self.end_offset = 0
+        self._received = 0
+        self._pending = b""
+        self._skip = 0
+        self._started = False
+
+    def feed(self, chunk: bytes) -> None:
+        if not self._started:
+            # Wait for the ID3v2 header, then skip the tag
+            self._pending += chunk
+            if len(self._pending) < 10:
+                return
+            self._started = True
+            data, self._pending = self._pending, b""
+            self._received = 0
+            if data.startswith(b"ID3"):
+                size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+                self.tag_size = self._skip = 10 + size + (10 if data[5] & 0x10 else 0)
+            chunk = data
+
+        if self._skip >= len(chunk):
+            self._skip -= len(chunk)
+            self._received += len(chunk)
+            return
+        base = self._received + self._skip - len(self._pending)
+        data = self._pending + chunk[self._skip:]
+        self._received += len(chunk)
+        self._skip = 0
+
+        position = 0
+        while position + 4 <= len(data):
+            frame = parse_mpeg_frame_header(data[position:position + 4])
+            if frame is None or (self.sample_rate and frame["sample_rate"] != self.sample_rate):
+                # Lost sync (or junk between frames): look for the next sync byte
+                position = data.find(b"\xff", position + 1)
+                if position < 0:
+                    position = len(data)
+                continue
+            if self.sample_rate is None:
+                if position + _INFO_FRAME_BYTES > len(data):
+                    break
+                self.sample_rate = frame["sample_rate"]
+                frame_data = data[position:position + _INFO_FRAME_BYTES]
+                if b"Xing" in frame_data or b"Info" in frame_data or frame_data[36:40] == b"VBRI":
+                    # The header frame carries no audio
+                    position += frame["frame_length"]
+                    continue
+            if self.samples * 1000 >= len(self.offsets) * self.interval_ms * self.sample_rate:
+                self.offsets.append(base + position)
+            self.samples += frame["samples_per_frame"]
+            position += frame["frame_length"]
+            self.end_offset = base + position
+
+        if position > len(data):
+            self._skip = position - len(data)
+            self._pending = b""
+        else:
+            self._pending = data[position:]
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        return self.samples / self.sample_rate if self.sample_rate else None
+
+    def pack(self) -> Optional[bytes]:
+        """Get the packed table, or None if no frames were found or offsets exceed 4 GiB."""
+        if not self.offsets or self.offsets[-1] > 0xFFFFFFFF:
+            return None
+        return _HEADER.pack(self.interval_ms) + struct.pack(f"<{len(self.offsets)}I", *self.offsets)
+
+
+def lookup_seek_index(seek_index: bytes, seconds: float) -> Tuple[float, int]:
+    """Get the indexed time and byte offset to start playback from for ``seconds``."""
+    (interval_ms,) = _HEADER.unpack_from(seek_index)
+    count = (len(seek_index) - _HEADER.size) // 4
+    entry = min(max(0, int(seconds * 1000 // interval_ms)), count - 1)
+    (offset,) = struct.unpack_from("<I", seek_index, _HEADER.size + entry * 4)
+    return entry * interval_ms / 1000, offset
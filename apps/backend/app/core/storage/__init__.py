@@ -0,0 +1,34 @@
+"""Object storage backends.
+
+``get_storage()`` returns the backend selected by ``STORAGE_BACKEND``:
+S3-compatible storage (DigitalOcean Spaces) or the local filesystem.
+"""
+from typing import Optional
+
+from app.core.config import settings
+from app.core.storage.base import StorageBackend
+
+_storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    """Get the configured storage backend, creating it on first use."""
+    global _storage
+    if _storage is None:
+        if settings.STORAGE_BACKEND == "local":
+            from app.core.storage.local import LocalStorage
+
+            _storage = LocalStorage(
+                root=settings.LOCAL_STORAGE_ROOT,
+                base_url=settings.LOCAL_STORAGE_BASE_URL,
+                secret=settings.LOCAL_STORAGE_SECRET,
+                public_prefixes=settings.LOCAL_STORAGE_PUBLIC_PREFIX_LIST,
+            )
+        else:
+            from app.core.storage.s3 import S3Storage
+
+            _storage = S3Storage()
+    return _storage
+
+
+__all__ = ["StorageBackend", "get_storage"]
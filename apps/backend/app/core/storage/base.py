@@ -0,0 +1,193 @@
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class StorageBackend(ABC):
+    """Object storage used for uploads, downloads and clean-up.
+
+    Endpoints and background tasks depend on this interface only. Blocking
+    methods (anything that talks to the store) should be called from a worker
+    thread; URL signing and ``object_key_from_url`` are local and cheap.
+    """
+
+    def __init__(self, public_url_base: str):
+        self.public_url_base = public_url_base.rstrip("/")
+        # (object_key, expires_in, bucket start) -> download URL and expiry
+        self.download_url_cache: TTLCache = TTLCache(
+            maxsize=settings.DOWNLOAD_URL_CACHE_SIZE,
+            ttl=settings.DOWNLOAD_URL_BUCKET_SECONDS,
+        )
+
+    # URLs
+
+    def public_url(self, object_key: str) -> str:
+        """Get the public URL stored for an object (e.g. ``audio_files.file_url``)."""
+        return f"{self.public_url_base}/{object_key}"
+
+    def object_key_from_url(self, file_url: str) -> str:
+        """Get the object key of a stored file's public URL."""
+        if self.public_url_base and file_url.startswith(f"{self.public_url_base}/"):
+            return unquote(file_url[len(self.public_url_base) + 1:])
+        return unquote(urlsplit(file_url).path.lstrip("/"))
+
+    def owned_object_key(self, file_url: str) -> Optional[str]:
+        """Get the object key of a URL under ``public_url_base``, or None for files stored elsewhere.
+
+        Use this before deleting: a row may point at an external URL whose
+        path happens to look like one of our keys.
+        """
+        if not self.public_url_base or not file_url.startswith(f"{self.public_url_base}/"):
+            return None
+        return unquote(file_url[len(self.public_url_base) + 1:])
+
+    @staticmethod
+    def new_object_key(file_name: str, folder: str) -> str:
+        """Get a unique key for a new upload, keeping the file extension."""
+        file_extension = file_name.split('.')[-1] if '.' in file_name else ''
+        return f"{folder}/{uuid.uuid4()}.{file_extension}"
+
+    @abstractmethod
+    def sign_upload_url(self, object_key: str, file_type: str, expires_in: int) -> str:
+        """Sign a URL the client PUTs the file to, with ``Content-Type: file_type``."""
+
+    @abstractmethod
+    def sign_download_url(self, object_key: str, expires_in: int, signed_at: int) -> str:
+        """Sign a GET URL valid from ``signed_at`` for ``expires_in`` seconds."""
+
+    def generate_presigned_url(
+        self,
+        file_name: str,
+        file_type: str,
+        expires_in: int = 3600,
+        folder: str = "uploads"
+    ) -> dict:
+        """Generate presigned URL for file upload."""
+        object_key = self.new_object_key(file_name, folder)
+        return {
+            "upload_url": self.sign_upload_url(object_key, file_type, expires_in),
+            "file_url": self.public_url(object_key),
+            "object_key": object_key,
+            "expires_in": expires_in
+        }
+
+    def generate_presigned_urls(
+        self,
+        files: Iterable[Tuple[str, str, str]],
+        expires_in: int = 3600
+    ) -> List[dict]:
+        """Generate presigned upload URLs for ``(file_name, file_type, folder)`` tuples."""
+        return [
+            self.generate_presigned_url(file_name, file_type, expires_in=expires_in, folder=folder)
+            for file_name, file_type, folder in files
+        ]
+
+    def get_download_url(self, object_key: str, expires_in: Optional[int] = None) -> dict:
+        """Get a download URL for an object, when it expires and when it is replaced.
+
+        URLs are signed as of the start of the current expiry bucket, so all
+        calls (on any worker) within a bucket return the same URL and
+        browsers and the CDN can cache the response. Repeat calls are served
+        from memory until the bucket ends.
+        """
+        expires_in = expires_in or settings.DOWNLOAD_URL_EXPIRES_SECONDS
+        bucket_seconds = max(1, min(settings.DOWNLOAD_URL_BUCKET_SECONDS, expires_in // 2))
+        now = time.time()
+        bucket_start = int(now - now % bucket_seconds)
+        cache_key = (object_key, expires_in, bucket_start)
+
+        download = self.download_url_cache.get(cache_key)
+        if download is None:
+            download = {
+                "url": self.sign_download_url(object_key, expires_in, bucket_start),
+                "expires_at": bucket_start + expires_in,
+                "refresh_at": bucket_start + bucket_seconds,
+            }
+            self.download_url_cache.set(cache_key, download, ttl=bucket_start + bucket_seconds - now)
+        return download
+
+    def generate_download_url(self, object_key: str, expires_in: int = 3600) -> str:
+        """Generate presigned URL for file download."""
+        return self.get_download_url(object_key, expires_in)["url"]
+
+    # Objects
+
+    @abstractmethod
+    def get_file_info(self, object_key: str) -> Optional[dict]:
+        """Get ``size``, ``last_modified``, ``content_type`` and ``etag``, or None if missing."""
+
+    @abstractmethod
+    def iter_range(
+        self,
+        object_key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = 64 * 1024
+    ) -> Iterator[bytes]:
+        """Stream bytes ``start`` to ``end`` (inclusive; None for end of file)."""
+
+    @abstractmethod
+    def put_object(self, object_key: str, data: bytes, content_type: str) -> None:
+        """Store a small object generated on the server (e.g. a sample clip)."""
+
+    def local_path(self, object_key: str) -> Optional[Path]:
+        """Get the file an object is stored in, for backends that keep objects on local disk."""
+        return None
+
+    def read_range(self, object_key: str, start: int, end: int) -> bytes:
+        """Read bytes ``start`` to ``end`` (inclusive) of an object."""
+        return b"".join(self.iter_range(object_key, start, end))
+
+    @abstractmethod
+    def delete_objects(self, object_keys: List[str]) -> List[str]:
+        """Delete objects and return the keys that could not be deleted."""
+
+    def delete_file(self, object_key: str) -> bool:
+        """Delete a single object."""
+        return not self.delete_objects([object_key])
+
+    @abstractmethod
+    def list_objects_page(
+        self,
+        prefix: str,
+        continuation_token: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """List one page of ``object_key``/``last_modified``/``size`` dicts and the next page token."""
+
+    # Multipart uploads
+
+    @abstractmethod
+    def create_multipart_upload(self, file_name: str, file_type: str, folder: str = "uploads") -> dict:
+        """Start a multipart upload; returns ``upload_id``, ``object_key`` and ``file_url``."""
+
+    @abstractmethod
+    def generate_part_upload_urls(
+        self,
+        object_key: str,
+        upload_id: str,
+        part_numbers: Iterable[int],
+        expires_in: int = 3600
+    ) -> List[dict]:
+        """Presign PUT URLs (``part_number``/``upload_url``) for parts of an upload."""
+
+    @abstractmethod
+    def list_parts(self, object_key: str, upload_id: str) -> List[dict]:
+        """List uploaded parts (``part_number``/``size``/``etag``) in part order."""
+
+    @abstractmethod
+    def complete_multipart_upload(self, object_key: str, upload_id: str, parts: List[dict]) -> None:
+        """Assemble the object from its uploaded parts."""
+
+    @abstractmethod
+    def abort_multipart_upload(self, object_key: str, upload_id: str) -> bool:
+        """Abort an upload and discard its parts."""
+
+    @abstractmethod
+    def list_multipart_uploads(self, prefix: str = "") -> List[dict]:
+        """List incomplete uploads (``object_key``/``upload_id``/``initiated``)."""
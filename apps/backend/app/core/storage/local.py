@@ -0,0 +1,299 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import mimetypes
+import os
+import re
+import shutil
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from app.core.storage.base import StorageBackend
+
+LIST_PAGE_SIZE = 1000
+MULTIPART_DIR = ".multipart"
+_UPLOAD_ID = re.compile(r"[0-9a-f]{32}")
+
+
+class LocalStorage(StorageBackend):
+    """Storage on the local filesystem, for on-prem and edge deployments and tests.
+
+    Objects live under ``root`` at their key. Clients upload and download
+    through the ``/storage`` endpoints with URLs carrying an HMAC token, the
+    same way they use presigned URLs against S3. Multipart parts are kept
+    under ``root/.multipart/<upload id>/`` until the upload completes.
+    """
+
+    def __init__(self, root: str, base_url: str, secret: str, public_prefixes: Iterable[str] = ()):
+        if not secret:
+            # An empty key would let anyone forge upload and download URLs
+            raise ValueError("Local storage secret is not configured")
+        super().__init__(base_url)
+        self.root = Path(root).resolve()
+        self.public_prefixes = tuple(public_prefixes)
+        self._secret = secret.encode()
+
+    # Paths
+
+    def path_for(self, object_key: str) -> Path:
+        """Get the file for an object key, refusing keys that escape the root."""
+        parts = object_key.split("/")
+        if not object_key or any(not part or part.startswith(".") for part in parts):
+            raise ValueError(f"Invalid object key: {object_key}")
+        return self.root.joinpath(*parts)
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        if not _UPLOAD_ID.fullmatch(upload_id):
+            raise ValueError(f"Invalid upload id: {upload_id}")
+        return self.root / MULTIPART_DIR / upload_id
+
+    def _read_upload(self, object_key: str, upload_id: str) -> Path:
+        upload_dir = self._upload_dir(upload_id)
+        try:
+            meta = json.loads((upload_dir / "upload.json").read_text())
+        except FileNotFoundError:
+            raise Exception(f"No such upload: {upload_id}")
+        if meta["object_key"] != object_key:
+            raise Exception(f"No such upload: {upload_id}")
+        return upload_dir
+
+    # Signed URLs
+
+    def _token(self, method: str, object_key: str, expires_at: int, upload_part: str = "") -> str:
+        message = f"{method}\n{object_key}\n{expires_at}\n{upload_part}".encode()
+        return hmac.new(self._secret, message, hashlib.sha256).hexdigest()
+
+    def _signed_url(self, method: str, object_key: str, expires_at: int, upload_id: str = "", part_number: int = 0) -> str:
+        upload_part = f"{upload_id}:{part_number}" if upload_id else ""
+        url = (
+            f"{self.public_url(quote(object_key))}?expires={expires_at}"
+            f"&token={self._token(method, object_key, expires_at, upload_part)}"
+        )
+        if upload_id:
+            url += f"&uploadId={upload_id}&partNumber={part_number}"
+        return url
+
+    def verify(
+        self,
+        method: str,
+        object_key: str,
+        expires_at: Optional[int],
+        token: Optional[str],
+        upload_id: Optional[str] = None,
+        part_number: Optional[int] = None
+    ) -> bool:
+        """Check a signed URL's token and expiry."""
+        if not token or expires_at is None or expires_at < time.time():
+            return False
+        upload_part = f"{upload_id}:{part_number}" if upload_id else ""
+        return hmac.compare_digest(token, self._token(method, object_key, expires_at, upload_part))
+
+    def is_public(self, object_key: str) -> bool:
+        """Whether an object may be read without a signed URL (e.g. cover images)."""
+        return object_key.startswith(self.public_prefixes) if self.public_prefixes else False
+
+    def sign_upload_url(self, object_key: str, file_type: str, expires_in: int) -> str:
+        return self._signed_url("PUT", object_key, int(time.time()) + expires_in)
+
+    def sign_download_url(self, object_key: str, expires_in: int, signed_at: int) -> str:
+        return self._signed_url("GET", object_key, signed_at + expires_in)
+
+    # Objects
+
+    async def write(
+        self,
+        object_key: str,
+        chunks: AsyncIterator[bytes],
+        upload_id: Optional[str] = None,
+        part_number: Optional[int] = None
+    ) -> dict:
+        """Write an object (or one part of a multipart upload) from a request body.
+
+        Data goes to a temporary file that replaces the target only once the
+        body is complete, so readers never see a partial object.
+        """
+        if upload_id:
+            target = self._read_upload(object_key, upload_id) / f"{part_number:05d}"
+        else:
+            target = self.path_for(object_key)
+        await asyncio.to_thread(target.parent.mkdir, parents=True, exist_ok=True)
+        temporary = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        handle = await asyncio.to_thread(open, temporary, "wb")
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(handle.write, chunk)
+            await asyncio.to_thread(handle.close)
+            os.replace(temporary, target)
+        except BaseException:
+            handle.close()
+            temporary.unlink(missing_ok=True)
+            raise
+        return self._file_info(target)
+
+    @staticmethod
+    def _file_info(path: Path) -> dict:
+        stat = path.stat()
+        return {
+            "size": stat.st_size,
+            "last_modified": datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+            "content_type": mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+            "etag": f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        }
+
+    def get_file_info(self, object_key: str) -> Optional[dict]:
+        """Get file information."""
+        try:
+            path = self.path_for(object_key)
+            return self._file_info(path) if path.is_file() else None
+        except (ValueError, FileNotFoundError):
+            return None
+
+    def put_object(self, object_key: str, data: bytes, content_type: str) -> None:
+        """Write an object through a temporary file, like ``write``."""
+        target = self.path_for(object_key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            temporary.write_bytes(data)
+            os.replace(temporary, target)
+        except BaseException:
+            temporary.unlink(missing_ok=True)
+            raise
+
+    def local_path(self, object_key: str) -> Optional[Path]:
+        return self.path_for(object_key)
+
+    def iter_range(
+        self,
+        object_key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = 64 * 1024
+    ) -> Iterator[bytes]:
+        """Stream a byte range of a file."""
+        with open(self.path_for(object_key), "rb") as handle:
+            handle.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = handle.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    return
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def delete_objects(self, object_keys: List[str]) -> List[str]:
+        """Delete files and return the keys that failed."""
+        failed = []
+        for object_key in object_keys:
+            try:
+                self.path_for(object_key).unlink(missing_ok=True)
+            except (ValueError, OSError) as e:
+                print(f"Error deleting file: {e}")
+                failed.append(object_key)
+        return failed
+
+    def list_objects_page(
+        self,
+        prefix: str,
+        continuation_token: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """List one page of files under a prefix, in key order."""
+        keys = []
+        for directory, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+            relative = Path(directory).relative_to(self.root).as_posix()
+            for filename in filenames:
+                if filename.startswith("."):
+                    continue
+                key = filename if relative == "." else f"{relative}/{filename}"
+                if key.startswith(prefix) and (continuation_token is None or key > continuation_token):
+                    keys.append(key)
+        keys.sort()
+        page = keys[:LIST_PAGE_SIZE]
+        objects = []
+        for key in page:
+            info = self._file_info(self.path_for(key))
+            objects.append({"object_key": key, "last_modified": info["last_modified"], "size": info["size"]})
+        return objects, page[-1] if len(keys) > len(page) else None
+
+    # Multipart uploads
+
+    def create_multipart_upload(self, file_name: str, file_type: str, folder: str = "uploads") -> dict:
+        """Start a multipart upload for a new object."""
+        object_key = self.new_object_key(file_name, folder)
+        upload_id = uuid.uuid4().hex
+        upload_dir = self._upload_dir(upload_id)
+        upload_dir.mkdir(parents=True)
+        (upload_dir / "upload.json").write_text(json.dumps({
+            "object_key": object_key,
+            "content_type": file_type,
+            "initiated": datetime.now(timezone.utc).isoformat(),
+        }))
+        return {"upload_id": upload_id, "object_key": object_key, "file_url": self.public_url(object_key)}
+
+    def generate_part_upload_urls(
+        self,
+        object_key: str,
+        upload_id: str,
+        part_numbers: Iterable[int],
+        expires_in: int = 3600
+    ) -> List[dict]:
+        """Sign PUT URLs for parts of a multipart upload."""
+        expires_at = int(time.time()) + expires_in
+        return [
+            {
+                "part_number": part_number,
+                "upload_url": self._signed_url("PUT", object_key, expires_at, upload_id, part_number)
+            }
+            for part_number in part_numbers
+        ]
+
+    def list_parts(self, object_key: str, upload_id: str) -> List[dict]:
+        """List the parts uploaded so far, in part number order."""
+        upload_dir = self._read_upload(object_key, upload_id)
+        parts = []
+        for path in sorted(upload_dir.glob("[0-9]" * 5)):
+            info = self._file_info(path)
+            parts.append({"part_number": int(path.name), "size": info["size"], "etag": info["etag"]})
+        return parts
+
+    def complete_multipart_upload(self, object_key: str, upload_id: str, parts: List[dict]) -> None:
+        """Concatenate the parts into the final file."""
+        upload_dir = self._read_upload(object_key, upload_id)
+        target = self.path_for(object_key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(f".{target.name}.{upload_id}.tmp")
+        with open(temporary, "wb") as output:
+            for part in parts:
+                with open(upload_dir / f"{part['part_number']:05d}", "rb") as part_file:
+                    shutil.copyfileobj(part_file, output, 1024 * 1024)
+        os.replace(temporary, target)
+        shutil.rmtree(upload_dir)
+
+    def abort_multipart_upload(self, object_key: str, upload_id: str) -> bool:
+        """Abort a multipart upload and discard its parts."""
+        try:
+            shutil.rmtree(self._read_upload(object_key, upload_id))
+            return True
+        except Exception as e:
+            print(f"Error aborting multipart upload: {e}")
+            return False
+
+    def list_multipart_uploads(self, prefix: str = "") -> List[dict]:
+        """List incomplete multipart uploads."""
+        uploads = []
+        for meta_path in (self.root / MULTIPART_DIR).glob("*/upload.json"):
+            meta = json.loads(meta_path.read_text())
+            if meta["object_key"].startswith(prefix):
+                uploads.append({
+                    "object_key": meta["object_key"],
+                    "upload_id": meta_path.parent.name,
+                    "initiated": datetime.fromisoformat(meta["initiated"])
+                })
+        return uploads
@@ -0,0 +1,262 @@
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from app.core.config import settings
+from app.core.sigv4 import CDNTokenSigner, SigV4Presigner
+from app.core.storage.base import StorageBackend
+
+
+class S3Storage(StorageBackend):
+    """S3-compatible storage (DigitalOcean Spaces)."""
+
+    def __init__(self):
+        super().__init__(settings.DO_SPACES_CDN_URL)
+        self._client = None
+        self.bucket_name = settings.DO_SPACES_BUCKET
+        # Presigned URLs are signed locally; boto3 is only needed for API calls
+        self.signer = SigV4Presigner(
+            access_key=settings.DIGITAL_OCEAN_ACCESS_KEY,
+            secret_key=settings.DIGITAL_OCEAN_ACCESS_SECRET,
+            region=settings.DO_SPACES_REGION,
+            endpoint_url=settings.DO_SPACES_ENDPOINT,
+        )
+        self.cdn_signer = (
+            CDNTokenSigner(self.public_url_base, settings.CDN_URL_SIGNING_KEY)
+            if settings.CDN_URL_SIGNING_KEY and self.public_url_base else None
+        )
+
+    @property
+    def client(self):
+        """boto3 S3 client, created on first use.
+
+        Importing boto3 and building a client takes a few hundred
+        milliseconds, so it is deferred until a request needs storage.
+        """
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client(
+                's3',
+                endpoint_url=settings.DO_SPACES_ENDPOINT,
+                aws_access_key_id=settings.DIGITAL_OCEAN_ACCESS_KEY,
+                aws_secret_access_key=settings.DIGITAL_OCEAN_ACCESS_SECRET,
+                region_name=settings.DO_SPACES_REGION
+            )
+        return self._client
+
+    def sign_upload_url(self, object_key: str, file_type: str, expires_in: int) -> str:
+        return self.signer.presign(
+            'PUT',
+            self.bucket_name,
+            object_key,
+            expires_in=expires_in,
+            headers={'Content-Type': file_type}
+        )
+
+    def sign_download_url(self, object_key: str, expires_in: int, signed_at: int) -> str:
+        if self.cdn_signer:
+            return self.cdn_signer.sign(object_key, signed_at + expires_in)
+        return self.signer.presign(
+            'GET',
+            self.bucket_name,
+            object_key,
+            expires_in=expires_in,
+            now=datetime.fromtimestamp(signed_at, timezone.utc)
+        )
+
+    def create_multipart_upload(
+        self,
+        file_name: str,
+        file_type: str,
+        folder: str = "uploads"
+    ) -> dict:
+        """Start a multipart upload for a new object."""
+        object_key = self.new_object_key(file_name, folder)
+        try:
+            response = self.client.create_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=object_key,
+                ContentType=file_type
+            )
+        except ClientError as e:
+            raise Exception(f"Error creating multipart upload: {str(e)}")
+
+        return {
+            "upload_id": response["UploadId"],
+            "object_key": object_key,
+            "file_url": self.public_url(object_key)
+        }
+
+    def generate_part_upload_urls(
+        self,
+        object_key: str,
+        upload_id: str,
+        part_numbers: Iterable[int],
+        expires_in: int = 3600
+    ) -> List[dict]:
+        """Presign PUT URLs for parts of a multipart upload."""
+        return [
+            {
+                "part_number": part_number,
+                "upload_url": self.signer.presign(
+                    'PUT',
+                    self.bucket_name,
+                    object_key,
+                    expires_in=expires_in,
+                    query={'partNumber': part_number, 'uploadId': upload_id}
+                )
+            }
+            for part_number in part_numbers
+        ]
+
+    def list_parts(self, object_key: str, upload_id: str) -> List[dict]:
+        """List the parts uploaded so far, in part number order."""
+        parts = []
+        marker = 0
+        try:
+            while True:
+                response = self.client.list_parts(
+                    Bucket=self.bucket_name,
+                    Key=object_key,
+                    UploadId=upload_id,
+                    PartNumberMarker=marker
+                )
+                parts.extend(
+                    {"part_number": part["PartNumber"], "size": part["Size"], "etag": part["ETag"]}
+                    for part in response.get("Parts", [])
+                )
+                if not response.get("IsTruncated"):
+                    return parts
+                marker = response["NextPartNumberMarker"]
+        except ClientError as e:
+            raise Exception(f"Error listing upload parts: {str(e)}")
+
+    def complete_multipart_upload(self, object_key: str, upload_id: str, parts: List[dict]) -> None:
+        """Assemble the object from its uploaded parts."""
+        try:
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=object_key,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"PartNumber": part["part_number"], "ETag": part["etag"]}
+                        for part in parts
+                    ]
+                }
+            )
+        except ClientError as e:
+            raise Exception(f"Error completing multipart upload: {str(e)}")
+
+    def abort_multipart_upload(self, object_key: str, upload_id: str) -> bool:
+        """Abort a multipart upload and discard its parts."""
+        try:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=object_key,
+                UploadId=upload_id
+            )
+            return True
+
+        except ClientError as e:
+            print(f"Error aborting multipart upload: {str(e)}")
+            return False
+
+    def list_multipart_uploads(self, prefix: str = "") -> List[dict]:
+        """List incomplete multipart uploads."""
+        uploads = []
+        params = {"Bucket": self.bucket_name, "Prefix": prefix}
+        while True:
+            response = self.client.list_multipart_uploads(**params)
+            uploads.extend(
+                {
+                    "object_key": upload["Key"],
+                    "upload_id": upload["UploadId"],
+                    "initiated": upload["Initiated"]
+                }
+                for upload in response.get("Uploads", [])
+            )
+            if not response.get("IsTruncated"):
+                return uploads
+            params["KeyMarker"] = response["NextKeyMarker"]
+            params["UploadIdMarker"] = response["NextUploadIdMarker"]
+
+    def delete_objects(self, object_keys: List[str]) -> List[str]:
+        """Delete objects in batches of 1000 and return the keys that failed."""
+        failed = []
+        for start in range(0, len(object_keys), 1000):
+            batch = object_keys[start:start + 1000]
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+                )
+                failed.extend(error["Key"] for error in response.get("Errors", []))
+            except ClientError as e:
+                print(f"Error deleting files: {str(e)}")
+                failed.extend(batch)
+        return failed
+
+    def list_objects_page(
+        self,
+        prefix: str,
+        continuation_token: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """List one page of objects under a prefix and the token for the next page."""
+        params = {"Bucket": self.bucket_name, "Prefix": prefix}
+        if continuation_token:
+            params["ContinuationToken"] = continuation_token
+        response = self.client.list_objects_v2(**params)
+        objects = [
+            {"object_key": item["Key"], "last_modified": item["LastModified"], "size": item["Size"]}
+            for item in response.get("Contents", [])
+        ]
+        return objects, response.get("NextContinuationToken") if response.get("IsTruncated") else None
+
+    def get_file_info(self, object_key: str) -> Optional[dict]:
+        """Get file information."""
+        try:
+            response = self.client.head_object(
+                Bucket=self.bucket_name,
+                Key=object_key
+            )
+            return {
+                "size": response.get('ContentLength'),
+                "last_modified": response.get('LastModified'),
+                "content_type": response.get('ContentType'),
+                "etag": response.get('ETag')
+            }
+            
+        except ClientError as e:
+            print(f"Error getting file info: {str(e)}")
+            return None
+
+    def put_object(self, object_key: str, data: bytes, content_type: str) -> None:
+        """Upload an object in a single request."""
+        self.client.put_object(
+            Bucket=self.bucket_name,
+            Key=object_key,
+            Body=data,
+            ContentType=content_type
+        )
+
+    def iter_range(
+        self,
+        object_key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = 64 * 1024
+    ) -> Iterator[bytes]:
+        """Stream a byte range of an object."""
+        response = self.client.get_object(
+            Bucket=self.bucket_name,
+            Key=object_key,
+            Range=f"bytes={start}-{'' if end is None else end}"
+        )
+        body = response["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
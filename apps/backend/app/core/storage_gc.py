@@ -0,0 +1,237 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.storage import StorageBackend, get_storage
+from app.db.database import AsyncSessionLocal, get_async_engine
+from app.repositories.audio_file import AsyncAudioFileRepository
+from app.repositories.audiobook import AsyncAudiobookRepository
+
+# pg advisory lock key so only one worker runs the reconciler at a time
+RECONCILE_LOCK_ID = 0x5354_4743  # "STGC"
+
+
+class StorageDeleter:
+    """Deletes storage objects off the request path, in batches.
+
+    Endpoints enqueue object keys after their database change commits; a
+    background task sends them with ``delete_objects``, up to
+    ``batch_size`` keys per call. Keys that fail (or are still queued when
+    the process dies) are unreferenced, so the reconciler deletes them later.
+    """
+
+    def __init__(
+        self,
+        storage: Optional[StorageBackend] = None,
+        batch_size: int = 1000,
+        flush_interval_seconds: float = 1.0,
+    ):
+        self._storage = storage
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.deleted = 0
+        self.failed = 0
+        self._pending: dict = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def storage(self) -> StorageBackend:
+        return self._storage or get_storage()
+
+    def enqueue(self, object_keys: Iterable[str]) -> None:
+        """Queue objects for deletion."""
+        for key in object_keys:
+            if key:
+                self._pending[key] = None
+        if self._wakeup is not None and len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def flush(self) -> int:
+        """Delete everything queued so far and return how many objects were deleted."""
+        deleted = 0
+        while self._pending:
+            batch: List[str] = []
+            for key in list(self._pending)[:self.batch_size]:
+                del self._pending[key]
+                batch.append(key)
+            # boto3 calls block, so they run in a worker thread
+            failed = await asyncio.to_thread(self.storage.delete_objects, batch)
+            if failed:
+                print(f"Failed to delete {len(failed)} storage objects")
+            self.failed += len(failed)
+            deleted += len(batch) - len(failed)
+        self.deleted += deleted
+        return deleted
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Error deleting storage objects: {e}")
+
+    def start(self) -> None:
+        """Start the background delete task."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the background task, deleting whatever is still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+        if self._pending:
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Error deleting storage objects: {e}")
+
+    def stats(self) -> dict:
+        return {"pending": len(self._pending), "deleted": self.deleted, "failed": self.failed}
+
+
+class StorageReconciler:
+    """Finds stored objects no row references any more and deletes them.
+
+    Walks ``list_objects_v2`` pages under the upload prefixes and diffs them
+    against ``audio_files.file_url`` and the audiobook cover and sample URLs.
+    Objects younger than the grace period are kept, since uploads land in
+    storage before the rows that reference them are created. The periodic
+    task only runs when ``STORAGE_GC_ENABLED`` is set; admins can always
+    preview a run with ``dry_run``.
+    """
+
+    def __init__(
+        self,
+        deleter: StorageDeleter,
+        prefixes: Iterable[str],
+        grace_seconds: float,
+        interval_seconds: float,
+        max_deletes_per_run: int,
+        storage: Optional[StorageBackend] = None,
+    ):
+        self._storage = storage
+        self.deleter = deleter
+        self.prefixes = list(prefixes)
+        self.grace_seconds = grace_seconds
+        self.interval_seconds = interval_seconds
+        self.max_deletes_per_run = max_deletes_per_run
+        self.last_run: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def storage(self) -> StorageBackend:
+        return self._storage or get_storage()
+
+    async def referenced_keys(self) -> Set[str]:
+        """Get the object keys of every stored file a row points to.
+
+        Keys are read from URLs under the storage's public URL base. For any
+        other URL the path is kept as well, so a row pointing somewhere
+        unexpected can only make the reconciler delete less.
+        """
+        get_async_engine()
+        async with AsyncSessionLocal() as db:
+            urls = await AsyncAudioFileRepository(db).get_all_file_urls()
+            urls += await AsyncAudiobookRepository(db).get_all_media_urls()
+        storage = self.storage
+        return {storage.owned_object_key(url) or storage.object_key_from_url(url) for url in urls}
+
+    async def find_orphans(self, now: Optional[datetime] = None) -> dict:
+        """Diff storage against the database and return orphaned keys with counts."""
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(seconds=self.grace_seconds)
+        referenced = await self.referenced_keys()
+        scanned = 0
+        orphans: List[str] = []
+        for prefix in self.prefixes:
+            token = None
+            while True:
+                objects, token = await asyncio.to_thread(self.storage.list_objects_page, prefix, token)
+                scanned += len(objects)
+                orphans.extend(
+                    item["object_key"] for item in objects
+                    if item["object_key"] not in referenced and item["last_modified"] < cutoff
+                )
+                if token is None:
+                    break
+        return {"scanned": scanned, "referenced": len(referenced), "orphans": orphans}
+
+    async def run_once(self, dry_run: bool = False, now: Optional[datetime] = None) -> dict:
+        """Queue orphaned objects for deletion, unless another worker is already reconciling."""
+        if not self.storage.public_url_base:
+            # Stored URLs cannot be matched to keys, so everything would look orphaned
+            return {"skipped": True, "reason": "storage public URL base is not configured"}
+
+        async with get_async_engine().connect() as connection:
+            locked = await connection.scalar(select(func.pg_try_advisory_lock(RECONCILE_LOCK_ID)))
+            if not locked:
+                return {"skipped": True}
+            try:
+                result = await self.find_orphans(now)
+            finally:
+                await connection.scalar(select(func.pg_advisory_unlock(RECONCILE_LOCK_ID)))
+
+        orphans = result.pop("orphans")
+        result["orphans"] = len(orphans)
+        result["sample"] = orphans[:20]
+        to_delete = orphans[:self.max_deletes_per_run]
+        if not dry_run:
+            self.deleter.enqueue(to_delete)
+        result["queued"] = 0 if dry_run else len(to_delete)
+        result["dry_run"] = dry_run
+        self.last_run = {**result, "finished_at": datetime.now(timezone.utc).isoformat()}
+        return result
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                result = await self.run_once()
+                if result.get("queued"):
+                    print(f"Queued {result['queued']} orphaned storage objects for deletion")
+            except Exception as e:
+                print(f"Error reconciling storage: {e}")
+
+    def start(self) -> None:
+        """Start the periodic reconcile task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the periodic reconcile task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+storage_deleter = StorageDeleter(batch_size=settings.STORAGE_DELETE_BATCH_SIZE)
+
+storage_reconciler = StorageReconciler(
+    storage_deleter,
+    prefixes=settings.STORAGE_GC_PREFIX_LIST,
+    grace_seconds=settings.STORAGE_GC_GRACE_HOURS * 3600,
+    interval_seconds=settings.STORAGE_GC_INTERVAL_SECONDS,
+    max_deletes_per_run=settings.STORAGE_GC_MAX_DELETES_PER_RUN,
+)
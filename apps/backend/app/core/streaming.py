@@ -0,0 +1,184 @@
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.storage import StorageBackend
+
+ZERO_COPY_EXTENSION = "http.response.zerocopysend"
+_RANGE_SPEC = re.compile(r"(\d*)-(\d*)")
+
+
+class RangeNotSatisfiable(Exception):
+    """None of the requested ranges overlap the file."""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a ``Range`` header into one inclusive ``(start, end)`` byte span.
+
+    Returns None when the whole file should be sent: no header, a unit other
+    than bytes or a malformed header, which RFC 9110 says to ignore. Several
+    ranges are coalesced into the one span covering them; players only ever
+    ask for one.
+    """
+    if not header:
+        return None
+    unit, _, specs = header.partition("=")
+    if unit.strip().lower() != "bytes":
+        return None
+
+    spans = []
+    for spec in specs.split(","):
+        match = _RANGE_SPEC.fullmatch(spec.strip())
+        if not match or match.group() == "-":
+            return None
+        first, last = match.groups()
+        if not first:
+            # Suffix range: the last N bytes
+            if int(last) and size:
+                spans.append((max(0, size - int(last)), size - 1))
+            continue
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        if start < size:
+            spans.append((start, min(int(last), size - 1) if last else size - 1))
+
+    if not spans:
+        raise RangeNotSatisfiable()
+    return min(span[0] for span in spans), max(span[1] for span in spans)
+
+
+def if_range_matches(if_range: Optional[str], etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """Check an ``If-Range`` validator; the range is only served when it still matches."""
+    if not if_range:
+        return True
+    if if_range.startswith(("W/", '"')):
+        # Only strong entity tags can validate a range
+        return bool(etag) and not etag.startswith("W/") and if_range == etag
+    if last_modified is None:
+        return False
+    try:
+        return parsedate_to_datetime(if_range) == last_modified.replace(microsecond=0)
+    except (TypeError, ValueError):
+        return False
+
+
+class ObjectResponse(Response):
+    """Streams bytes ``start`` to ``end`` of a stored object.
+
+    Files on local disk are handed to the server with the ASGI zero-copy
+    extension when it is available (the kernel ``sendfile``s them). Otherwise
+    the object is read in ``STREAM_CHUNK_BYTES`` chunks, one at a time, so a
+    response holds a single chunk in memory however large the range is.
+    """
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        object_key: str,
+        start: int,
+        end: int,
+        status_code: int = 200,
+        headers: Optional[dict] = None,
+        media_type: Optional[str] = None
+    ):
+        self.storage = storage
+        self.object_key = object_key
+        self.start = start
+        self.end = end
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        count = self.end - self.start + 1
+        if count <= 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        path = self.storage.local_path(self.object_key)
+        if path is not None and ZERO_COPY_EXTENSION in scope.get("extensions", {}):
+            with open(path, "rb") as handle:
+                await send({
+                    "type": ZERO_COPY_EXTENSION,
+                    "file": handle,
+                    "offset": self.start,
+                    "count": count,
+                    "more_body": False,
+                })
+            return
+
+        chunks = self.storage.iter_range(self.object_key, self.start, self.end, settings.STREAM_CHUNK_BYTES)
+        try:
+            async for chunk in iterate_in_threadpool(chunks):
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        finally:
+            # Release the file or S3 connection even if the client went away
+            await run_in_threadpool(chunks.close)
+        await send({"type": "http.response.body", "body": b""})
+
+
+def stream_object(
+    storage: StorageBackend,
+    object_key: str,
+    info: dict,
+    request_headers: Headers,
+    cache_control: str = "private, max-age=0"
+) -> Response:
+    """Build the response for a GET of a stored object, honoring ``Range`` and ``If-Range``.
+
+    ``info`` is the object's ``get_file_info``. Open-ended ranges are capped
+    at ``STREAM_MAX_RANGE_BYTES``, which clients handle by requesting the rest.
+    """
+    size = info["size"]
+    etag = info.get("etag")
+    last_modified = info.get("last_modified")
+    headers = {"Accept-Ranges": "bytes", "Cache-Control": cache_control}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+
+    range_header = request_headers.get("range")
+    span = None
+    if range_header and if_range_matches(request_headers.get("if-range"), etag, last_modified):
+        try:
+            span = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{size}"}
+            )
+
+    if span is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        start, end = span
+        if range_header.rstrip().endswith("-") and "," not in range_header:
+            end = min(end, start + settings.STREAM_MAX_RANGE_BYTES - 1)
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    return ObjectResponse(
+        storage,
+        object_key,
+        start,
+        end,
+        status_code=status_code,
+        headers=headers,
+        media_type=info.get("content_type") or "application/octet-stream"
+    )
@@ -0,0 +1,73 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.core.storage import StorageBackend, get_storage
+
+
+class MultipartUploadJanitor:
+    """Periodically aborts multipart uploads that were never completed.
+
+    Parts of an unfinished upload are stored (and billed) until the upload is
+    completed or aborted, and an uploader that gave up never does either.
+    Uploads older than ``max_age_seconds`` are aborted; aborting is idempotent,
+    so several workers running the janitor at once is harmless.
+    """
+
+    def __init__(self, max_age_seconds: float, interval_seconds: float, storage: Optional[StorageBackend] = None):
+        self._storage = storage
+        self.max_age_seconds = max_age_seconds
+        self.interval_seconds = interval_seconds
+        self.aborted = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def storage(self) -> StorageBackend:
+        return self._storage or get_storage()
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """Abort stale uploads and return how many were aborted."""
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(seconds=self.max_age_seconds)
+        # boto3 calls block, so they run in a worker thread
+        uploads = await asyncio.to_thread(self.storage.list_multipart_uploads)
+        aborted = 0
+        for upload in uploads:
+            if upload["initiated"] < cutoff:
+                if await asyncio.to_thread(
+                    self.storage.abort_multipart_upload, upload["object_key"], upload["upload_id"]
+                ):
+                    aborted += 1
+        self.aborted += aborted
+        return aborted
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                aborted = await self.run_once()
+                if aborted:
+                    print(f"Aborted {aborted} stale multipart uploads")
+            except Exception as e:
+                print(f"Error cleaning up multipart uploads: {e}")
+
+    def start(self) -> None:
+        """Start the background cleanup task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the background cleanup task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+upload_janitor = MultipartUploadJanitor(
+    max_age_seconds=settings.MULTIPART_UPLOAD_MAX_AGE_HOURS * 3600,
+    interval_seconds=settings.MULTIPART_JANITOR_INTERVAL_SECONDS,
+)
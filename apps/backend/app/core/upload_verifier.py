@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+from typing import Iterable, Optional
+from uuid import UUID
+
+from app.core.audio_formats import SNIFF_BYTES, RangeReader, read_audio_metadata, sniff_mime_type
+from app.core.config import settings
+from app.core.storage import StorageBackend, get_storage
+from app.core.seek_index import Mp3SeekIndexBuilder
+from app.db.database import AsyncSessionLocal, get_async_engine
+from app.repositories.audio_file import AsyncAudioFileRepository
+from app.repositories.audiobook import AsyncAudiobookRepository
+
+
+def inspect_object(
+    storage: StorageBackend,
+    object_key: str,
+    chunk_size: int,
+    seek_interval_seconds: float = settings.SEEK_INDEX_INTERVAL_SECONDS,
+) -> Optional[dict]:
+    """Read a stored object and return its verified size, type, SHA-256 and audio properties.
+
+    The object is streamed in ``chunk_size`` pieces, so memory use does not
+    depend on the file size. MP3 frames are indexed during the same pass
+    into a seek table. Returns None if the object does not exist.
+    """
+    info = storage.get_file_info(object_key)
+    if info is None:
+        return None
+
+    digest = hashlib.sha256()
+    head = b""
+    size = 0
+    seek_index = None
+    chunks = storage.iter_range(object_key, 0, None, chunk_size)
+    try:
+        for chunk in chunks:
+            if size == 0 and sniff_mime_type(chunk[:SNIFF_BYTES]) == "audio/mpeg":
+                seek_index = Mp3SeekIndexBuilder(seek_interval_seconds)
+            if seek_index is not None:
+                seek_index.feed(chunk)
+            if len(head) < SNIFF_BYTES:
+                head += chunk[:SNIFF_BYTES - len(head)]
+            digest.update(chunk)
+            size += len(chunk)
+    finally:
+        chunks.close()
+
+    # Duration and stream properties come from the headers only, via ranged reads
+    reader = RangeReader(lambda start, end: storage.read_range(object_key, start, end), size)
+    metadata = read_audio_metadata(reader) or {}
+    duration = metadata.get("duration_seconds")
+
+    return {
+        "file_size_bytes": size,
+        "mime_type": sniff_mime_type(head) or info.get("content_type"),
+        "checksum": digest.hexdigest(),
+        "duration_seconds": round(duration) if duration is not None else None,
+        "bitrate_bps": metadata.get("bitrate"),
+        "sample_rate_hz": metadata.get("sample_rate"),
+        "seek_index": seek_index.pack() if seek_index is not None else None,
+    }
+
+
+class AudioFileVerifier:
+    """Fills in audio file metadata from the stored object after upload.
+
+    Clients may send ``file_size_bytes``, ``duration_seconds``, ``mime_type``
+    and ``checksum`` when creating an audio file, but usually leave them out
+    and nothing checks them. Endpoints enqueue new and re-pointed audio
+    files; ``workers`` tasks each stream one object at a time in a worker
+    thread and write the verified values back (rolling chapter durations up
+    into the audiobook), so a bulk upload of hundreds of chapters is
+    processed in parallel with at most ``workers`` chunks in memory.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        chunk_size: int = 1024 * 1024,
+        storage: Optional[StorageBackend] = None,
+    ):
+        self._storage = storage
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.verified = 0
+        self.failed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list = []
+
+    @property
+    def storage(self) -> StorageBackend:
+        return self._storage or get_storage()
+
+    def enqueue(self, audio_file_ids: Iterable[UUID]) -> None:
+        """Queue audio files for verification (ignored until started)."""
+        if self._queue is None:
+            return
+        for audio_file_id in audio_file_ids:
+            self._queue.put_nowait(audio_file_id)
+
+    async def verify(self, audio_file_id: UUID) -> Optional[dict]:
+        """Verify one audio file and save the results; returns them, or None if it is gone."""
+        get_async_engine()
+        async with AsyncSessionLocal() as db:
+            audio_file = await AsyncAudioFileRepository(db).get(audio_file_id)
+            if audio_file is None:
+                return None
+            file_url = audio_file.file_url
+            audiobook_id = audio_file.audiobook_id
+            claimed_checksum = audio_file.checksum
+
+        storage = self.storage
+        # Reading and hashing block, so they run in a worker thread
+        values = await asyncio.to_thread(
+            inspect_object, storage, storage.object_key_from_url(file_url), self.chunk_size
+        )
+        if values is None:
+            print(f"Audio file {audio_file_id} has no stored object at {file_url}")
+            return None
+        if claimed_checksum and claimed_checksum.lower() != values["checksum"]:
+            print(f"Audio file {audio_file_id} checksum mismatch: client sent {claimed_checksum}")
+
+        async with AsyncSessionLocal() as db:
+            # Skipped if the file was re-pointed meanwhile; that change queued its own check
+            if await AsyncAudioFileRepository(db).set_verified_metadata(audio_file_id, file_url, **values):
+                await AsyncAudiobookRepository(db).refresh_duration(audiobook_id)
+        return values
+
+    async def _worker(self) -> None:
+        while True:
+            audio_file_id = await self._queue.get()
+            try:
+                if await self.verify(audio_file_id) is not None:
+                    self.verified += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"Error verifying audio file {audio_file_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def start(self) -> None:
+        """Start the worker tasks."""
+        if not self._tasks:
+            self._queue = asyncio.Queue()
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def join(self) -> None:
+        """Wait until everything queued so far has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Stop the workers; files still queued stay unverified."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self._queue = None
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "verified": self.verified,
+            "failed": self.failed,
+        }
+
+
+audio_file_verifier = AudioFileVerifier(
+    workers=settings.AUDIO_VERIFY_WORKERS,
+    chunk_size=settings.AUDIO_VERIFY_CHUNK_BYTES,
+)
@@ -0,0 +1,91 @@
+import asyncio
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import asyncpg
+
+# Postgres NOTIFY channel carrying the clerk_user_id of a changed profile
+USER_CHANGED_CHANNEL = "user_profile_changed"
+
+# clerk_user_id -> profile snapshot, so authenticated requests skip the
+# user_profiles lookup. Invalidated locally on writes, across workers via
+# NOTIFY, and bounded by the TTL if a notification is ever missed.
+user_cache: TTLCache = TTLCache(
+    maxsize=settings.USER_CACHE_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_users(clerk_user_ids: Iterable[str]) -> None:
+    """Drop cached snapshots in this process."""
+    for clerk_user_id in clerk_user_ids:
+        user_cache.pop(clerk_user_id)
+
+
+class UserCacheListener:
+    """LISTEN for profile changes made by other workers and drop their snapshots.
+
+    Uses one dedicated asyncpg connection to the primary. If it drops, the
+    whole cache is cleared (notifications may have been missed) and the
+    listener reconnects in the background.
+    """
+
+    def __init__(self, dsn: str, reconnect_delay_seconds: float = 5.0):
+        self.dsn = dsn
+        self.reconnect_delay_seconds = reconnect_delay_seconds
+        self._connection: Optional["asyncpg.Connection"] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        user_cache.pop(payload)
+
+    def _on_termination(self, connection) -> None:
+        user_cache.clear()
+        self._connection = None
+        if not self._closed:
+            self._reconnect_task = asyncio.ensure_future(self._reconnect())
+
+    async def _connect(self) -> None:
+        # asyncpg is imported here so importing the app does not load the driver
+        import asyncpg
+
+        connection = await asyncpg.connect(self.dsn)
+        await connection.add_listener(USER_CHANGED_CHANNEL, self._on_notification)
+        connection.add_termination_listener(self._on_termination)
+        self._connection = connection
+
+    async def _reconnect(self) -> None:
+        while not self._closed and self._connection is None:
+            await asyncio.sleep(self.reconnect_delay_seconds)
+            try:
+                await self._connect()
+                # Changes made while disconnected were not heard
+                user_cache.clear()
+            except Exception as e:
+                print(f"User cache listener reconnect failed: {e}")
+
+    async def start(self) -> None:
+        """Start listening; on failure keep retrying in the background."""
+        self._closed = False
+        try:
+            await self._connect()
+        except Exception as e:
+            print(f"User cache listener could not connect: {e}")
+            self._reconnect_task = asyncio.ensure_future(self._reconnect())
+
+    async def close(self) -> None:
+        """Stop listening."""
+        self._closed = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            await connection.close()
+
+
+user_cache_listener = UserCacheListener(settings.DATABASE_URL)
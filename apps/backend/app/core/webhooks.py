@@ -0,0 +1,53 @@
+import base64
+import hashlib
+import hmac
+import time
+from typing import Mapping
+
+
+class WebhookVerificationError(Exception):
+    """Raised when a webhook delivery cannot be authenticated."""
+
+
+def verify_svix_signature(
+    secret: str,
+    headers: Mapping[str, str],
+    body: bytes,
+    tolerance_seconds: int = 300,
+) -> None:
+    """Verify a Svix-signed webhook delivery (the scheme Clerk uses).
+
+    The signature is an HMAC-SHA256 over ``"{svix-id}.{svix-timestamp}.{body}"``
+    keyed with the base64 part of the ``whsec_`` secret. ``svix-signature``
+    may carry several space-separated ``v1,<base64>`` signatures during
+    secret rotation; any match is accepted.
+    """
+    if not secret:
+        raise WebhookVerificationError("Webhook secret is not configured")
+
+    message_id = headers.get("svix-id")
+    timestamp = headers.get("svix-timestamp")
+    signatures = headers.get("svix-signature")
+    if not message_id or not timestamp or not signatures:
+        raise WebhookVerificationError("Missing webhook signature headers")
+
+    try:
+        sent_at = int(timestamp)
+    except ValueError:
+        raise WebhookVerificationError("Invalid webhook timestamp")
+    if abs(time.time() - sent_at) > tolerance_seconds:
+        raise WebhookVerificationError("Webhook timestamp outside tolerance")
+
+    try:
+        key = base64.b64decode(secret.removeprefix("whsec_"))
+    except ValueError:
+        raise WebhookVerificationError("Invalid webhook secret")
+
+    signed_content = f"{message_id}.{timestamp}.".encode() + body
+    expected = base64.b64encode(hmac.new(key, signed_content, hashlib.sha256).digest()).decode()
+
+    for versioned_signature in signatures.split():
+        version, _, signature = versioned_signature.partition(",")
+        if version == "v1" and hmac.compare_digest(signature, expected):
+            return
+    raise WebhookVerificationError("Invalid webhook signature")
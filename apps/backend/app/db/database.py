@@ -1,18 +1,123 @@
+from typing import Optional
+
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.instrumentation import instrument_engine
+from app.db.pool import async_engine_options, sync_engine_options
+from app.db.replica import ReplicaMonitor
+
+# Engines are created on first use rather than at import time: creating them
+# loads the DBAPI drivers, which importing the app (tests, CLI tools, workers
+# that never touch a given database) should not pay for. The session factories
+# are bound when their engine is created, so go through get_db/get_async_db or
+# call the matching get_*_engine() before using them directly.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+# Async sessions are used by the API endpoints so queries don't block the event
+# loop. expire_on_commit=False keeps attributes loaded after commit, since async
+# sessions cannot lazy-load them again.
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Optional read replica for read-only endpoints (see get_read_db)
+ReplicaSessionLocal = async_sessionmaker(class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_replica_engine: Optional[AsyncEngine] = None
+_replica_monitor: Optional[ReplicaMonitor] = None
 
 Base = declarative_base()
 
 
+def get_engine() -> Engine:
+    """Get the sync engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(settings.DATABASE_URL, **sync_engine_options())
+        instrument_engine(_engine)
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get the async engine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(settings.ASYNC_DATABASE_URL, **async_engine_options())
+        instrument_engine(_async_engine.sync_engine)
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+def get_replica_engine() -> Optional[AsyncEngine]:
+    """Get the read replica engine, or None when no replica is configured."""
+    global _replica_engine, _replica_monitor
+    if _replica_engine is None and settings.ASYNC_REPLICA_DATABASE_URL:
+        _replica_engine = create_async_engine(settings.ASYNC_REPLICA_DATABASE_URL, **async_engine_options())
+        instrument_engine(_replica_engine.sync_engine)
+        ReplicaSessionLocal.configure(bind=_replica_engine)
+        _replica_monitor = ReplicaMonitor(
+            _replica_engine,
+            max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+            check_interval_seconds=settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS,
+        )
+    return _replica_engine
+
+
+def get_replica_monitor() -> Optional[ReplicaMonitor]:
+    """Get the read replica health monitor, or None when no replica is configured."""
+    get_replica_engine()
+    return _replica_monitor
+
+
+async def dispose_engines():
+    """Close the pools of every engine created so far."""
+    global _engine, _async_engine, _replica_engine, _replica_monitor
+    if _engine is not None:
+        _engine.dispose()
+    for async_engine in (_async_engine, _replica_engine):
+        if async_engine is not None:
+            await async_engine.dispose()
+    _engine = _async_engine = _replica_engine = _replica_monitor = None
+
+
 def get_db():
+    get_engine()
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db(request: Request):
+    """Session for read-only endpoints.
+
+    Uses the replica unless none is configured, it is unhealthy or lagging, or
+    the client wrote recently and must read its own writes from the primary.
+    """
+    replica_monitor = get_replica_monitor()
+    use_replica = (
+        replica_monitor is not None
+        and settings.READ_AFTER_WRITE_COOKIE_NAME not in request.cookies
+        and await replica_monitor.is_healthy()
+    )
+    if use_replica:
+        session_factory = ReplicaSessionLocal
+    else:
+        get_async_engine()
+        session_factory = AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
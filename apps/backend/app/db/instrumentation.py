@@ -0,0 +1,101 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MAX_LOGGED_STATEMENT_LENGTH = 1000
+
+
+class QueryStats:
+    """Query count and database time accumulated for one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_seconds * 1000
+
+
+# Holds a mutable QueryStats so updates made from the tasks and greenlets that
+# run the request's queries are visible to the middleware that created it.
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def start_request_stats() -> QueryStats:
+    """Begin collecting query stats for the current request."""
+    stats = QueryStats()
+    _request_stats.set(stats)
+    return stats
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Describe bind parameters by type only, so values never reach the log."""
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = parameter_shape(parameters[0]) if parameters else None
+        return f"{len(parameters)} x {first}"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _record_query(conn, statement, parameters, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_seconds += elapsed
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(
+            "Slow query (%.1f ms): %s | params: %s",
+            elapsed * 1000,
+            " ".join(statement.split())[:_MAX_LOGGED_STATEMENT_LENGTH],
+            parameter_shape(parameters, executemany),
+        )
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_query(conn, statement, parameters, executemany)
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute does not run for a failed statement; without this
+    # the start time stays on the pooled connection and the next query on it
+    # pops the wrong entry. Errors outside a cursor execute (connect, commit)
+    # never pushed one.
+    conn = exception_context.connection
+    execution_context = exception_context.execution_context
+    if conn is None or execution_context is None or not conn.info.get("query_start_time"):
+        return
+    _record_query(
+        conn,
+        exception_context.statement,
+        exception_context.parameters,
+        execution_context.executemany,
+    )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach query timing hooks to a (sync) engine.
+
+    For an AsyncEngine pass ``async_engine.sync_engine``.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,153 @@
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.config import settings
+
+
+class PoolMetrics:
+    """Counters for pooled connection use and how long checkouts wait."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def listen(self, pool: Pool) -> None:
+        """Count new connections, checkouts and checkins from the pool's events."""
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+
+    def unlisten(self, pool: Pool) -> None:
+        event.remove(pool, "connect", self._on_connect)
+        event.remove(pool, "checkout", self._on_checkout)
+        event.remove(pool, "checkin", self._on_checkin)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def record_wait(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: Pool) -> Dict[str, float]:
+        """Get live pool state plus accumulated counters and wait statistics."""
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": self.total_wait_seconds / self.checkouts * 1000 if self.checkouts else 0.0,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+        }
+
+
+class _InstrumentedPoolMixin:
+    """Times ``connect()``, the public checkout entry point; counters come from pool events."""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # Keep counters across engine.dispose() and invalidation. recreate()
+        # carries this pool's listeners over, so the new pool's own are dropped.
+        pool = super().recreate()
+        pool.metrics.unlisten(pool)
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        self.metrics.listen(self)
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        self.metrics.listen(self)
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _server_timeouts() -> Dict[str, str]:
+    timeouts = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        timeouts["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    if settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS:
+        timeouts["idle_in_transaction_session_timeout"] = str(settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS)
+    return timeouts
+
+
+def sync_engine_options() -> dict:
+    """Engine keyword arguments for the psycopg2 engine."""
+    options = " ".join(f"-c {name}={value}" for name, value in _server_timeouts().items())
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "connect_args": {"options": options} if options else {},
+        **_pool_options(),
+    }
+
+
+def async_engine_options() -> dict:
+    """Engine keyword arguments for the asyncpg engine."""
+    timeouts = _server_timeouts()
+    return {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool,
+        "connect_args": {"server_settings": timeouts} if timeouts else {},
+        **_pool_options(),
+    }
+
+
+def pool_status(pool: Pool) -> Dict[str, float]:
+    """Get metrics for an engine's pool."""
+    metrics = getattr(pool, "metrics", None)
+    if metrics is None:
+        return {"status": pool.status()}
+    return metrics.snapshot(pool)
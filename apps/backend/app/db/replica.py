@@ -0,0 +1,73 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Zero when the replica has replayed everything it received, otherwise the age
+# of the last replayed transaction. Also zero when pointed at a primary.
+_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReplicaMonitor:
+    """Periodically check that a read replica is reachable and caught up.
+
+    The result is cached for ``check_interval_seconds`` so the check costs at
+    most one query per interval per process; concurrent callers share it.
+    """
+
+    def __init__(self, engine: AsyncEngine, max_lag_seconds: float, check_interval_seconds: float):
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def _check(self) -> None:
+        try:
+            async with self.engine.connect() as connection:
+                lag = float((await connection.execute(_LAG_QUERY)).scalar() or 0)
+        except Exception as e:
+            print(f"Read replica health check failed: {e}")
+            self.healthy = False
+            self.lag_seconds = None
+            self.last_error = str(e)
+            return
+
+        self.lag_seconds = lag
+        self.last_error = None
+        self.healthy = lag <= self.max_lag_seconds
+
+    async def is_healthy(self) -> bool:
+        """Get the replica health, re-checking once the cached result is stale."""
+        if time.monotonic() - self._checked_at < self.check_interval_seconds:
+            return self.healthy
+        if self._lock.locked():
+            # Another request is already checking; use the previous result.
+            return self.healthy
+
+        async with self._lock:
+            await self._check()
+            self._checked_at = time.monotonic()
+        return self.healthy
+
+    def status(self) -> Dict:
+        """Get the last health check result."""
+        return {
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "last_error": self.last_error,
+        }
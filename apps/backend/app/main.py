@@ -1,14 +1,54 @@
-from fastapi import FastAPI
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import api_router
+from app.core.auth import get_clerk_auth
 from app.core.config import settings
+from app.core.storage_gc import storage_deleter, storage_reconciler
+from app.core.upload_janitor import upload_janitor
+from app.core.sample_clips import sample_clip_generator
+from app.core.upload_verifier import audio_file_verifier
+from app.core.user_cache import user_cache_listener
+from app.db.database import dispose_engines
+from app.db.instrumentation import start_request_stats
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Engines, the storage client and the Clerk HTTP clients are created on
+    # first use; startup only prefetches JWKS keys and starts the listeners
+    # and the storage background tasks.
+    await get_clerk_auth().start()
+    await user_cache_listener.start()
+    if settings.STORAGE_CONFIGURED:
+        upload_janitor.start()
+        storage_deleter.start()
+        if settings.STORAGE_GC_ENABLED:
+            storage_reconciler.start()
+        audio_file_verifier.start()
+    yield
+    await sample_clip_generator.close()
+    await audio_file_verifier.close()
+    await storage_reconciler.close()
+    await storage_deleter.close()
+    await upload_janitor.close()
+    await user_cache_listener.close()
+    await get_clerk_auth().close()
+    await dispose_engines()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="Backend API for audiobook application",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Set up CORS
@@ -20,6 +60,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def pin_writers_to_primary(request: Request, call_next):
+    """Keep clients that just wrote on the primary so they read their own writes."""
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        response.set_cookie(
+            key=settings.READ_AFTER_WRITE_COOKIE_NAME,
+            value="1",
+            max_age=settings.READ_AFTER_WRITE_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
+
+@app.middleware("http")
+async def record_query_stats(request: Request, call_next):
+    """Report per-request query count and database time via Server-Timing."""
+    stats = start_request_stats()
+    start = time.perf_counter()
+    response = await call_next(request)
+    total_ms = (time.perf_counter() - start) * 1000
+
+    response.headers["Server-Timing"] = (
+        f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries", app;dur={total_ms:.1f}'
+    )
+    if stats.count > settings.REQUEST_QUERY_COUNT_WARNING:
+        logger.warning(
+            "%s %s issued %d queries (%.1f ms in database)",
+            request.method, request.url.path, stats.count, stats.total_ms,
+        )
+    return response
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
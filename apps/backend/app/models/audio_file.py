@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, Index, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import uuid
 
@@ -17,8 +17,15 @@ class AudioFile(Base):
     file_url = Column(String, nullable=False)
     file_size_bytes = Column(BigInteger)
     duration_seconds = Column(Integer)
+    bitrate_bps = Column(Integer)
+    sample_rate_hz = Column(Integer)
     mime_type = Column(String(100))
     checksum = Column(String(64))
+    # Packed MP3 seek table (see app.core.seek_index); only loaded when asked for
+    seek_index = deferred(Column(LargeBinary))
+    # Set once size, type and checksum were read back from the stored file;
+    # values sent by the client are not trusted until then
+    verified_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -27,5 +34,6 @@ class AudioFile(Base):
     download_logs = relationship("DownloadLog", back_populates="audio_file")
 
     __table_args__ = (
+        Index("ix_audio_files_audiobook_id_chapter_number", "audiobook_id", "chapter_number"),
         {"extend_existing": True},
     )
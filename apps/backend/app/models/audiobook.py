@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, Date, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, Date, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -38,6 +38,15 @@ class Audiobook(Base):
     library_items = relationship("UserLibrary", back_populates="audiobook")
     download_logs = relationship("DownloadLog", back_populates="audiobook")
 
+    __table_args__ = (
+        # Newest published audiobooks (featured and public listings)
+        Index(
+            "ix_audiobooks_published_created_at",
+            "created_at",
+            postgresql_where=text("status = 'published'"),
+        ),
+    )
+
 
 class AudiobookCategory(Base):
     __tablename__ = "audiobook_categories"
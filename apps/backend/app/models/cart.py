@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -22,5 +22,6 @@ class CartItem(Base):
     audiobook = relationship("Audiobook", back_populates="cart_items")
 
     __table_args__ = (
+        Index("ix_cart_items_user_id_audiobook_id", "user_id", "audiobook_id"),
         {"extend_existing": True},
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, INET
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -24,3 +24,7 @@ class DownloadLog(Base):
     user = relationship("UserProfile", back_populates="download_logs")
     audiobook = relationship("Audiobook", back_populates="download_logs")
     audio_file = relationship("AudioFile", back_populates="download_logs")
+
+    __table_args__ = (
+        Index("ix_download_logs_user_id_created_at", "user_id", "created_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -23,5 +23,8 @@ class UserLibrary(Base):
     order = relationship("Order", back_populates="library_items")
 
     __table_args__ = (
+        Index("uq_user_library_user_audiobook", "user_id", "audiobook_id", unique=True),
+        # Keyset pagination of a user's library by purchase date
+        Index("ix_user_library_user_id_purchased_at", "user_id", "purchased_at", "id"),
         {"extend_existing": True},
     )
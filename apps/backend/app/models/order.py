@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -28,6 +28,16 @@ class Order(Base):
     order_items = relationship("OrderItem", back_populates="order")
     library_items = relationship("UserLibrary", back_populates="order")
 
+    __table_args__ = (
+        # Idempotency key for checkout retries
+        Index(
+            "uq_orders_payment_intent_id",
+            "payment_intent_id",
+            unique=True,
+            postgresql_where=text("payment_intent_id IS NOT NULL"),
+        ),
+    )
+
 
 class OrderItem(Base):
     __tablename__ = "order_items"
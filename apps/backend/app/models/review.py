@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -26,5 +26,6 @@ class Review(Base):
     user = relationship("UserProfile", back_populates="reviews")
 
     __table_args__ = (
+        Index("ix_reviews_user_id_audiobook_id", "user_id", "audiobook_id"),
         {"extend_existing": True},
     )
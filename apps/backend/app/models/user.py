@@ -20,6 +20,10 @@ class UserProfile(Base):
     avatar_url = Column(String)
     created_by = Column(UUID(as_uuid=True), ForeignKey("user_profiles.id"), nullable=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Clerk's own updated_at for the synced data; out-of-order webhooks older than this are ignored
+    clerk_updated_at = Column(DateTime(timezone=True))
+    # Set when Clerk reports the user deleted; rows are kept for order history
+    deleted_at = Column(DateTime(timezone=True))
 
     # Relationships
     created_by_user = relationship("UserProfile", remote_side=[id])
@@ -1,14 +1,15 @@
-from .base import BaseRepository
-from .user import UserRepository
-from .category import CategoryRepository
-from .audiobook import AudiobookRepository
-from .audio_file import AudioFileRepository
+from .base import AsyncBaseRepository, BaseRepository
+from .user import AsyncUserRepository, UserRepository
+from .category import AsyncCategoryRepository, CategoryRepository
+from .audiobook import AsyncAudiobookRepository, AudiobookRepository
+from .audio_file import AsyncAudioFileRepository, AudioFileRepository
 from .transcription import TranscriptionRepository
 from .review import ReviewRepository
-from .cart import CartRepository
+from .cart import AsyncCartRepository, CartRepository
 from .order import OrderRepository
-from .library import LibraryRepository
+from .library import AsyncLibraryRepository, LibraryRepository
 from .download_log import DownloadLogRepository
+from .checkout import CheckoutRepository
 
 __all__ = [
     "BaseRepository",
@@ -22,4 +23,12 @@ __all__ = [
     "OrderRepository",
     "LibraryRepository",
     "DownloadLogRepository",
+    "CheckoutRepository",
+    "AsyncBaseRepository",
+    "AsyncUserRepository",
+    "AsyncCategoryRepository",
+    "AsyncAudiobookRepository",
+    "AsyncAudioFileRepository",
+    "AsyncCartRepository",
+    "AsyncLibraryRepository",
 ]
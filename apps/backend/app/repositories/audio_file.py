@@ -1,10 +1,12 @@
 from typing import List, Optional
 from uuid import UUID
 
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.audio_file import AudioFile
-from .base import BaseRepository
+from .base import AsyncBaseRepository, BaseRepository
 
 
 class AudioFileRepository(BaseRepository[AudioFile]):
@@ -60,3 +62,135 @@ class AudioFileRepository(BaseRepository[AudioFile]):
             "checksum": checksum
         }
         return self.create(audio_file_data)
+
+
+class AsyncAudioFileRepository(AsyncBaseRepository[AudioFile]):
+    """Async repository for audio file operations."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(AudioFile, db)
+
+    async def get_by_audiobook(self, audiobook_id: UUID) -> List[AudioFile]:
+        """Get all audio files for an audiobook."""
+        return await self.get_multi_by_field("audiobook_id", audiobook_id)
+
+    async def get_by_chapter(self, audiobook_id: UUID, chapter_number: int) -> Optional[AudioFile]:
+        """Get audio file by audiobook and chapter number."""
+        result = await self.db.execute(
+            select(AudioFile).where(
+                AudioFile.audiobook_id == audiobook_id,
+                AudioFile.chapter_number == chapter_number
+            ).limit(1)
+        )
+        return result.scalars().first()
+
+    async def get_chapters_ordered(self, audiobook_id: UUID) -> List[AudioFile]:
+        """Get audio files ordered by chapter number."""
+        result = await self.db.execute(
+            select(AudioFile).where(
+                AudioFile.audiobook_id == audiobook_id
+            ).order_by(AudioFile.chapter_number)
+        )
+        return list(result.scalars().all())
+
+    async def get_all_file_urls(self) -> List[str]:
+        """Get the file URL of every audio file."""
+        result = await self.db.scalars(select(AudioFile.file_url))
+        return list(result.all())
+
+    async def delete_by_audiobook(self, audiobook_id: UUID) -> List[str]:
+        """Delete an audiobook's audio files (without committing) and return their URLs."""
+        result = await self.db.scalars(
+            delete(AudioFile).where(
+                AudioFile.audiobook_id == audiobook_id
+            ).returning(AudioFile.file_url)
+        )
+        return list(result.all())
+
+    async def get_unverified_ids(self, limit: int = 1000) -> List[UUID]:
+        """Get IDs of audio files whose stored object has not been verified yet."""
+        result = await self.db.scalars(
+            select(AudioFile.id)
+            .where(AudioFile.verified_at.is_(None))
+            .order_by(AudioFile.created_at)
+            .limit(limit)
+        )
+        return list(result.all())
+
+    async def set_verified_metadata(
+        self,
+        audio_file_id: UUID,
+        file_url: str,
+        file_size_bytes: int,
+        mime_type: Optional[str],
+        checksum: str,
+        duration_seconds: Optional[int] = None,
+        bitrate_bps: Optional[int] = None,
+        sample_rate_hz: Optional[int] = None,
+        seek_index: Optional[bytes] = None
+    ) -> bool:
+        """Save metadata read from the stored file, unless the row now points at another file.
+
+        Audio properties the file's headers did not give are left as they are;
+        the seek index is always replaced, as it describes this exact file.
+        """
+        values = {
+            "file_size_bytes": file_size_bytes,
+            "mime_type": mime_type,
+            "checksum": checksum,
+            "seek_index": seek_index,
+            "verified_at": func.now(),
+        }
+        if duration_seconds is not None:
+            values["duration_seconds"] = duration_seconds
+        if bitrate_bps is not None:
+            values["bitrate_bps"] = bitrate_bps
+        if sample_rate_hz is not None:
+            values["sample_rate_hz"] = sample_rate_hz
+        result = await self.db.execute(
+            update(AudioFile).where(
+                AudioFile.id == audio_file_id,
+                AudioFile.file_url == file_url
+            ).values(**values)
+        )
+        await self.db.commit()
+        return result.rowcount > 0
+
+    async def get_seek_index(self, audio_file_id: UUID) -> Optional[bytes]:
+        """Get the packed seek table of an audio file, if it has one."""
+        return await self.db.scalar(
+            select(AudioFile.seek_index).where(AudioFile.id == audio_file_id)
+        )
+
+    async def get_total_duration(self, audiobook_id: UUID) -> int:
+        """Get total duration of all audio files for an audiobook."""
+        total = await self.db.scalar(
+            select(func.coalesce(func.sum(AudioFile.duration_seconds), 0)).where(
+                AudioFile.audiobook_id == audiobook_id
+            )
+        )
+        return int(total)
+
+    async def create_audio_file(
+        self,
+        audiobook_id: UUID,
+        file_url: str,
+        chapter_number: Optional[int] = None,
+        chapter_title: Optional[str] = None,
+        file_size_bytes: Optional[int] = None,
+        duration_seconds: Optional[int] = None,
+        mime_type: Optional[str] = None,
+        checksum: Optional[str] = None
+    ) -> AudioFile:
+        """Create a new audio file."""
+        audio_file_data = {
+            "audiobook_id": audiobook_id,
+            "file_url": file_url,
+            "chapter_number": chapter_number,
+            "chapter_title": chapter_title,
+            "file_size_bytes": file_size_bytes,
+            "duration_seconds": duration_seconds,
+            "mime_type": mime_type,
+            "checksum": checksum
+        }
+        return await self.create(audio_file_data)
@@ -1,12 +1,14 @@
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, case, delete, desc, func, or_, select, update
 
+from app.models.audio_file import AudioFile
 from app.models.audiobook import Audiobook, AudiobookCategory
 from app.models.enums import AudiobookStatus
-from .base import BaseRepository
+from .base import AsyncBaseRepository, BaseRepository
 
 
 class AudiobookRepository(BaseRepository[Audiobook]):
@@ -136,3 +138,202 @@ class AudiobookRepository(BaseRepository[Audiobook]):
         if audiobook:
             return self.update(audiobook, {"status": AudiobookStatus.ARCHIVED})
         return None
+
+
+class AsyncAudiobookRepository(AsyncBaseRepository[Audiobook]):
+    """Async repository for audiobook operations."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(Audiobook, db)
+
+    async def get_by_slug(self, slug: str) -> Optional[Audiobook]:
+        """Get audiobook by slug."""
+        return await self.get_by_field("slug", slug)
+
+    async def get_all_media_urls(self) -> List[str]:
+        """Get every cover image and sample URL."""
+        result = await self.db.execute(select(Audiobook.cover_image_url, Audiobook.sample_url))
+        return [url for row in result.all() for url in row if url]
+
+    async def refresh_duration(self, audiobook_id: UUID) -> None:
+        """Set an audiobook's duration to the sum of its chapters' durations.
+
+        Left unchanged while it has chapters but none with a known duration,
+        so a hand-entered value is kept until chapters are measured. Cleared
+        once its last chapter is deleted.
+        """
+        chapters = AudioFile.audiobook_id == audiobook_id
+        total = select(func.sum(AudioFile.duration_seconds)).where(chapters).scalar_subquery()
+        await self.db.execute(
+            update(Audiobook).where(
+                Audiobook.id == audiobook_id,
+                or_(total.is_not(None), ~select(AudioFile.id).where(chapters).exists())
+            ).values(duration_seconds=total)
+        )
+        await self.db.commit()
+
+    async def get_sample_sources(self) -> list:
+        """Get each audiobook's sample URL with the file URL, type and checksum of its first chapter.
+
+        The checksum is None until the chapter has been verified, as a
+        client-sent one may not match the stored file.
+        """
+        result = await self.db.execute(
+            select(
+                Audiobook.id,
+                Audiobook.sample_url,
+                AudioFile.file_url,
+                AudioFile.mime_type,
+                case((AudioFile.verified_at.is_not(None), AudioFile.checksum)).label("checksum")
+            )
+            .join(AudioFile, AudioFile.audiobook_id == Audiobook.id)
+            .distinct(Audiobook.id)
+            .order_by(Audiobook.id, AudioFile.chapter_number.asc().nulls_last(), AudioFile.created_at)
+        )
+        return list(result.all())
+
+    async def set_generated_sample(
+        self,
+        audiobook_id: UUID,
+        sample_url: str,
+        previous_url: Optional[str]
+    ) -> bool:
+        """Point an audiobook at a generated sample, unless its sample changed meanwhile."""
+        result = await self.db.execute(
+            update(Audiobook).where(
+                Audiobook.id == audiobook_id,
+                Audiobook.sample_url.is_not_distinct_from(previous_url)
+            ).values(sample_url=sample_url)
+        )
+        await self.db.commit()
+        return result.rowcount > 0
+
+    async def get_by_status(self, status: AudiobookStatus) -> List[Audiobook]:
+        """Get audiobooks by status."""
+        return await self.get_multi_by_field("status", status)
+
+    async def get_published_audiobooks(self) -> List[Audiobook]:
+        """Get all published audiobooks."""
+        return await self.get_by_status(AudiobookStatus.PUBLISHED)
+
+    async def get_by_author(self, author_name: str) -> List[Audiobook]:
+        """Get audiobooks by author."""
+        return await self.get_multi_by_field("author_name", author_name)
+
+    async def get_by_narrator(self, narrator_name: str) -> List[Audiobook]:
+        """Get audiobooks by narrator."""
+        return await self.get_multi_by_field("narrator_name", narrator_name)
+
+    async def get_by_price_range(self, min_price: int, max_price: int) -> List[Audiobook]:
+        """Get audiobooks within price range (in cents)."""
+        result = await self.db.execute(
+            select(Audiobook).where(
+                and_(
+                    Audiobook.price_cents >= min_price,
+                    Audiobook.price_cents <= max_price
+                )
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_featured_audiobooks(self, limit: int = 10) -> List[Audiobook]:
+        """Get featured audiobooks (published, ordered by creation date)."""
+        result = await self.db.execute(
+            select(Audiobook).where(
+                Audiobook.status == AudiobookStatus.PUBLISHED
+            ).order_by(desc(Audiobook.created_at)).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def search_audiobooks(self, search_term: str) -> List[Audiobook]:
+        """Search audiobooks by title, author, or narrator."""
+        return await self.search(search_term, ["title", "author_name", "narrator_name"])
+
+    async def get_audiobooks_by_category(self, category_id: UUID) -> List[Audiobook]:
+        """Get audiobooks in a specific category."""
+        result = await self.db.execute(
+            select(Audiobook).join(AudiobookCategory).where(
+                AudiobookCategory.category_id == category_id
+            )
+        )
+        return list(result.scalars().all())
+
+    async def add_category(self, audiobook_id: UUID, category_id: UUID) -> Optional[AudiobookCategory]:
+        """Add a category to an audiobook."""
+        audiobook_category = AudiobookCategory(
+            audiobook_id=audiobook_id,
+            category_id=category_id
+        )
+        self.db.add(audiobook_category)
+        await self.db.commit()
+        await self.db.refresh(audiobook_category)
+        return audiobook_category
+
+    async def remove_category(self, audiobook_id: UUID, category_id: UUID) -> bool:
+        """Remove a category from an audiobook."""
+        result = await self.db.execute(
+            delete(AudiobookCategory).where(
+                and_(
+                    AudiobookCategory.audiobook_id == audiobook_id,
+                    AudiobookCategory.category_id == category_id
+                )
+            )
+        )
+        await self.db.commit()
+        return result.rowcount > 0
+
+    async def get_categories(self, audiobook_id: UUID) -> List[AudiobookCategory]:
+        """Get all categories for an audiobook, with the category loaded."""
+        result = await self.db.execute(
+            select(AudiobookCategory).options(
+                selectinload(AudiobookCategory.category)
+            ).where(
+                AudiobookCategory.audiobook_id == audiobook_id
+            )
+        )
+        return list(result.scalars().all())
+
+    async def create_audiobook(
+        self,
+        title: str,
+        slug: str,
+        author_name: str,
+        price_cents: int,
+        description: Optional[str] = None,
+        narrator_name: Optional[str] = None,
+        duration_seconds: Optional[int] = None,
+        isbn: Optional[str] = None,
+        cover_image_url: Optional[str] = None,
+        sample_url: Optional[str] = None,
+        language: str = "en"
+    ) -> Audiobook:
+        """Create a new audiobook."""
+        audiobook_data = {
+            "title": title,
+            "slug": slug,
+            "author_name": author_name,
+            "price_cents": price_cents,
+            "description": description,
+            "narrator_name": narrator_name,
+            "duration_seconds": duration_seconds,
+            "isbn": isbn,
+            "cover_image_url": cover_image_url,
+            "sample_url": sample_url,
+            "language": language,
+            "status": AudiobookStatus.DRAFT
+        }
+        return await self.create(audiobook_data)
+
+    async def publish_audiobook(self, audiobook_id: UUID) -> Optional[Audiobook]:
+        """Publish an audiobook."""
+        audiobook = await self.get(audiobook_id)
+        if audiobook:
+            return await self.update(audiobook, {"status": AudiobookStatus.PUBLISHED})
+        return None
+
+    async def archive_audiobook(self, audiobook_id: UUID) -> Optional[Audiobook]:
+        """Archive an audiobook."""
+        audiobook = await self.get(audiobook_id)
+        if audiobook:
+            return await self.update(audiobook, {"status": AudiobookStatus.ARCHIVED})
+        return None
@@ -1,7 +1,8 @@
 from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
 from uuid import UUID
 
-from sqlalchemy import and_, or_
+from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
@@ -111,3 +112,108 @@ class BaseRepository(Generic[ModelType]):
         if conditions:
             return self.db.query(self.model).filter(or_(*conditions)).all()
         return []
+
+
+class AsyncBaseRepository(Generic[ModelType]):
+    """Async counterpart of BaseRepository for use with AsyncSession."""
+
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
+        self.model = model
+        self.db = db
+
+    def _apply_filters(self, stmt: Select, filters: Optional[Dict[str, Any]]) -> Select:
+        if filters:
+            for key, value in filters.items():
+                if hasattr(self.model, key):
+                    if isinstance(value, list):
+                        stmt = stmt.where(getattr(self.model, key).in_(value))
+                    else:
+                        stmt = stmt.where(getattr(self.model, key) == value)
+        return stmt
+
+    async def get(self, id: Union[UUID, str]) -> Optional[ModelType]:
+        """Get a single record by ID."""
+        return await self.db.get(self.model, id)
+
+    async def get_multi(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None
+    ) -> List[ModelType]:
+        """Get multiple records with pagination and filtering."""
+        stmt = self._apply_filters(select(self.model), filters)
+
+        if order_by and hasattr(self.model, order_by):
+            stmt = stmt.order_by(getattr(self.model, order_by))
+
+        result = await self.db.execute(stmt.offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def create(self, obj_in: Dict[str, Any]) -> ModelType:
+        """Create a new record."""
+        db_obj = self.model(**obj_in)
+        self.db.add(db_obj)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+
+    async def update(self, db_obj: ModelType, obj_in: Dict[str, Any]) -> ModelType:
+        """Update an existing record."""
+        for field, value in obj_in.items():
+            if hasattr(db_obj, field):
+                setattr(db_obj, field, value)
+
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+
+    async def delete(self, id: Union[UUID, str]) -> Optional[ModelType]:
+        """Delete a record by ID."""
+        obj = await self.get(id)
+        if obj:
+            await self.db.delete(obj)
+            await self.db.commit()
+        return obj
+
+    async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count records with optional filtering."""
+        stmt = self._apply_filters(select(func.count()).select_from(self.model), filters)
+        return await self.db.scalar(stmt)
+
+    async def exists(self, id: Union[UUID, str]) -> bool:
+        """Check if a record exists by ID."""
+        stmt = select(self.model.id).where(self.model.id == id).limit(1)
+        return await self.db.scalar(stmt) is not None
+
+    async def get_by_field(self, field: str, value: Any) -> Optional[ModelType]:
+        """Get a record by a specific field value."""
+        if hasattr(self.model, field):
+            result = await self.db.execute(
+                select(self.model).where(getattr(self.model, field) == value).limit(1)
+            )
+            return result.scalars().first()
+        return None
+
+    async def get_multi_by_field(self, field: str, value: Any) -> List[ModelType]:
+        """Get multiple records by a specific field value."""
+        if hasattr(self.model, field):
+            result = await self.db.execute(
+                select(self.model).where(getattr(self.model, field) == value)
+            )
+            return list(result.scalars().all())
+        return []
+
+    async def search(self, search_term: str, fields: List[str]) -> List[ModelType]:
+        """Search records across multiple fields."""
+        conditions = []
+        for field in fields:
+            if hasattr(self.model, field):
+                conditions.append(getattr(self.model, field).ilike(f"%{search_term}%"))
+
+        if conditions:
+            result = await self.db.execute(select(self.model).where(or_(*conditions)))
+            return list(result.scalars().all())
+        return []
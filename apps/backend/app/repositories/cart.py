@@ -1,11 +1,16 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 from uuid import UUID
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, delete, func, select
 
+from app.core.cart_token import CartTokenItem
+from app.models.audiobook import Audiobook
 from app.models.cart import CartItem
-from .base import BaseRepository
+from app.models.enums import AudiobookStatus
+from app.models.library import UserLibrary
+from .base import AsyncBaseRepository, BaseRepository
 
 
 class CartRepository(BaseRepository[CartItem]):
@@ -118,22 +123,232 @@ class CartRepository(BaseRepository[CartItem]):
 
         return sum(item.price_cents for item in items)
 
-    def transfer_session_cart_to_user(self, session_id: str, user_id: UUID) -> int:
-        """Transfer session cart items to user cart."""
-        session_items = self.get_session_cart(session_id)
+    def transfer_session_cart_to_user(
+        self,
+        session_id: Optional[str],
+        user_id: UUID,
+        token_items: Optional[List[CartTokenItem]] = None
+    ) -> int:
+        """Transfer session cart items to user cart.
+
+        ``token_items`` are anonymous cart items carried in a signed cart token;
+        they are written to ``cart_items`` here for the first time.
+        """
+        session_items = self.get_session_cart(session_id) if session_id else []
+        owned_ids = {
+            row[0] for row in self.db.query(CartItem.audiobook_id).filter(
+                CartItem.user_id == user_id
+            ).all()
+        }
         transferred_count = 0
 
         for item in session_items:
             # Check if user already has this item
-            existing_item = self.get_cart_item(user_id, item.audiobook_id)
-            if not existing_item:
+            if item.audiobook_id not in owned_ids:
                 # Transfer the item
                 item.user_id = user_id
                 item.session_id = None
+                owned_ids.add(item.audiobook_id)
                 transferred_count += 1
             else:
                 # Remove duplicate session item
                 self.db.delete(item)
 
+        new_items = []
+        for token_item in token_items or []:
+            if token_item.audiobook_id not in owned_ids:
+                new_items.append(CartItem(
+                    user_id=user_id,
+                    audiobook_id=token_item.audiobook_id,
+                    price_cents=token_item.price_cents
+                ))
+                owned_ids.add(token_item.audiobook_id)
+        self.db.add_all(new_items)
+        transferred_count += len(new_items)
+
         self.db.commit()
         return transferred_count
+
+
+class AsyncCartRepository(AsyncBaseRepository[CartItem]):
+    """Async repository for cart operations."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(CartItem, db)
+
+    async def get_user_cart(self, user_id: UUID) -> List[CartItem]:
+        """Get all items in a user's cart."""
+        return await self.get_multi_by_field("user_id", user_id)
+
+    async def get_session_cart(self, session_id: str) -> List[CartItem]:
+        """Get all items in a session's cart."""
+        return await self.get_multi_by_field("session_id", session_id)
+
+    async def get_cart_item(self, user_id: UUID, audiobook_id: UUID) -> Optional[CartItem]:
+        """Get a specific cart item."""
+        result = await self.db.execute(
+            select(CartItem).where(
+                and_(
+                    CartItem.user_id == user_id,
+                    CartItem.audiobook_id == audiobook_id
+                )
+            ).limit(1)
+        )
+        return result.scalars().first()
+
+    async def get_session_cart_item(self, session_id: str, audiobook_id: UUID) -> Optional[CartItem]:
+        """Get a specific cart item for a session."""
+        result = await self.db.execute(
+            select(CartItem).where(
+                and_(
+                    CartItem.session_id == session_id,
+                    CartItem.audiobook_id == audiobook_id
+                )
+            ).limit(1)
+        )
+        return result.scalars().first()
+
+    async def add_to_cart(
+        self,
+        audiobook_id: UUID,
+        price_cents: int,
+        user_id: Optional[UUID] = None,
+        session_id: Optional[str] = None
+    ) -> CartItem:
+        """Add an item to cart."""
+        if user_id:
+            # Check if item already exists in user's cart
+            existing_item = await self.get_cart_item(user_id, audiobook_id)
+            if existing_item:
+                return existing_item
+
+        if session_id:
+            # Check if item already exists in session's cart
+            existing_item = await self.get_session_cart_item(session_id, audiobook_id)
+            if existing_item:
+                return existing_item
+
+        cart_item_data = {
+            "audiobook_id": audiobook_id,
+            "price_cents": price_cents,
+            "user_id": user_id,
+            "session_id": session_id
+        }
+        return await self.create(cart_item_data)
+
+    async def remove_from_cart(
+        self,
+        audiobook_id: UUID,
+        user_id: Optional[UUID] = None,
+        session_id: Optional[str] = None
+    ) -> bool:
+        """Remove an item from cart."""
+        if user_id:
+            owner_filter = CartItem.user_id == user_id
+        elif session_id:
+            owner_filter = CartItem.session_id == session_id
+        else:
+            return False
+
+        result = await self.db.execute(
+            delete(CartItem).where(owner_filter, CartItem.audiobook_id == audiobook_id)
+        )
+        await self.db.commit()
+        return result.rowcount > 0
+
+    async def clear_cart(
+        self,
+        user_id: Optional[UUID] = None,
+        session_id: Optional[str] = None
+    ) -> int:
+        """Clear all items from cart."""
+        if user_id:
+            owner_filter = CartItem.user_id == user_id
+        elif session_id:
+            owner_filter = CartItem.session_id == session_id
+        else:
+            return 0
+
+        result = await self.db.execute(delete(CartItem).where(owner_filter))
+        await self.db.commit()
+        return result.rowcount
+
+    async def get_cart_total(self, user_id: Optional[UUID] = None, session_id: Optional[str] = None) -> int:
+        """Get total price of cart items."""
+        if user_id:
+            owner_filter = CartItem.user_id == user_id
+        elif session_id:
+            owner_filter = CartItem.session_id == session_id
+        else:
+            return 0
+
+        total = await self.db.scalar(
+            select(func.coalesce(func.sum(CartItem.price_cents), 0)).where(owner_filter)
+        )
+        return int(total)
+
+    async def transfer_session_cart_to_user(
+        self,
+        session_id: Optional[str],
+        user_id: UUID,
+        token_items: Optional[List[CartTokenItem]] = None
+    ) -> int:
+        """Transfer session cart items (and signed-token cart items) to user cart.
+
+        Items are re-read against the catalog: books that were deleted,
+        unpublished or are already owned are dropped, and the current price
+        replaces the one recorded when the item was added.
+        """
+        session_items = await self.get_session_cart(session_id) if session_id else []
+        token_items = token_items or []
+        result = await self.db.scalars(
+            select(CartItem.audiobook_id).where(CartItem.user_id == user_id)
+        )
+        in_cart_ids = set(result.all())
+        prices = await self._purchasable_prices(
+            user_id,
+            {item.audiobook_id for item in session_items} | {item.audiobook_id for item in token_items}
+        )
+        transferred_count = 0
+
+        for item in session_items:
+            if item.audiobook_id in prices and item.audiobook_id not in in_cart_ids:
+                item.user_id = user_id
+                item.session_id = None
+                item.price_cents = prices[item.audiobook_id]
+                in_cart_ids.add(item.audiobook_id)
+                transferred_count += 1
+            else:
+                await self.db.delete(item)
+
+        new_items = []
+        for token_item in token_items:
+            if token_item.audiobook_id in prices and token_item.audiobook_id not in in_cart_ids:
+                new_items.append(CartItem(
+                    user_id=user_id,
+                    audiobook_id=token_item.audiobook_id,
+                    price_cents=prices[token_item.audiobook_id]
+                ))
+                in_cart_ids.add(token_item.audiobook_id)
+        self.db.add_all(new_items)
+        transferred_count += len(new_items)
+
+        await self.db.commit()
+        return transferred_count
+
+    async def _purchasable_prices(self, user_id: UUID, audiobook_ids: Set[UUID]) -> Dict[UUID, int]:
+        """Get current prices of the published audiobooks among ``audiobook_ids`` the user does not own."""
+        if not audiobook_ids:
+            return {}
+        owned = select(UserLibrary.id).where(
+            UserLibrary.user_id == user_id,
+            UserLibrary.audiobook_id == Audiobook.id
+        )
+        result = await self.db.execute(
+            select(Audiobook.id, Audiobook.price_cents).where(
+                Audiobook.id.in_(audiobook_ids),
+                Audiobook.status == AudiobookStatus.PUBLISHED,
+                ~owned.exists()
+            )
+        )
+        return dict(result.all())
@@ -1,10 +1,12 @@
 from typing import List, Optional
 from uuid import UUID
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.category import Category
-from .base import BaseRepository
+from .base import AsyncBaseRepository, BaseRepository
 
 
 class CategoryRepository(BaseRepository[Category]):
@@ -72,3 +74,72 @@ class CategoryRepository(BaseRepository[Category]):
         if category:
             return self.update(category, {"is_active": not category.is_active})
         return None
+
+
+class AsyncCategoryRepository(AsyncBaseRepository[Category]):
+    """Async repository for category operations."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(Category, db)
+
+    async def get_by_slug(self, slug: str) -> Optional[Category]:
+        """Get category by slug."""
+        return await self.get_by_field("slug", slug)
+
+    async def get_active_categories(self) -> List[Category]:
+        """Get all active categories."""
+        result = await self.db.execute(select(Category).where(Category.is_active == True))
+        return list(result.scalars().all())
+
+    async def get_root_categories(self) -> List[Category]:
+        """Get all root categories (no parent)."""
+        result = await self.db.execute(select(Category).where(Category.parent_id.is_(None)))
+        return list(result.scalars().all())
+
+    async def get_child_categories(self, parent_id: UUID) -> List[Category]:
+        """Get all child categories of a parent."""
+        return await self.get_multi_by_field("parent_id", parent_id)
+
+    async def get_category_tree(self, category_id: UUID) -> List[Category]:
+        """Get the full category tree starting from a category."""
+        categories = []
+        category = await self.get(category_id)
+
+        if category:
+            categories.append(category)
+            # Get all children recursively
+            children = await self.get_child_categories(category_id)
+            for child in children:
+                categories.extend(await self.get_category_tree(child.id))
+
+        return categories
+
+    async def search_categories(self, search_term: str) -> List[Category]:
+        """Search categories by name or description."""
+        return await self.search(search_term, ["name", "description"])
+
+    async def create_category(
+        self,
+        name: str,
+        slug: str,
+        description: Optional[str] = None,
+        parent_id: Optional[UUID] = None,
+        sort_order: int = 0
+    ) -> Category:
+        """Create a new category."""
+        category_data = {
+            "name": name,
+            "slug": slug,
+            "description": description,
+            "parent_id": parent_id,
+            "sort_order": sort_order,
+            "is_active": True
+        }
+        return await self.create(category_data)
+
+    async def toggle_active(self, category_id: UUID) -> Optional[Category]:
+        """Toggle category active status."""
+        category = await self.get(category_id)
+        if category:
+            return await self.update(category, {"is_active": not category.is_active})
+        return None
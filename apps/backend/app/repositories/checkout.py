@@ -0,0 +1,117 @@
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.entitlements import entitlement_cache
+from app.models.audiobook import Audiobook
+from app.models.cart import CartItem
+from app.models.enums import OrderStatus
+from app.models.library import UserLibrary
+from app.models.order import Order, OrderItem
+from .base import BaseRepository
+
+
+class CheckoutRepository(BaseRepository[Order]):
+    """Repository for turning a user's cart into an order in one transaction."""
+
+    def __init__(self, db: Session):
+        super().__init__(Order, db)
+
+    def get_by_payment_intent(self, user_id: UUID, payment_intent_id: str) -> Optional[Order]:
+        """Get a user's order by payment intent ID."""
+        return self.db.query(Order).filter(
+            Order.user_id == user_id,
+            Order.payment_intent_id == payment_intent_id
+        ).first()
+
+    def checkout(
+        self,
+        user_id: UUID,
+        order_number: str,
+        payment_intent_id: str,
+        tax_cents: int = 0,
+        payment_method: Optional[str] = None,
+        billing_email: Optional[str] = None
+    ) -> Optional[Order]:
+        """Create order, order items and library entries from the cart and clear it.
+
+        Everything is written in a single transaction with one bulk insert per
+        table. ``payment_intent_id`` is the idempotency key: retrying a checkout
+        returns the original order instead of creating a second one. Books the
+        user already owns are not charged for. Returns None when nothing in the
+        cart can be bought.
+        """
+        existing_order = self.get_by_payment_intent(user_id, payment_intent_id)
+        if existing_order:
+            return existing_order
+
+        owned = select(UserLibrary.id).where(
+            UserLibrary.user_id == user_id,
+            UserLibrary.audiobook_id == CartItem.audiobook_id
+        )
+        cart_rows = self.db.query(
+            CartItem.audiobook_id,
+            CartItem.price_cents,
+            Audiobook.title
+        ).join(Audiobook, Audiobook.id == CartItem.audiobook_id).filter(
+            CartItem.user_id == user_id,
+            ~owned.exists()
+        ).all()
+        if not cart_rows:
+            return None
+
+        order = Order(
+            order_number=order_number,
+            user_id=user_id,
+            status=OrderStatus.COMPLETED,
+            total_cents=sum(row.price_cents for row in cart_rows),
+            tax_cents=tax_cents,
+            payment_method=payment_method,
+            payment_intent_id=payment_intent_id,
+            billing_email=billing_email
+        )
+        purchased_at = datetime.now(timezone.utc)
+
+        try:
+            self.db.add(order)
+            self.db.flush()
+
+            self.db.execute(insert(OrderItem), [
+                {
+                    "order_id": order.id,
+                    "audiobook_id": row.audiobook_id,
+                    "title": row.title,
+                    "price_cents": row.price_cents
+                }
+                for row in cart_rows
+            ])
+            self.db.execute(
+                pg_insert(UserLibrary).values([
+                    {
+                        "user_id": user_id,
+                        "audiobook_id": row.audiobook_id,
+                        "order_id": order.id,
+                        "download_count": 0,
+                        "purchased_at": purchased_at
+                    }
+                    for row in cart_rows
+                ]).on_conflict_do_nothing(index_elements=["user_id", "audiobook_id"])
+            )
+            self.db.execute(delete(CartItem).where(CartItem.user_id == user_id))
+            self.db.commit()
+        except IntegrityError:
+            # A concurrent retry with the same payment intent won the race
+            self.db.rollback()
+            existing_order = self.get_by_payment_intent(user_id, payment_intent_id)
+            if existing_order:
+                return existing_order
+            raise
+
+        entitlement_cache.pop(user_id)
+        self.db.refresh(order)
+        return order
@@ -1,11 +1,125 @@
-from typing import List, Optional
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, FrozenSet, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy import Select, desc, and_, func, select, tuple_
 
+from app.core.entitlements import entitlement_cache
+from app.models.audiobook import Audiobook
 from app.models.library import UserLibrary
-from .base import BaseRepository
+from app.schemas.library import LibrarySort
+from .base import AsyncBaseRepository, BaseRepository
+
+# Stand-in for "never downloaded" so the recently-downloaded sort key is never NULL
+_NEVER_DOWNLOADED = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _encode_cursor(sort: LibrarySort, value: Any, item_id: UUID) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort.value, value, str(item_id)]).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _decode_cursor(cursor: str, sort: LibrarySort) -> Tuple[Any, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, item_id = json.loads(raw)
+        if cursor_sort != sort.value:
+            raise ValueError("Cursor does not match sort order")
+        if not isinstance(value, str):
+            raise ValueError("Cursor value must be a string")
+        if sort != LibrarySort.TITLE:
+            value = datetime.fromisoformat(value)
+            if value.tzinfo is None:
+                raise ValueError("Cursor timestamp has no time zone")
+        return value, UUID(item_id)
+    except (AttributeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def _library_page_statement(
+    user_id: UUID, sort: LibrarySort, cursor: Optional[str], limit: int
+) -> Select:
+    if sort == LibrarySort.TITLE:
+        sort_key = Audiobook.title
+    elif sort == LibrarySort.RECENTLY_DOWNLOADED:
+        sort_key = func.coalesce(UserLibrary.last_downloaded_at, _NEVER_DOWNLOADED)
+    else:
+        sort_key = UserLibrary.purchased_at
+
+    stmt = select(
+        UserLibrary.id,
+        UserLibrary.audiobook_id,
+        UserLibrary.download_count,
+        UserLibrary.last_downloaded_at,
+        UserLibrary.purchased_at,
+        Audiobook.title,
+        Audiobook.slug,
+        Audiobook.author_name,
+        Audiobook.narrator_name,
+        Audiobook.cover_image_url,
+        Audiobook.duration_seconds,
+        sort_key.label("sort_key")
+    ).join(Audiobook, Audiobook.id == UserLibrary.audiobook_id).where(
+        UserLibrary.user_id == user_id
+    )
+
+    if cursor:
+        cursor_value, cursor_id = _decode_cursor(cursor, sort)
+        if sort == LibrarySort.TITLE:
+            stmt = stmt.where(tuple_(sort_key, UserLibrary.id) > (cursor_value, cursor_id))
+        else:
+            stmt = stmt.where(tuple_(sort_key, UserLibrary.id) < (cursor_value, cursor_id))
+
+    if sort == LibrarySort.TITLE:
+        stmt = stmt.order_by(sort_key, UserLibrary.id)
+    else:
+        stmt = stmt.order_by(desc(sort_key), desc(UserLibrary.id))
+
+    # Fetch one extra row to know whether there is a next page
+    return stmt.limit(limit + 1)
+
+
+def _split_page(rows: List[Any], sort: LibrarySort, limit: int) -> Tuple[List[Any], Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor(sort, last.sort_key, last.id)
+    return rows, next_cursor
+
+
+def _owned_ids_statement(user_id: UUID) -> Select:
+    return select(UserLibrary.audiobook_id).where(UserLibrary.user_id == user_id)
+
+
+def _has_audiobook_statement(user_id: UUID, audiobook_id: UUID) -> Select:
+    return select(
+        select(UserLibrary.id).where(
+            UserLibrary.user_id == user_id,
+            UserLibrary.audiobook_id == audiobook_id
+        ).exists()
+    )
+
+
+def _library_stats_statement(user_id: UUID) -> Select:
+    return select(
+        func.count(UserLibrary.id),
+        func.coalesce(func.sum(UserLibrary.download_count), 0)
+    ).where(UserLibrary.user_id == user_id)
+
+
+def _library_stats(total_audiobooks: int, total_downloads: int) -> dict:
+    return {
+        "total_audiobooks": total_audiobooks,
+        "total_downloads": total_downloads,
+        "average_downloads_per_book": total_downloads / total_audiobooks if total_audiobooks > 0 else 0
+    }
 
 
 class LibraryRepository(BaseRepository[UserLibrary]):
@@ -20,6 +134,21 @@ class LibraryRepository(BaseRepository[UserLibrary]):
             UserLibrary.user_id == user_id
         ).order_by(desc(UserLibrary.purchased_at)).all()
 
+    def get_user_library_page(
+        self,
+        user_id: UUID,
+        sort: LibrarySort = LibrarySort.PURCHASED,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> Tuple[List[Any], Optional[str]]:
+        """Get one page of a user's library joined with audiobook card fields.
+
+        Uses keyset pagination: ``cursor`` is the opaque value returned as the
+        next cursor of the previous page. Raises ValueError for a bad cursor.
+        """
+        rows = self.db.execute(_library_page_statement(user_id, sort, cursor, limit)).all()
+        return _split_page(rows, sort, limit)
+
     def get_user_audiobook(self, user_id: UUID, audiobook_id: UUID) -> Optional[UserLibrary]:
         """Get a specific audiobook from user's library."""
         return self.db.query(UserLibrary).filter(
@@ -57,34 +186,166 @@ class LibraryRepository(BaseRepository[UserLibrary]):
             "user_id": user_id,
             "audiobook_id": audiobook_id,
             "order_id": order_id,
-            "download_count": 0
+            "download_count": 0,
+            "purchased_at": datetime.now(timezone.utc)
         }
-        return self.create(library_data)
+        library_item = self.create(library_data)
+        entitlement_cache.pop(user_id)
+        return library_item
 
     def increment_download_count(self, user_id: UUID, audiobook_id: UUID) -> Optional[UserLibrary]:
         """Increment download count for an audiobook."""
         library_item = self.get_user_audiobook(user_id, audiobook_id)
         if library_item:
-            from sqlalchemy.sql import func
             return self.update(library_item, {
                 "download_count": library_item.download_count + 1,
                 "last_downloaded_at": func.now()
             })
         return None
 
+    def get_owned_audiobook_ids(self, user_id: UUID) -> FrozenSet[UUID]:
+        """Get the IDs of all audiobooks a user owns (cached per user; for display only)."""
+        owned = entitlement_cache.get(user_id)
+        if owned is None:
+            owned = frozenset(
+                self.db.scalars(_owned_ids_statement(user_id)).all()
+            )
+            entitlement_cache.set(user_id, owned)
+        return owned
+
+    def owned_ids(self, user_id: UUID, candidate_ids: Iterable[UUID]) -> Set[UUID]:
+        """Get which of the candidate audiobooks a user owns."""
+        return self.get_owned_audiobook_ids(user_id).intersection(candidate_ids)
+
     def has_audiobook(self, user_id: UUID, audiobook_id: UUID) -> bool:
-        """Check if user has an audiobook in their library."""
-        return self.get_user_audiobook(user_id, audiobook_id) is not None
+        """Check if user has an audiobook in their library.
+
+        Not cached: this gates downloads and streaming, and must see purchases
+        and refunds made by any worker immediately.
+        """
+        return self.db.scalar(_has_audiobook_statement(user_id, audiobook_id))
 
     def get_library_stats(self, user_id: UUID) -> dict:
         """Get library statistics for a user."""
-        library_items = self.get_user_library(user_id)
-        
-        total_audiobooks = len(library_items)
-        total_downloads = sum(item.download_count for item in library_items)
-        
-        return {
-            "total_audiobooks": total_audiobooks,
-            "total_downloads": total_downloads,
-            "average_downloads_per_book": total_downloads / total_audiobooks if total_audiobooks > 0 else 0
+        total_audiobooks, total_downloads = self.db.execute(
+            _library_stats_statement(user_id)
+        ).one()
+        return _library_stats(total_audiobooks, total_downloads)
+
+
+class AsyncLibraryRepository(AsyncBaseRepository[UserLibrary]):
+    """Async repository for user library operations."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(UserLibrary, db)
+
+    async def get_user_library(self, user_id: UUID) -> List[UserLibrary]:
+        """Get all items in a user's library."""
+        result = await self.db.execute(
+            select(UserLibrary).where(
+                UserLibrary.user_id == user_id
+            ).order_by(desc(UserLibrary.purchased_at))
+        )
+        return list(result.scalars().all())
+
+    async def get_user_library_page(
+        self,
+        user_id: UUID,
+        sort: LibrarySort = LibrarySort.PURCHASED,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> Tuple[List[Any], Optional[str]]:
+        """Get one page of a user's library joined with audiobook card fields."""
+        result = await self.db.execute(_library_page_statement(user_id, sort, cursor, limit))
+        return _split_page(result.all(), sort, limit)
+
+    async def get_user_audiobook(self, user_id: UUID, audiobook_id: UUID) -> Optional[UserLibrary]:
+        """Get a specific audiobook from user's library."""
+        result = await self.db.execute(
+            select(UserLibrary).where(
+                and_(
+                    UserLibrary.user_id == user_id,
+                    UserLibrary.audiobook_id == audiobook_id
+                )
+            ).limit(1)
+        )
+        return result.scalars().first()
+
+    async def get_recent_purchases(self, user_id: UUID, limit: int = 10) -> List[UserLibrary]:
+        """Get recent purchases for a user."""
+        result = await self.db.execute(
+            select(UserLibrary).where(
+                UserLibrary.user_id == user_id
+            ).order_by(desc(UserLibrary.purchased_at)).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_most_downloaded(self, user_id: UUID, limit: int = 10) -> List[UserLibrary]:
+        """Get most downloaded audiobooks for a user."""
+        result = await self.db.execute(
+            select(UserLibrary).where(
+                UserLibrary.user_id == user_id
+            ).order_by(desc(UserLibrary.download_count)).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def add_to_library(
+        self,
+        user_id: UUID,
+        audiobook_id: UUID,
+        order_id: UUID
+    ) -> UserLibrary:
+        """Add an audiobook to user's library."""
+        # Check if already in library
+        existing = await self.get_user_audiobook(user_id, audiobook_id)
+        if existing:
+            return existing
+
+        library_data = {
+            "user_id": user_id,
+            "audiobook_id": audiobook_id,
+            "order_id": order_id,
+            "download_count": 0,
+            "purchased_at": datetime.now(timezone.utc)
         }
+        library_item = await self.create(library_data)
+        entitlement_cache.pop(user_id)
+        return library_item
+
+    async def increment_download_count(self, user_id: UUID, audiobook_id: UUID) -> Optional[UserLibrary]:
+        """Increment download count for an audiobook."""
+        library_item = await self.get_user_audiobook(user_id, audiobook_id)
+        if library_item:
+            return await self.update(library_item, {
+                "download_count": library_item.download_count + 1,
+                "last_downloaded_at": func.now()
+            })
+        return None
+
+    async def get_owned_audiobook_ids(self, user_id: UUID) -> FrozenSet[UUID]:
+        """Get the IDs of all audiobooks a user owns (cached per user; for display only)."""
+        owned = entitlement_cache.get(user_id)
+        if owned is None:
+            result = await self.db.scalars(_owned_ids_statement(user_id))
+            owned = frozenset(result.all())
+            entitlement_cache.set(user_id, owned)
+        return owned
+
+    async def owned_ids(self, user_id: UUID, candidate_ids: Iterable[UUID]) -> Set[UUID]:
+        """Get which of the candidate audiobooks a user owns."""
+        owned = await self.get_owned_audiobook_ids(user_id)
+        return owned.intersection(candidate_ids)
+
+    async def has_audiobook(self, user_id: UUID, audiobook_id: UUID) -> bool:
+        """Check if user has an audiobook in their library.
+
+        Not cached: this gates downloads and streaming, and must see purchases
+        and refunds made by any worker immediately.
+        """
+        return await self.db.scalar(_has_audiobook_statement(user_id, audiobook_id))
+
+    async def get_library_stats(self, user_id: UUID) -> dict:
+        """Get library statistics for a user."""
+        result = await self.db.execute(_library_stats_statement(user_id))
+        total_audiobooks, total_downloads = result.one()
+        return _library_stats(total_audiobooks, total_downloads)
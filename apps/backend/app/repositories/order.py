@@ -2,8 +2,10 @@ from typing import List, Optional
 from uuid import UUID
 
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy import and_, delete, desc
 
+from app.core.entitlements import entitlement_cache
+from app.models.library import UserLibrary
 from app.models.order import Order, OrderItem
 from app.models.enums import OrderStatus
 from .base import BaseRepository
@@ -78,8 +80,14 @@ class OrderRepository(BaseRepository[Order]):
         return self.update_status(order_id, OrderStatus.FAILED)
 
     def refund_order(self, order_id: UUID) -> Optional[Order]:
-        """Mark order as refunded."""
-        return self.update_status(order_id, OrderStatus.REFUNDED)
+        """Mark order as refunded and remove its audiobooks from the user's library."""
+        order = self.get(order_id)
+        if not order:
+            return None
+        self.db.execute(delete(UserLibrary).where(UserLibrary.order_id == order_id))
+        order = self.update(order, {"status": OrderStatus.REFUNDED})
+        entitlement_cache.pop(order.user_id)
+        return order
 
 
 class OrderItemRepository(BaseRepository[OrderItem]):
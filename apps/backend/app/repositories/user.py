@@ -1,11 +1,36 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
+from sqlalchemy import func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.user_cache import USER_CHANGED_CHANNEL, invalidate_users
 from app.models.user import UserProfile
 from app.models.enums import UserRole
-from .base import BaseRepository
+from app.schemas.auth import ClerkUser
+from .base import AsyncBaseRepository, BaseRepository
+
+
+def _initial_role(email: str, is_first_user: bool) -> UserRole:
+    """Role for a new profile: configured bootstrap admins, else the very first user."""
+    admin_emails = settings.BOOTSTRAP_ADMIN_EMAIL_LIST
+    if admin_emails:
+        return UserRole.ADMIN if email.lower() in admin_emails else UserRole.CUSTOMER
+    return UserRole.ADMIN if is_first_user else UserRole.CUSTOMER
+
+
+def _has_users_statement():
+    return select(select(UserProfile.id).exists())
+
+
+# NOTIFY is transactional: other workers hear about the change only once it commits
+_notify_users_changed = text(
+    "SELECT pg_notify(:channel, clerk_user_id) FROM unnest(CAST(:ids AS text[])) AS clerk_user_id"
+)
 
 
 class UserRepository(BaseRepository[UserProfile]):
@@ -22,6 +47,13 @@ class UserRepository(BaseRepository[UserProfile]):
         """Get user by email address."""
         return self.get_by_field("email", email)
 
+    def update(self, db_obj: UserProfile, obj_in: Dict[str, Any]) -> UserProfile:
+        """Update a profile and invalidate cached snapshots of it."""
+        self.db.execute(_notify_users_changed, {"channel": USER_CHANGED_CHANNEL, "ids": [db_obj.clerk_user_id]})
+        user = super().update(db_obj, obj_in)
+        invalidate_users([user.clerk_user_id])
+        return user
+
     def get_by_role(self, role: UserRole) -> List[UserProfile]:
         """Get all users with a specific role."""
         return self.get_multi_by_field("role", role)
@@ -47,12 +79,13 @@ class UserRepository(BaseRepository[UserProfile]):
         first_name: Optional[str] = None,
         last_name: Optional[str] = None,
         avatar_url: Optional[str] = None,
-        created_by: Optional[UUID] = None
+        created_by: Optional[UUID] = None,
+        clerk_updated_at: Optional[datetime] = None
     ) -> UserProfile:
         """Create a new user profile from Clerk data."""
-        # Check if this is the first user - if so, make them admin
-        total_users = self.db.query(UserProfile).count()
-        role = UserRole.ADMIN if total_users == 0 else UserRole.CUSTOMER
+        # Only bootstrap needs to know whether any user exists; EXISTS stops at the first row
+        is_first_user = not settings.BOOTSTRAP_ADMIN_EMAIL_LIST and not self.db.scalar(_has_users_statement())
+        role = _initial_role(email, is_first_user)
         
         user_data = {
             "clerk_user_id": clerk_user_id,
@@ -61,7 +94,8 @@ class UserRepository(BaseRepository[UserProfile]):
             "last_name": last_name,
             "role": role,
             "avatar_url": avatar_url,
-            "created_by": created_by  # Keep None for first user
+            "created_by": created_by,  # Keep None for first user
+            "clerk_updated_at": clerk_updated_at
         }
         return self.create(user_data)
 
@@ -71,3 +105,165 @@ class UserRepository(BaseRepository[UserProfile]):
         if user:
             return self.update(user, {"role": new_role})
         return None
+
+
+class AsyncUserRepository(AsyncBaseRepository[UserProfile]):
+    """Async repository for user profile operations."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(UserProfile, db)
+
+    async def get_by_clerk_id(self, clerk_user_id: str) -> Optional[UserProfile]:
+        """Get user by Clerk user ID."""
+        return await self.get_by_field("clerk_user_id", clerk_user_id)
+
+    async def get_by_email(self, email: str) -> Optional[UserProfile]:
+        """Get user by email address."""
+        return await self.get_by_field("email", email)
+
+    async def _notify_changed(self, clerk_user_ids: List[str]) -> None:
+        await self.db.execute(_notify_users_changed, {"channel": USER_CHANGED_CHANNEL, "ids": clerk_user_ids})
+
+    async def update(self, db_obj: UserProfile, obj_in: Dict[str, Any]) -> UserProfile:
+        """Update a profile and invalidate cached snapshots of it."""
+        await self._notify_changed([db_obj.clerk_user_id])
+        user = await super().update(db_obj, obj_in)
+        invalidate_users([user.clerk_user_id])
+        return user
+
+    async def get_by_role(self, role: UserRole) -> List[UserProfile]:
+        """Get all users with a specific role."""
+        return await self.get_multi_by_field("role", role)
+
+    async def get_admins(self) -> List[UserProfile]:
+        """Get all admin users."""
+        result = await self.db.execute(
+            select(UserProfile).where(
+                UserProfile.role.in_([UserRole.ADMIN, UserRole.SUPER_ADMIN])
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_customers(self) -> List[UserProfile]:
+        """Get all customer users."""
+        return await self.get_by_role(UserRole.CUSTOMER)
+
+    async def search_users(self, search_term: str) -> List[UserProfile]:
+        """Search users by name or email."""
+        return await self.search(search_term, ["first_name", "last_name", "email"])
+
+    async def create_user_from_clerk(
+        self,
+        clerk_user_id: str,
+        email: str,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        avatar_url: Optional[str] = None,
+        created_by: Optional[UUID] = None,
+        clerk_updated_at: Optional[datetime] = None
+    ) -> UserProfile:
+        """Create a new user profile from Clerk data.
+
+        Safe to race with the Clerk webhook: an existing profile is kept.
+        """
+        is_first_user = not settings.BOOTSTRAP_ADMIN_EMAIL_LIST and not await self.db.scalar(_has_users_statement())
+
+        user_data = {
+            "clerk_user_id": clerk_user_id,
+            "email": email,
+            "first_name": first_name,
+            "last_name": last_name,
+            "role": _initial_role(email, is_first_user),
+            "avatar_url": avatar_url,
+            "created_by": created_by,  # Keep None for first user
+            "clerk_updated_at": clerk_updated_at
+        }
+        await self.db.execute(
+            pg_insert(UserProfile).values(user_data).on_conflict_do_nothing(
+                index_elements=[UserProfile.clerk_user_id]
+            )
+        )
+        await self.db.commit()
+        return await self.get_by_clerk_id(clerk_user_id)
+
+    async def upsert_from_clerk(self, clerk_users: List[ClerkUser]) -> int:
+        """Insert or update profiles for Clerk users in a single statement.
+
+        Roles are only assigned on insert, so existing role changes survive.
+        Webhooks can arrive out of order, so a profile is only updated from
+        data newer than what it was last synced from (by Clerk's updated_at).
+        Returns the number of profiles inserted or updated.
+        """
+        # ON CONFLICT cannot update the same row twice in one statement; keep the latest event
+        by_id: Dict[str, ClerkUser] = {}
+        for clerk_user in clerk_users:
+            current = by_id.get(clerk_user.id)
+            if current is None or (clerk_user.updated_at or 0) >= (current.updated_at or 0):
+                by_id[clerk_user.id] = clerk_user
+        latest = list(by_id.values())
+        if not latest:
+            return 0
+
+        is_first_user = not settings.BOOTSTRAP_ADMIN_EMAIL_LIST and not await self.db.scalar(_has_users_statement())
+        rows = [
+            {
+                "clerk_user_id": clerk_user.id,
+                "email": clerk_user.primary_email,
+                "first_name": clerk_user.first_name,
+                "last_name": clerk_user.last_name,
+                "avatar_url": clerk_user.image_url,
+                "clerk_updated_at": clerk_user.updated_at_datetime,
+                "role": _initial_role(clerk_user.primary_email, is_first_user and i == 0),
+            }
+            for i, clerk_user in enumerate(latest)
+        ]
+
+        statement = pg_insert(UserProfile).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[UserProfile.clerk_user_id],
+            set_={
+                "email": statement.excluded.email,
+                "first_name": statement.excluded.first_name,
+                "last_name": statement.excluded.last_name,
+                "avatar_url": statement.excluded.avatar_url,
+                "clerk_updated_at": statement.excluded.clerk_updated_at,
+                "updated_at": func.now(),
+            },
+            # Profiles created just-in-time (or before this column) have no
+            # Clerk timestamp yet, and an event without one is applied as before
+            where=or_(
+                UserProfile.clerk_updated_at.is_(None),
+                statement.excluded.clerk_updated_at.is_(None),
+                UserProfile.clerk_updated_at < statement.excluded.clerk_updated_at,
+            ),
+        )
+        result = await self.db.execute(statement)
+        clerk_user_ids = [row["clerk_user_id"] for row in rows]
+        await self._notify_changed(clerk_user_ids)
+        await self.db.commit()
+        invalidate_users(clerk_user_ids)
+        return result.rowcount
+
+    async def mark_deleted(self, clerk_user_ids: List[str]) -> int:
+        """Mark profiles deleted in Clerk; rows are kept for order history."""
+        if not clerk_user_ids:
+            return 0
+        result = await self.db.execute(
+            update(UserProfile)
+            .where(
+                UserProfile.clerk_user_id.in_(clerk_user_ids),
+                UserProfile.deleted_at.is_(None)
+            )
+            .values(deleted_at=func.now(), updated_at=func.now())
+        )
+        await self._notify_changed(clerk_user_ids)
+        await self.db.commit()
+        invalidate_users(clerk_user_ids)
+        return result.rowcount
+
+    async def update_role(self, user_id: UUID, new_role: UserRole) -> Optional[UserProfile]:
+        """Update user role."""
+        user = await self.get(user_id)
+        if user:
+            return await self.update(user, {"role": new_role})
+        return None
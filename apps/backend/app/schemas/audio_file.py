@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel
 
@@ -30,12 +30,28 @@ class AudioFileUpdate(BaseModel):
 
 class AudioFileResponse(AudioFileBase):
     id: UUID
+    # Read from the file's headers after upload
+    bitrate_bps: Optional[int] = None
+    sample_rate_hz: Optional[int] = None
     created_at: str
 
     class Config:
         from_attributes = True
 
 
+class AudioFileDownloadResponse(BaseModel):
+    download_url: str
+    expires_at: int
+
+
+class AudioFileSeekResponse(BaseModel):
+    # Playback position the byte offset starts at (at or just before the requested time)
+    time_seconds: float
+    byte_offset: int
+    # Value for the Range header of the stream request
+    range: str
+
+
 class PreSignedUrlRequest(BaseModel):
     file_name: str
     file_type: str
@@ -46,3 +62,64 @@ class PreSignedUrlResponse(BaseModel):
     upload_url: str
     file_url: str
     expires_in: int
+
+
+class PreSignedUrlBatchRequest(BaseModel):
+    files: List[PreSignedUrlRequest]
+
+
+class PreSignedUrlBatchResponse(BaseModel):
+    uploads: List[PreSignedUrlResponse]
+
+
+class MultipartUploadCreateRequest(BaseModel):
+    file_name: str
+    file_type: str
+    file_size: int
+
+
+class MultipartUploadCreateResponse(BaseModel):
+    upload_id: str
+    object_key: str
+    file_url: str
+    part_size: int
+    part_count: int
+
+
+class MultipartUploadRef(BaseModel):
+    object_key: str
+    upload_id: str
+
+
+class MultipartUploadPartsRequest(MultipartUploadRef):
+    part_numbers: List[int]
+
+
+class MultipartUploadPartUrl(BaseModel):
+    part_number: int
+    upload_url: str
+
+
+class MultipartUploadPartsResponse(BaseModel):
+    parts: List[MultipartUploadPartUrl]
+    expires_in: int
+
+
+class MultipartUploadPart(BaseModel):
+    part_number: int
+    size: int
+    etag: str
+
+
+class MultipartUploadListPartsResponse(BaseModel):
+    parts: List[MultipartUploadPart]
+
+
+class MultipartUploadCompleteRequest(MultipartUploadRef):
+    part_count: int
+
+
+class MultipartUploadCompleteResponse(BaseModel):
+    object_key: str
+    file_url: str
+    file_size: int
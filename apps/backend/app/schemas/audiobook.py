@@ -48,6 +48,7 @@ class AudiobookResponse(AudiobookBase):
     created_at: str
     updated_at: str
     categories: List[dict] = []
+    is_owned: Optional[bool] = None
 
     class Config:
         from_attributes = True
@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 from pydantic import BaseModel
@@ -18,13 +19,41 @@ class UserProfileResponse(BaseModel):
 
 class ClerkUser(BaseModel):
     id: str
-    email_addresses: list[dict]
+    email_addresses: list[dict] = []
+    primary_email_address_id: Optional[str] = None
     first_name: Optional[str] = None
     last_name: Optional[str] = None
     image_url: Optional[str] = None
     public_metadata: Optional[dict] = None
+    # Milliseconds since the epoch, as Clerk reports it
+    updated_at: Optional[int] = None
+
+    @property
+    def updated_at_datetime(self) -> Optional[datetime]:
+        """Clerk's last-modified time as an aware datetime."""
+        if self.updated_at is None:
+            return None
+        return datetime.fromtimestamp(self.updated_at / 1000, tz=timezone.utc)
+
+    @property
+    def primary_email(self) -> str:
+        """Get the primary email address, falling back to the first one."""
+        for address in self.email_addresses:
+            if address.get("id") == self.primary_email_address_id:
+                return address["email_address"]
+        return self.email_addresses[0]["email_address"] if self.email_addresses else ""
+
+
+class ClerkWebhookEvent(BaseModel):
+    type: str
+    data: dict
 
 
 class AuthResponse(BaseModel):
     user: UserProfileResponse
     is_admin: bool
+
+
+class ClerkWebhookResponse(BaseModel):
+    upserted: int
+    deleted: int
@@ -0,0 +1,21 @@
+from typing import List
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class CartItemAdd(BaseModel):
+    audiobook_id: UUID
+
+
+class CartItemResponse(BaseModel):
+    audiobook_id: UUID
+    price_cents: int
+
+
+class CartResponse(BaseModel):
+    items: List[CartItemResponse]
+    total_cents: int
+
+
+class CartMergeResponse(BaseModel):
+    transferred: int
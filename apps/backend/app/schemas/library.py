@@ -0,0 +1,39 @@
+import enum
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class LibrarySort(str, enum.Enum):
+    PURCHASED = "purchased"
+    RECENTLY_DOWNLOADED = "recently_downloaded"
+    TITLE = "title"
+
+
+class LibraryItemResponse(BaseModel):
+    id: UUID
+    audiobook_id: UUID
+    title: str
+    slug: str
+    author_name: str
+    narrator_name: Optional[str] = None
+    cover_image_url: Optional[str] = None
+    duration_seconds: Optional[int] = None
+    download_count: int
+    last_downloaded_at: Optional[datetime] = None
+    purchased_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class LibraryPageResponse(BaseModel):
+    items: List[LibraryItemResponse]
+    next_cursor: Optional[str] = None
+
+
+class LibraryStatsResponse(BaseModel):
+    total_audiobooks: int
+    total_downloads: int
+    average_downloads_per_book: float
@@ -0,0 +1,73 @@
+"""Measure API throughput as the number of in-flight requests grows.
+
+Run against a live server, e.g.:
+
+    poetry run uvicorn app.main:app --workers 1 --port 8000
+    poetry run python benchmarks/concurrency.py --url http://localhost:8000/api/v1/categories/
+
+With blocking database calls throughput stays flat as concurrency rises,
+because every query stalls the worker's event loop; with async sessions it
+should keep climbing until the database or connection pool saturates.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+
+async def run_level(client: httpx.AsyncClient, url: str, concurrency: int, requests: int) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                response = await client.get(url)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000/api/v1/categories/")
+    parser.add_argument("--levels", default="1,2,4,8,16,32,64")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per level")
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        await client.get(args.url)  # warm up connections and server caches
+        print(f"{'in-flight':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for level in (int(level) for level in args.levels.split(",")):
+            result = await run_level(client, args.url, level, args.requests)
+            print(
+                f"{result['concurrency']:>9} {result['requests_per_second']:>9.1f} "
+                f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['errors']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, or_, select
+from sqlalchemy.exc import DBAPIError
+
+from app.db.database import AsyncSessionLocal, dispose_engines, get_async_engine
+from app.models.audio_file import AudioFile
+from app.models.audiobook import Audiobook
+from app.models.cart import CartItem
+from app.models.download_log import DownloadLog
+from app.models.enums import AudiobookStatus, OrderStatus, UserRole
+from app.models.library import UserLibrary
+from app.models.order import Order, OrderItem
+from app.models.user import UserProfile
+
+
+@pytest_asyncio.fixture
+async def db():
+    """Async session on a migrated database, or skip when none is reachable.
+
+    asyncpg connections belong to the event loop that opened them, and each
+    test runs in its own loop, so the app's engines are disposed afterwards.
+    """
+    try:
+        async with get_async_engine().connect():
+            pass
+    except (OSError, DBAPIError) as e:
+        await dispose_engines()
+        pytest.skip(f"database not reachable: {e}")
+    async with AsyncSessionLocal() as session:
+        yield session
+    await dispose_engines()
+
+
+class Factory:
+    """Creates users and audiobooks for a test and deletes everything referencing them."""
+
+    def __init__(self, db):
+        self.db = db
+        self.user_ids: List[uuid.UUID] = []
+        self.audiobook_ids: List[uuid.UUID] = []
+
+    async def user(self, **values) -> UserProfile:
+        user_id = uuid.uuid4()
+        user = UserProfile(
+            id=user_id,
+            clerk_user_id=values.pop("clerk_user_id", f"user_test_{user_id.hex}"),
+            email=values.pop("email", f"{user_id.hex}@example.com"),
+            role=values.pop("role", UserRole.CUSTOMER),
+            **values,
+        )
+        self.db.add(user)
+        await self.db.commit()
+        self.user_ids.append(user.id)
+        return user
+
+    async def audiobook(self, **values) -> Audiobook:
+        audiobook_id = uuid.uuid4()
+        audiobook = Audiobook(
+            id=audiobook_id,
+            title=values.pop("title", f"Test book {audiobook_id.hex[:8]}"),
+            slug=values.pop("slug", f"test-{audiobook_id.hex}"),
+            author_name=values.pop("author_name", "Test Author"),
+            price_cents=values.pop("price_cents", 1000),
+            status=values.pop("status", AudiobookStatus.PUBLISHED),
+            **values,
+        )
+        self.db.add(audiobook)
+        await self.db.commit()
+        self.audiobook_ids.append(audiobook.id)
+        return audiobook
+
+    async def purchase(self, user: UserProfile, *audiobooks: Audiobook, purchased_at=None) -> Order:
+        """Record a completed order for the audiobooks and add them to the user's library."""
+        order = Order(
+            order_number=f"TEST-{uuid.uuid4().hex[:16]}",
+            user_id=user.id,
+            status=OrderStatus.COMPLETED,
+            total_cents=sum(audiobook.price_cents for audiobook in audiobooks),
+        )
+        self.db.add(order)
+        await self.db.flush()
+        for audiobook in audiobooks:
+            self.db.add(OrderItem(
+                order_id=order.id,
+                audiobook_id=audiobook.id,
+                title=audiobook.title,
+                price_cents=audiobook.price_cents,
+            ))
+            self.db.add(UserLibrary(
+                user_id=user.id,
+                audiobook_id=audiobook.id,
+                order_id=order.id,
+                purchased_at=purchased_at or datetime.now(timezone.utc),
+            ))
+        await self.db.commit()
+        return order
+
+    def track_user(self, user_id: uuid.UUID) -> None:
+        """Delete a user created outside the factory (e.g. by a webhook) at the end of the test."""
+        self.user_ids.append(user_id)
+
+    async def cleanup(self) -> None:
+        await self.db.rollback()
+        users, books = self.user_ids, self.audiobook_ids
+        order_ids = select(Order.id).where(Order.user_id.in_(users))
+        for statement in (
+            delete(DownloadLog).where(or_(DownloadLog.user_id.in_(users), DownloadLog.audiobook_id.in_(books))),
+            delete(UserLibrary).where(or_(UserLibrary.user_id.in_(users), UserLibrary.audiobook_id.in_(books))),
+            delete(CartItem).where(or_(CartItem.user_id.in_(users), CartItem.audiobook_id.in_(books))),
+            delete(OrderItem).where(or_(OrderItem.order_id.in_(order_ids), OrderItem.audiobook_id.in_(books))),
+            delete(Order).where(Order.user_id.in_(users)),
+            delete(AudioFile).where(AudioFile.audiobook_id.in_(books)),
+            delete(Audiobook).where(Audiobook.id.in_(books)),
+            delete(UserProfile).where(UserProfile.id.in_(users)),
+        ):
+            await self.db.execute(statement)
+        await self.db.commit()
+
+
+@pytest_asyncio.fixture
+async def factory(db):
+    """Test data factory whose rows are removed after the test."""
+    test_factory = Factory(db)
+    yield test_factory
+    await test_factory.cleanup()
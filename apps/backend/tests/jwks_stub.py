@@ -0,0 +1,42 @@
+"""Local stand-in for a Clerk issuer's JWKS endpoint."""
+import json
+import time
+import uuid
+
+import httpx
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+
+class JWKSStub:
+    """Issues RS256 tokens and serves the matching JWKS over httpx.MockTransport."""
+
+    def __init__(self, issuer: str = "https://clerk.test"):
+        self.issuer = issuer
+        self.requests = 0
+        self.rotate()
+
+    def rotate(self) -> None:
+        """Switch to a new signing key, as Clerk does on key rotation."""
+        self.kid = uuid.uuid4().hex
+        self._private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def jwks(self) -> dict:
+        jwk = json.loads(RSAAlgorithm.to_jwk(self._private_key.public_key()))
+        jwk.update({"kid": self.kid, "use": "sig", "alg": "RS256"})
+        return {"keys": [jwk]}
+
+    def issue_token(self, sub: str = "user_123", ttl: int = 60, **claims) -> str:
+        now = int(time.time())
+        payload = {"iss": self.issuer, "sub": sub, "iat": now, "exp": now + ttl, **claims}
+        return jwt.encode(payload, self._private_key, algorithm="RS256", headers={"kid": self.kid})
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if str(request.url) != f"{self.issuer}/.well-known/jwks.json":
+            return httpx.Response(404)
+        self.requests += 1
+        return httpx.Response(200, json=self.jwks())
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
@@ -0,0 +1,19 @@
+"""Builders for synthetic MP3 and MP4 bytes used by the audio format tests."""
+import struct
+
+# MPEG-1 Layer III, 128 kbit/s, 44.1 kHz, stereo: 417-byte frames of 1152 samples
+FRAME_HEADER = b"\xff\xfb\x90\x00"
+FRAME_LENGTH = 417
+
+
+def id3v2(body_size: int) -> bytes:
+    syncsafe = bytes((body_size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x04\x00\x00" + syncsafe + b"\x00" * body_size
+
+
+def frame(payload: bytes = b"") -> bytes:
+    return (FRAME_HEADER + payload).ljust(FRAME_LENGTH, b"\x00")
+
+
+def box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
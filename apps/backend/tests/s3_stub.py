@@ -0,0 +1,122 @@
+"""In-memory stand-in for the S3 API calls made through DigitalOceanSpaces."""
+import hashlib
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+
+def _error(code: str, operation: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+
+class S3Stub:
+    """Implements the subset of a boto3 S3 client used by the app.
+
+    Listings are paginated with a small page size so callers' pagination
+    handling is exercised.
+    """
+
+    def __init__(self, page_size: int = 2):
+        self.page_size = page_size
+        self.objects: Dict[str, bytes] = {}
+        self.last_modified: Dict[str, datetime] = {}
+        self.delete_batches: List[List[str]] = []
+        # upload id -> {"key", "initiated", "parts": {number: bytes}}
+        self.uploads: Dict[str, dict] = {}
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, LastModified: Optional[datetime] = None) -> dict:
+        self.objects[Key] = Body
+        self.last_modified[Key] = LastModified or datetime.now(timezone.utc)
+        return {}
+
+    def delete_objects(self, Bucket: str, Delete: dict) -> dict:
+        keys = [item["Key"] for item in Delete["Objects"]]
+        if len(keys) > 1000:
+            raise _error("MalformedXML", "DeleteObjects")
+        self.delete_batches.append(keys)
+        for key in keys:
+            self.objects.pop(key, None)
+            self.last_modified.pop(key, None)
+        return {}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = "", ContinuationToken: str = "") -> dict:
+        keys = sorted(key for key in self.objects if key.startswith(Prefix) and key > ContinuationToken)
+        page = keys[:self.page_size]
+        response = {
+            "Contents": [
+                {"Key": key, "Size": len(self.objects[key]), "LastModified": self.last_modified[key]}
+                for key in page
+            ],
+            "IsTruncated": len(keys) > len(page),
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = page[-1]
+        return response
+
+    def create_multipart_upload(self, Bucket: str, Key: str, ContentType: Optional[str] = None) -> dict:
+        upload_id = uuid.uuid4().hex
+        self.uploads[upload_id] = {"key": Key, "initiated": datetime.now(timezone.utc), "parts": {}}
+        return {"Bucket": Bucket, "Key": Key, "UploadId": upload_id}
+
+    def _get_upload(self, key: str, upload_id: str, operation: str) -> dict:
+        upload = self.uploads.get(upload_id)
+        if upload is None or upload["key"] != key:
+            raise _error("NoSuchUpload", operation)
+        return upload
+
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes) -> dict:
+        """What a client's PUT to a presigned part URL does."""
+        self._get_upload(Key, UploadId, "UploadPart")["parts"][PartNumber] = Body
+        return {"ETag": f'"{hashlib.md5(Body).hexdigest()}"'}
+
+    def list_parts(self, Bucket: str, Key: str, UploadId: str, PartNumberMarker: int = 0) -> dict:
+        parts = self._get_upload(Key, UploadId, "ListParts")["parts"]
+        numbers = sorted(number for number in parts if number > PartNumberMarker)
+        page = numbers[:self.page_size]
+        response = {
+            "Parts": [
+                {"PartNumber": n, "Size": len(parts[n]), "ETag": f'"{hashlib.md5(parts[n]).hexdigest()}"'}
+                for n in page
+            ],
+            "IsTruncated": len(numbers) > len(page),
+        }
+        if response["IsTruncated"]:
+            response["NextPartNumberMarker"] = page[-1]
+        return response
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict) -> dict:
+        upload = self._get_upload(Key, UploadId, "CompleteMultipartUpload")
+        body = b""
+        for part in MultipartUpload["Parts"]:
+            data = upload["parts"].get(part["PartNumber"])
+            if data is None or part["ETag"] != f'"{hashlib.md5(data).hexdigest()}"':
+                raise _error("InvalidPart", "CompleteMultipartUpload")
+            body += data
+        self.put_object(Bucket=Bucket, Key=Key, Body=body)
+        del self.uploads[UploadId]
+        return {"Key": Key}
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str) -> dict:
+        self._get_upload(Key, UploadId, "AbortMultipartUpload")
+        del self.uploads[UploadId]
+        return {}
+
+    def list_multipart_uploads(
+        self, Bucket: str, Prefix: str = "", KeyMarker: str = "", UploadIdMarker: str = ""
+    ) -> dict:
+        entries = sorted(
+            (upload["key"], upload_id, upload["initiated"])
+            for upload_id, upload in self.uploads.items()
+            if upload["key"].startswith(Prefix)
+        )
+        entries = [entry for entry in entries if (entry[0], entry[1]) > (KeyMarker, UploadIdMarker)]
+        page = entries[:self.page_size]
+        response = {
+            "Uploads": [{"Key": key, "UploadId": upload_id, "Initiated": initiated} for key, upload_id, initiated in page],
+            "IsTruncated": len(entries) > len(page),
+        }
+        if response["IsTruncated"]:
+            response["NextKeyMarker"], response["NextUploadIdMarker"] = page[-1][0], page[-1][1]
+        return response
@@ -0,0 +1,113 @@
+import struct
+
+import pytest
+
+from app.core.audio_formats import RangeReader, parse_mpeg_frame_header, read_audio_metadata
+from app.core.seek_index import Mp3SeekIndexBuilder, lookup_seek_index
+from tests.mp3_frames import FRAME_HEADER, FRAME_LENGTH, box, frame, id3v2
+
+
+def reader_for(data: bytes) -> RangeReader:
+    return RangeReader(lambda start, end: data[start:end + 1], len(data))
+
+
+def test_parse_mpeg_frame_header():
+    """Test decoding bitrate, sample rate and frame length from a frame header."""
+    header = parse_mpeg_frame_header(FRAME_HEADER)
+    assert (header["bitrate"], header["sample_rate"], header["frame_length"]) == (128000, 44100, FRAME_LENGTH)
+    assert header["samples_per_frame"] == 1152 and not header["mono"]
+    # MPEG-2 Layer III, 64 kbit/s, 22.05 kHz
+    header = parse_mpeg_frame_header(b"\xff\xf3\x80\xc0")
+    assert (header["bitrate"], header["sample_rate"], header["samples_per_frame"]) == (64000, 22050, 576)
+    assert header["mono"]
+    assert parse_mpeg_frame_header(b"\xff\xfb\xf0\x00") is None  # bad bitrate index
+    assert parse_mpeg_frame_header(b"\xff\xeb\x90\x00") is None  # reserved version
+
+
+def test_cbr_mp3_duration_from_size():
+    """Test a constant bitrate MP3 behind ID3v2 and ID3v1 tags, reading only its headers."""
+    data = id3v2(5000) + b"\xff\x00" * 3 + frame() * 2000 + b"TAG" + b"\x00" * 125
+    reader = reader_for(data)
+    metadata = read_audio_metadata(reader)
+    assert metadata["bitrate"] == 128000 and metadata["sample_rate"] == 44100
+    assert metadata["duration_seconds"] == pytest.approx(2000 * FRAME_LENGTH * 8 / 128000)
+    assert reader.bytes_read <= 4 * reader.block_size < len(data) // 20
+
+
+def test_vbr_mp3_duration_from_xing_and_lame_headers():
+    """Test exact duration from the Xing frame count less the LAME encoder delay and padding."""
+    delay, padding = 576, 1000
+    lame = b"LAME3.100".ljust(21, b"\x00") + bytes([delay >> 4, (delay & 0x0F) << 4 | padding >> 8, padding & 0xFF])
+    xing = b"\x00" * 32 + b"Xing" + struct.pack(">III", 3, 50000, 9_000_000) + lame.ljust(36, b"\x00")
+    data = id3v2(100) + frame(xing) + frame() * 3000
+    reader = reader_for(data)
+    metadata = read_audio_metadata(reader)
+    expected = (50000 * 1152 - delay - padding) / 44100
+    assert metadata["duration_seconds"] == pytest.approx(expected)
+    assert metadata["bitrate"] == round(9_000_000 * 8 / expected)
+    assert reader.bytes_read <= 3 * reader.block_size
+
+
+def test_vbr_mp3_duration_from_vbri_header():
+    """Test duration from a Fraunhofer VBRI header."""
+    vbri = b"\x00" * 32 + b"VBRI" + struct.pack(">HHHII", 1, 0, 75, 4_000_000, 20000)
+    data = frame(vbri) + frame() * 10
+    metadata = read_audio_metadata(reader_for(data))
+    assert metadata["duration_seconds"] == pytest.approx(20000 * 1152 / 44100)
+
+
+def test_mp3_seek_index_in_one_streaming_pass():
+    """Test that seek entries land on frame boundaries however the file is chunked."""
+    xing = b"\x00" * 32 + b"Xing" + struct.pack(">III", 3, 500, 500 * FRAME_LENGTH)
+    audio_start = len(id3v2(3000)) + FRAME_LENGTH
+    data = id3v2(3000) + frame(xing) + frame() * 500 + b"TAG" + b"\x00" * 125
+
+    tables = []
+    for chunk_size in (7, 1000, len(data)):
+        builder = Mp3SeekIndexBuilder(interval_seconds=2)
+        for start in range(0, len(data), chunk_size):
+            builder.feed(data[start:start + chunk_size])
+        assert builder.duration_seconds == pytest.approx(500 * 1152 / 44100)
+        tables.append(builder.pack())
+    assert tables[0] == tables[1] == tables[2]
+    assert len(tables[0]) == 4 + 4 * 7  # 13.06 s of audio: entries for 0, 2, ..., 12 s
+
+    # 6 s is frame 230 (229.69 frames in); 13.5 s clamps to the last entry
+    assert lookup_seek_index(tables[0], 0) == (0, audio_start)
+    assert lookup_seek_index(tables[0], 7.9) == (6, audio_start + 230 * FRAME_LENGTH)
+    assert lookup_seek_index(tables[0], 13.5)[0] == 12
+
+
+def mp4_file(duration: int, timescale: int, sample_rate: int) -> bytes:
+    mvhd = box(b"mvhd", struct.pack(">IIIII", 0, 0, 0, timescale, duration) + b"\x00" * 80)
+    mdhd = box(b"mdhd", struct.pack(">IIIII", 0, 0, 0, 22050, 0) + b"\x00" * 4)
+    mp4a = box(b"mp4a", b"\x00" * 6 + b"\x00\x01" + b"\x00" * 8 + struct.pack(">HHHHI", 2, 16, 0, 0, sample_rate << 16))
+    stbl = box(b"stbl", box(b"stsd", struct.pack(">II", 0, 1) + mp4a))
+
+    def trak(handler: bytes, *children: bytes) -> bytes:
+        hdlr = box(b"hdlr", b"\x00" * 8 + handler + b"\x00" * 13)
+        return box(b"trak", box(b"mdia", mdhd + hdlr + b"".join(children)))
+
+    moov = box(b"moov", mvhd + trak(b"text") + trak(b"soun", box(b"minf", stbl)))
+    ftyp = box(b"ftyp", b"M4B \x00\x00\x02\x00M4B mp42isom")
+    # moov after a large mdat, as in files that were not optimised for streaming
+    return ftyp + box(b"mdat", b"\x00" * 2_000_000) + moov
+
+
+def test_m4b_duration_from_mvhd():
+    """Test reading duration and sample rate from an M4B whose moov box is at the end."""
+    data = mp4_file(duration=3_600_500, timescale=1000, sample_rate=44100)
+    reader = reader_for(data)
+    metadata = read_audio_metadata(reader)
+    assert metadata["duration_seconds"] == pytest.approx(3600.5)
+    assert metadata["sample_rate"] == 44100
+    assert metadata["bitrate"] == round(len(data) * 8 / 3600.5)
+    assert reader.bytes_read <= 3 * reader.block_size
+
+
+def test_unknown_or_truncated_files():
+    """Test that other formats and truncated headers give no metadata instead of failing."""
+    assert read_audio_metadata(reader_for(b"OggS" + b"\x00" * 100)) is None
+    assert read_audio_metadata(reader_for(b"\x00\x00\x00\x18ftypM4A \x00\x00\x00\x00M4A ")) is None
+    assert read_audio_metadata(reader_for(mp4_file(1000, 1000, 44100)[:-400])) is None
+    assert read_audio_metadata(reader_for(frame(b"\x00" * 32 + b"Xing\x00\x00")[:42])) is None
@@ -0,0 +1,43 @@
+import httpx
+import pytest
+
+from app.core.auth import get_current_admin_user
+from app.main import app
+from app.models.audio_file import AudioFile
+from app.repositories.audiobook import AsyncAudiobookRepository
+
+
+@pytest.mark.asyncio
+async def test_duration_rolls_up_from_chapters(db, factory):
+    """Test that a hand-entered duration is kept until chapters are measured and cleared with the last chapter."""
+    audiobook = await factory.audiobook(duration_seconds=600)
+    audiobook_repo = AsyncAudiobookRepository(db)
+
+    async def duration() -> int:
+        await db.refresh(audiobook)
+        return audiobook.duration_seconds
+
+    chapters = [AudioFile(audiobook_id=audiobook.id, chapter_number=n, file_url=f"https://cdn.test/{n}.mp3") for n in (1, 2)]
+    db.add_all(chapters)
+    await db.commit()
+    await audiobook_repo.refresh_duration(audiobook.id)
+    assert await duration() == 600
+
+    chapters[0].duration_seconds, chapters[1].duration_seconds = 120, 60
+    await db.commit()
+    await audiobook_repo.refresh_duration(audiobook.id)
+    assert await duration() == 180
+
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            for chapter in chapters:
+                response = await client.delete(f"/api/v1/audio-files/{chapter.id}")
+                assert response.status_code == 204
+                if chapter is chapters[0]:
+                    assert await duration() == 60
+    finally:
+        app.dependency_overrides.pop(get_current_admin_user, None)
+
+    assert await duration() is None
@@ -0,0 +1,94 @@
+import time
+import uuid
+
+import httpx
+import pytest
+
+from app.core.auth import ClerkAuth
+from app.core.user_cache import user_cache
+from app.schemas.auth import UserProfileResponse
+
+CLERK_USER = {
+    "id": "user_123",
+    "email_addresses": [{"email_address": "reader@example.com"}],
+    "first_name": "Ada",
+}
+
+
+def make_auth(monkeypatch, handler) -> ClerkAuth:
+    auth = ClerkAuth("sk_test")
+    auth._http_client = httpx.AsyncClient(
+        base_url=auth.base_url, transport=httpx.MockTransport(handler)
+    )
+
+    async def verify_jwt_token(token):
+        return {"sub": "user_123", "exp": time.time() + 60}
+
+    monkeypatch.setattr(auth, "verify_jwt_token", verify_jwt_token)
+    return auth
+
+
+@pytest.mark.asyncio
+async def test_clerk_user_is_fetched_once_per_subject(monkeypatch):
+    """Test that repeated verifications reuse the cached Clerk identity."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json=CLERK_USER)
+
+    auth = make_auth(monkeypatch, handler)
+    first = await auth.verify_token("token")
+    second = await auth.verify_token("token")
+    await auth.close()
+
+    assert first.id == second.id == "user_123"
+    assert calls == ["/v1/users/user_123"]
+
+
+@pytest.mark.asyncio
+async def test_failed_lookups_are_not_cached(monkeypatch):
+    """Test that Clerk API errors are retried on the next request."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(503)
+
+    auth = make_auth(monkeypatch, handler)
+    assert await auth.verify_token("token") is None
+    assert await auth.verify_token("token") is None
+    await auth.close()
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("response", [
+    httpx.Response(200, text="<html>Bad gateway</html>"),
+    httpx.Response(200, json=["user_123"]),
+    httpx.Response(200, json={"first_name": "Ada"}),
+    httpx.Response(200, json={**CLERK_USER, "email_addresses": "reader@example.com"}),
+])
+async def test_malformed_clerk_user_is_rejected(monkeypatch, response):
+    """Test that an unexpected Clerk API payload fails authentication instead of raising."""
+    auth = make_auth(monkeypatch, lambda request: response)
+    assert await auth.verify_token("token") is None
+    await auth.close()
+
+    assert auth.identity_cache.get("user_123") is None
+
+
+@pytest.mark.asyncio
+async def test_cached_profile_needs_no_database(monkeypatch):
+    """Test that a cached profile snapshot answers auth without a DB session."""
+    auth = make_auth(monkeypatch, lambda request: httpx.Response(500))
+    snapshot = UserProfileResponse(
+        id=uuid.uuid4(), clerk_user_id="user_123", email="reader@example.com", role="admin"
+    )
+    user_cache.set("user_123", snapshot)
+    try:
+        assert await auth.get_user_from_token("token", db=None) is snapshot
+    finally:
+        user_cache.pop("user_123")
+        await auth.close()
@@ -0,0 +1,44 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.auth import get_current_admin_user
+from app.core.cache import TTLCache
+from app.main import app
+
+
+def test_entries_expire():
+    """Test that entries are dropped once their TTL has passed."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1, ttl=0.01)
+    assert cache.get("a") == 1
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that the cache stays within maxsize by evicting the LRU entry."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_admin_cache_metrics_include_user_profiles():
+    """Test that the admin cache endpoint reports every in-process cache."""
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    try:
+        response = TestClient(app).get("/api/v1/admin/caches")
+    finally:
+        app.dependency_overrides.pop(get_current_admin_user, None)
+
+    assert response.status_code == 200
+    assert set(response.json()) == {
+        "verified_tokens", "clerk_identities", "user_profiles", "entitlements", "download_urls",
+    }
@@ -0,0 +1,31 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.core.cart_token import CartTokenItem
+from app.models.cart import CartItem
+from app.models.enums import AudiobookStatus
+from app.repositories.cart import AsyncCartRepository
+
+
+@pytest.mark.asyncio
+async def test_token_cart_is_checked_against_catalog(db, factory):
+    """Test that merging a cart token uses current prices and drops missing, unpublished and owned books."""
+    user = await factory.user()
+    repriced = await factory.audiobook(price_cents=2500)
+    draft = await factory.audiobook(status=AudiobookStatus.DRAFT)
+    owned = await factory.audiobook()
+    await factory.purchase(user, owned)
+
+    token_items = [
+        CartTokenItem(repriced.id, 1),  # stale price from an old cookie
+        CartTokenItem(draft.id, 1000),
+        CartTokenItem(owned.id, 1000),
+        CartTokenItem(uuid.uuid4(), 1000),  # deleted book
+    ]
+    transferred = await AsyncCartRepository(db).transfer_session_cart_to_user(None, user.id, token_items)
+
+    assert transferred == 1
+    items = (await db.scalars(select(CartItem).where(CartItem.user_id == user.id))).all()
+    assert [(item.audiobook_id, item.price_cents) for item in items] == [(repriced.id, 2500)]
@@ -0,0 +1,48 @@
+import time
+from uuid import uuid4
+
+import pytest
+
+from app.core.cart_token import CartTokenCodec, CartTokenError, CartTokenItem
+
+
+def make_codec(**kwargs) -> CartTokenCodec:
+    return CartTokenCodec(secret="test-secret", **kwargs)
+
+
+def test_round_trip():
+    """Test that encoded cart items decode unchanged."""
+    codec = make_codec()
+    items = [CartTokenItem(uuid4(), 1999), CartTokenItem(uuid4(), 0)]
+    assert codec.decode(codec.encode(items)) == items
+
+
+def test_tampered_token_is_rejected():
+    """Test that a modified payload fails signature verification."""
+    codec = make_codec()
+    token = codec.encode([CartTokenItem(uuid4(), 1999)])
+    payload, signature = token.split(".")
+    tampered = payload[:-2] + ("A" if payload[-2] != "A" else "B") + payload[-1]
+    with pytest.raises(CartTokenError):
+        codec.decode(f"{tampered}.{signature}")
+    assert codec.load(f"{tampered}.{signature}") == []
+
+
+def test_token_size_is_bounded():
+    """Test that carts over the item limit cannot be encoded or decoded."""
+    codec = make_codec(max_items=2)
+    items = [CartTokenItem(uuid4(), 100) for _ in range(3)]
+    with pytest.raises(CartTokenError):
+        codec.encode(items)
+
+    oversized = make_codec(max_items=3).encode(items)
+    with pytest.raises(CartTokenError):
+        codec.decode(oversized)
+
+
+def test_expired_token_is_rejected():
+    """Test that tokens older than max age are rejected."""
+    codec = make_codec(max_age_seconds=60)
+    token = codec.encode([CartTokenItem(uuid4(), 100)], issued_at=int(time.time()) - 120)
+    with pytest.raises(CartTokenError):
+        codec.decode(token)
@@ -0,0 +1,107 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.db.database import SessionLocal, get_engine
+from app.models.cart import CartItem
+from app.models.library import UserLibrary
+from app.models.order import Order, OrderItem
+from app.repositories.checkout import CheckoutRepository
+
+
+def checkout(user_id, payment_intent_id):
+    """Check out in a session of its own, as separate requests would."""
+    get_engine()
+    with SessionLocal() as session:
+        order = CheckoutRepository(session).checkout(
+            user_id=user_id,
+            order_number=f"TEST-{uuid.uuid4().hex[:16]}",
+            payment_intent_id=payment_intent_id
+        )
+        return order.id if order else None
+
+
+async def fill_cart(db, user, *audiobooks):
+    db.add_all(CartItem(user_id=user.id, audiobook_id=book.id, price_cents=book.price_cents) for book in audiobooks)
+    await db.commit()
+
+
+async def count(db, statement) -> int:
+    return await db.scalar(select(func.count()).select_from(statement.subquery()))
+
+
+@pytest.mark.asyncio
+async def test_empty_cart(db, factory):
+    """Test that checking out an empty cart creates no order."""
+    user = await factory.user()
+    assert checkout(user.id, f"pi_{uuid.uuid4().hex}") is None
+    assert await count(db, select(Order).where(Order.user_id == user.id)) == 0
+
+
+@pytest.mark.asyncio
+async def test_checkout_clears_cart_and_skips_owned_books(db, factory):
+    """Test that owned books are not charged again and the cart is emptied."""
+    user = await factory.user()
+    owned = await factory.audiobook(price_cents=700)
+    new = await factory.audiobook(price_cents=1200)
+    await factory.purchase(user, owned)
+    await fill_cart(db, user, owned, new)
+
+    order_id = checkout(user.id, f"pi_{uuid.uuid4().hex}")
+
+    order = await db.get(Order, order_id)
+    assert order.total_cents == 1200
+    items = (await db.scalars(select(OrderItem.audiobook_id).where(OrderItem.order_id == order_id))).all()
+    assert items == [new.id]
+    assert await count(db, select(CartItem).where(CartItem.user_id == user.id)) == 0
+    assert await count(db, select(UserLibrary).where(UserLibrary.user_id == user.id)) == 2
+
+
+@pytest.mark.asyncio
+async def test_replayed_payment_intent_returns_original_order(db, factory):
+    """Test that retrying with the same payment intent does not create a second order."""
+    user = await factory.user()
+    audiobook = await factory.audiobook()
+    await fill_cart(db, user, audiobook)
+    payment_intent_id = f"pi_{uuid.uuid4().hex}"
+
+    first = checkout(user.id, payment_intent_id)
+    await fill_cart(db, user, await factory.audiobook())
+    assert checkout(user.id, payment_intent_id) == first
+    assert await count(db, select(Order).where(Order.user_id == user.id)) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_checkouts(db, factory):
+    """Test that simultaneous checkouts with one payment intent yield a single order."""
+    user = await factory.user()
+    await fill_cart(db, user, await factory.audiobook(), await factory.audiobook())
+    payment_intent_id = f"pi_{uuid.uuid4().hex}"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        order_ids = list(pool.map(lambda _: checkout(user.id, payment_intent_id), range(4)))
+
+    assert len(set(order_ids)) == 1 and order_ids[0] is not None
+    assert await count(db, select(Order).where(Order.user_id == user.id)) == 1
+    assert await count(db, select(OrderItem).where(OrderItem.order_id == order_ids[0])) == 2
+
+
+@pytest.mark.asyncio
+async def test_payment_intent_is_scoped_to_user(db, factory):
+    """Test that another user's payment intent never returns their order."""
+    owner = await factory.user()
+    other = await factory.user()
+    await fill_cart(db, owner, await factory.audiobook())
+    await fill_cart(db, other, await factory.audiobook())
+    payment_intent_id = f"pi_{uuid.uuid4().hex}"
+    owner_order = checkout(owner.id, payment_intent_id)
+
+    get_engine()
+    with SessionLocal() as session:
+        assert CheckoutRepository(session).get_by_payment_intent(other.id, payment_intent_id) is None
+    with pytest.raises(IntegrityError):
+        checkout(other.id, payment_intent_id)
+    assert (await db.get(Order, owner_order)).user_id == owner.id
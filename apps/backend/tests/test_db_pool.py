@@ -0,0 +1,86 @@
+import httpx
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.core.auth import get_current_admin_user
+from app.core.config import settings
+from app.db.database import get_async_engine, get_engine
+from app.db.pool import async_engine_options, pool_status, sync_engine_options
+from app.main import app
+
+
+def test_engine_options_follow_settings(monkeypatch):
+    """Test that pool sizing and server timeouts come from settings."""
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 1)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 1500)
+    monkeypatch.setattr(settings, "DB_IDLE_IN_TRANSACTION_TIMEOUT_MS", 0)
+
+    sync_options = sync_engine_options()
+    assert (sync_options["pool_size"], sync_options["max_overflow"]) == (3, 1)
+    assert sync_options["connect_args"] == {"options": "-c statement_timeout=1500"}
+    assert async_engine_options()["connect_args"] == {"server_settings": {"statement_timeout": "1500"}}
+
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 0)
+    assert sync_engine_options()["connect_args"] == {}
+    assert async_engine_options()["connect_args"] == {}
+
+
+@pytest.mark.asyncio
+async def test_server_timeouts_are_applied(db):
+    """Test that both engines' connections run with the configured timeouts."""
+    with get_engine().connect() as connection:
+        assert connection.execute(text("SHOW statement_timeout")).scalar() == "30s"
+        assert connection.execute(text("SHOW idle_in_transaction_session_timeout")).scalar() == "1min"
+
+    async with get_async_engine().connect() as connection:
+        assert (await connection.execute(text("SHOW statement_timeout"))).scalar() == "30s"
+        assert (await connection.execute(text("SHOW idle_in_transaction_session_timeout"))).scalar() == "1min"
+
+    with get_engine().connect() as connection:
+        with pytest.raises(exc.OperationalError, match="statement timeout"):
+            connection.execute(text("SET LOCAL statement_timeout = 50; SELECT pg_sleep(1)"))
+
+
+@pytest.mark.asyncio
+async def test_pool_counters(db):
+    """Test that checkouts, checkins, connects and timeouts are counted, also across dispose()."""
+    options = {**sync_engine_options(), "pool_size": 1, "max_overflow": 0, "pool_timeout": 0.05}
+    engine = create_engine(settings.DATABASE_URL, **options)
+    metrics = engine.pool.metrics
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    with engine.connect():
+        pass
+    assert (metrics.connects, metrics.checkouts, metrics.checkins, metrics.timeouts) == (1, 2, 2, 1)
+
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert engine.pool.metrics is metrics
+    assert (metrics.connects, metrics.checkouts, metrics.checkins) == (2, 3, 3)
+
+    status = pool_status(engine.pool)
+    assert status["checked_out"] == 0 and status["checkouts"] == 3 and status["max_wait_ms"] >= 0
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_endpoint(db):
+    """Test the admin pool metrics endpoint reports both engines."""
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            response = await client.get("/api/v1/admin/db/pool")
+    finally:
+        app.dependency_overrides.pop(get_current_admin_user, None)
+
+    assert response.status_code == 200
+    metrics = response.json()
+    assert metrics["async"]["checkouts"] >= 1
+    assert metrics["async"]["size"] == settings.DB_POOL_SIZE
+    assert {"sync", "async"} <= metrics.keys()
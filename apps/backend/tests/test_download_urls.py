@@ -0,0 +1,58 @@
+import base64
+import hashlib
+import hmac
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from app.core.sigv4 import CDNTokenSigner
+from app.core.storage import base
+from app.core.storage.s3 import S3Storage
+
+BUCKET_START = 1_800_000_000 - 1_800_000_000 % 900
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [BUCKET_START + 10.0]
+    monkeypatch.setattr(base.time, "time", lambda: now[0])
+    return now
+
+
+def test_download_url_is_reused_within_bucket(clock):
+    """Test that repeat calls in one bucket return the same URL, signed at the bucket start."""
+    storage = S3Storage()
+    first = storage.get_download_url("audio-files/a.mp3", expires_in=3600)
+    clock[0] += 800
+    assert storage.get_download_url("audio-files/a.mp3", expires_in=3600) is first
+    assert storage.download_url_cache.hits == 1
+
+    query = parse_qs(urlsplit(first["url"]).query)
+    assert query["X-Amz-Expires"] == ["3600"]
+    assert first["expires_at"] == BUCKET_START + 3600
+    assert first["refresh_at"] == BUCKET_START + 900
+
+    # A fresh process signs the identical URL, so it stays cacheable
+    assert S3Storage().get_download_url("audio-files/a.mp3", expires_in=3600)["url"] == first["url"]
+
+
+def test_download_url_rotates_with_bucket(clock):
+    """Test that a new bucket gets a new URL that is valid for at least expires - bucket seconds."""
+    storage = S3Storage()
+    first = storage.get_download_url("audio-files/a.mp3", expires_in=3600)
+    clock[0] = BUCKET_START + 900
+    second = storage.get_download_url("audio-files/a.mp3", expires_in=3600)
+    assert second["url"] != first["url"]
+    assert second["expires_at"] - clock[0] == 3600
+
+
+def test_cdn_token_url():
+    """Test the CDN token format an edge validator recomputes."""
+    signer = CDNTokenSigner("https://cdn.example.com/", "edge-secret")
+    url = signer.sign("audio-files/chapter 1.mp3", 1_800_000_000)
+    parts = urlsplit(url)
+    assert parts.path == "/audio-files/chapter%201.mp3"
+    query = parse_qs(parts.query)
+    digest = hmac.new(b"edge-secret", f"{parts.path}1800000000".encode(), hashlib.sha256).digest()
+    assert query["token"] == [base64.urlsafe_b64encode(digest).rstrip(b"=").decode()]
+    assert query["expires"] == ["1800000000"]
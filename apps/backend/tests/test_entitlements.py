@@ -0,0 +1,83 @@
+import uuid
+
+import httpx
+import pytest
+
+from app.core.auth import get_optional_current_user
+from app.core.entitlements import entitlement_cache
+from app.db.database import SessionLocal, get_engine
+from app.main import app
+from app.repositories.library import AsyncLibraryRepository
+from app.repositories.order import OrderRepository
+from app.schemas.auth import UserProfileResponse
+
+
+@pytest.mark.asyncio
+async def test_owned_ids(db, factory):
+    """Test that only the candidates a user owns are reported."""
+    user = await factory.user()
+    owned, other = await factory.audiobook(), await factory.audiobook()
+    await factory.purchase(user, owned)
+
+    library_repo = AsyncLibraryRepository(db)
+    assert await library_repo.owned_ids(user.id, [owned.id, other.id, uuid.uuid4()]) == {owned.id}
+    assert await library_repo.owned_ids(user.id, []) == set()
+    assert entitlement_cache.get(user.id) == frozenset({owned.id})
+
+
+@pytest.mark.asyncio
+async def test_access_checks_see_other_workers_purchases_and_refunds(db, factory):
+    """Test that has_audiobook is not served from the per-process cache, and refunds revoke access."""
+    user = await factory.user()
+    audiobook = await factory.audiobook()
+    library_repo = AsyncLibraryRepository(db)
+    assert await library_repo.owned_ids(user.id, [audiobook.id]) == set()
+
+    # Bought through another worker: this process's cache was not invalidated
+    order = await factory.purchase(user, audiobook)
+    assert await library_repo.has_audiobook(user.id, audiobook.id)
+    assert await library_repo.owned_ids(user.id, [audiobook.id]) == set()
+
+    get_engine()
+    with SessionLocal() as session:
+        OrderRepository(session).refund_order(order.id)
+    assert entitlement_cache.get(user.id) is None
+    assert not await library_repo.has_audiobook(user.id, audiobook.id)
+    assert await library_repo.owned_ids(user.id, [audiobook.id]) == set()
+
+
+@pytest.mark.asyncio
+async def test_add_to_library_invalidates_cache(db, factory):
+    """Test that a purchase in this process is reflected in the cached owned set at once."""
+    user = await factory.user()
+    audiobook = await factory.audiobook()
+    order = await factory.purchase(user)
+    library_repo = AsyncLibraryRepository(db)
+    assert await library_repo.owned_ids(user.id, [audiobook.id]) == set()
+
+    await library_repo.add_to_library(user.id, audiobook.id, order.id)
+    assert await library_repo.owned_ids(user.id, [audiobook.id]) == {audiobook.id}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/v1/audiobooks/", "/api/v1/audiobooks/public"])
+async def test_list_endpoints_mark_owned_audiobooks(db, factory, path):
+    """Test is_owned on catalog pages for a signed-in user and its absence for anonymous visitors."""
+    marker = uuid.uuid4().hex
+    user = await factory.user()
+    owned = await factory.audiobook(title=f"Owned {marker}")
+    not_owned = await factory.audiobook(title=f"Other {marker}")
+    await factory.purchase(user, owned)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        anonymous = await client.get(path, params={"search": marker})
+        app.dependency_overrides[get_optional_current_user] = lambda: UserProfileResponse.model_validate(user)
+        try:
+            signed_in = await client.get(path, params={"search": marker})
+        finally:
+            app.dependency_overrides.pop(get_optional_current_user, None)
+
+    assert {item["is_owned"] for item in anonymous.json()["items"]} == {None}
+    marks = {item["id"]: item["is_owned"] for item in signed_in.json()["items"]}
+    assert marks == {str(owned.id): True, str(not_owned.id): False}
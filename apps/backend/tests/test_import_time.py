@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Cumulative `python -X importtime` budget for importing the app. Generous
+# enough for slow CI machines; override with IMPORT_TIME_BUDGET_MS.
+IMPORT_TIME_BUDGET_MS = int(os.environ.get("IMPORT_TIME_BUDGET_MS", "2000"))
+
+# Loaded on first use (storage, database drivers, outbound HTTP), never at import
+LAZY_MODULES = {"boto3", "asyncpg", "psycopg2", "httpx"}
+
+
+def import_times() -> dict:
+    """Get cumulative import time in microseconds per top-level-imported module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_app_import_stays_within_budget():
+    """Test that importing the app is fast and defers heavy dependencies."""
+    times = import_times()
+    assert not LAZY_MODULES & times.keys()
+    assert times["app.main"] / 1000 < IMPORT_TIME_BUDGET_MS
@@ -0,0 +1,73 @@
+import uuid
+
+import pytest
+from sqlalchemy import desc, select, text
+from sqlalchemy.exc import OperationalError
+
+from app.db.database import get_engine
+from app.models.audio_file import AudioFile
+from app.models.audiobook import Audiobook
+from app.models.cart import CartItem
+from app.models.download_log import DownloadLog
+from app.models.enums import AudiobookStatus
+from app.models.library import UserLibrary
+from app.models.review import Review
+
+
+@pytest.fixture(scope="module")
+def connection():
+    """Connection to a migrated database, or skip when none is reachable."""
+    try:
+        conn = get_engine().connect()
+    except OperationalError:
+        pytest.skip("database not reachable")
+    yield conn
+    conn.close()
+
+
+def explain(connection, statement) -> str:
+    """Get the query plan, with sequential scans and sorts disabled so tiny test tables use indexes."""
+    sql = statement.compile(dialect=get_engine().dialect, compile_kwargs={"literal_binds": True})
+    with connection.begin() as transaction:
+        connection.execute(text("SET LOCAL enable_seqscan = off"))
+        connection.execute(text("SET LOCAL enable_sort = off"))
+        plan = "\n".join(connection.execute(text(f"EXPLAIN {sql}")).scalars())
+        transaction.rollback()
+    return plan
+
+
+USER_ID = uuid.uuid4()
+AUDIOBOOK_ID = uuid.uuid4()
+
+
+@pytest.mark.parametrize("statement, index_name", [
+    (
+        select(AudioFile).where(AudioFile.audiobook_id == AUDIOBOOK_ID, AudioFile.chapter_number == 1),
+        "ix_audio_files_audiobook_id_chapter_number",
+    ),
+    (
+        select(CartItem).where(CartItem.user_id == USER_ID, CartItem.audiobook_id == AUDIOBOOK_ID),
+        "ix_cart_items_user_id_audiobook_id",
+    ),
+    (
+        select(Review).where(Review.user_id == USER_ID, Review.audiobook_id == AUDIOBOOK_ID),
+        "ix_reviews_user_id_audiobook_id",
+    ),
+    (
+        select(DownloadLog).where(DownloadLog.user_id == USER_ID).order_by(desc(DownloadLog.created_at)).limit(20),
+        "ix_download_logs_user_id_created_at",
+    ),
+    (
+        select(UserLibrary).where(UserLibrary.user_id == USER_ID)
+        .order_by(desc(UserLibrary.purchased_at), desc(UserLibrary.id)).limit(20),
+        "ix_user_library_user_id_purchased_at",
+    ),
+    (
+        select(Audiobook).where(Audiobook.status == AudiobookStatus.PUBLISHED.value)
+        .order_by(desc(Audiobook.created_at)).limit(10),
+        "ix_audiobooks_published_created_at",
+    ),
+])
+def test_hot_queries_use_composite_indexes(connection, statement, index_name):
+    """Test that the planner picks the composite/partial index for each hot query."""
+    assert index_name in explain(connection, statement)
@@ -0,0 +1,58 @@
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import exc, text
+
+from app.core.config import settings
+from app.db.database import get_engine
+from app.db.instrumentation import parameter_shape, start_request_stats
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_server_timing_header():
+    """Test that responses report database time and query count."""
+    response = client.get("/api/v1/health/")
+    assert response.headers["Server-Timing"].startswith('db;dur=0.0;desc="0 queries"')
+
+
+def test_parameter_shape_hides_values():
+    """Test that logged bind parameters carry types, not values."""
+    assert parameter_shape({"email": "a@b.c", "limit": 10}) == {"email": "str", "limit": "int"}
+    assert parameter_shape(("x", None)) == ["str", "NoneType"]
+    assert parameter_shape([{"id": 1}, {"id": 2}], executemany=True) == "2 x {'id': 'int'}"
+
+
+@pytest.mark.asyncio
+async def test_queries_are_counted(db):
+    """Test that real queries, including failed ones, add to the request's stats."""
+    with get_engine().connect() as connection:
+        stats = start_request_stats()
+        connection.execute(text("SELECT 1"))
+        connection.execute(text("SELECT pg_sleep(0.01)"))
+        assert stats.count == 2 and stats.total_ms >= 10
+
+        for _ in range(2):
+            with pytest.raises(exc.ProgrammingError):
+                connection.execute(text("SELECT * FROM no_such_table"))
+            connection.rollback()
+        assert stats.count == 4
+        # Failed statements leave no start times behind on the pooled connection
+        assert connection.info["query_start_time"] == []
+
+
+@pytest.mark.asyncio
+async def test_slow_query_is_logged(db, caplog, monkeypatch):
+    """Test that statements over the threshold are logged with parameter types only."""
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 5)
+    with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+        with get_engine().connect() as connection:
+            connection.execute(text("SELECT pg_sleep(0.01), :secret"), {"secret": "hunter2"})
+            connection.execute(text("SELECT 1"))
+
+    assert len(caplog.records) == 1
+    message = caplog.records[0].getMessage()
+    assert message.startswith("Slow query") and "pg_sleep" in message
+    assert "{'secret': 'str'}" in message and "hunter2" not in message
@@ -0,0 +1,135 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.auth import ClerkAuth
+from app.core.jwks import JWKSKeyStore
+from tests.jwks_stub import JWKSStub
+
+
+def make_auth(stub: JWKSStub) -> ClerkAuth:
+    auth = ClerkAuth(
+        "sk_test", key_store=JWKSKeyStore(min_refetch_seconds=0, http_client=stub.client())
+    )
+    auth.trusted_issuers = {stub.issuer}
+    return auth
+
+
+def serve(*stubs: JWKSStub) -> httpx.AsyncClient:
+    """One client answering for several issuers."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        for stub in stubs:
+            response = stub.handler(request)
+            if response.status_code != 404:
+                return response
+        return httpx.Response(404)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_prefetched_keys_verify_without_fetching():
+    """Test that verification after startup needs no network round trip."""
+    stub = JWKSStub()
+    auth = make_auth(stub)
+    await auth.start()
+    assert stub.requests == 1
+
+    claims = await auth.verify_jwt_token(stub.issue_token(sub="user_1"))
+    await auth.close()
+
+    assert claims["sub"] == "user_1"
+    assert stub.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_rotated_key_is_fetched_once_for_concurrent_requests():
+    """Test that an unknown kid triggers a single shared JWKS fetch."""
+    stub = JWKSStub()
+    auth = make_auth(stub)
+    await auth.start()
+    stub.rotate()
+
+    token = stub.issue_token()
+    results = await asyncio.gather(*(auth.verify_jwt_token(token) for _ in range(10)))
+    await auth.close()
+
+    assert all(claims and claims["sub"] == "user_123" for claims in results)
+    assert stub.requests == 2
+
+
+@pytest.mark.asyncio
+async def test_untrusted_issuer_is_rejected_without_fetching():
+    """Test that tokens from other issuers never cause a JWKS fetch."""
+    stub = JWKSStub()
+    auth = make_auth(stub)
+    other = JWKSStub(issuer="https://attacker.test")
+
+    assert await auth.verify_jwt_token(other.issue_token()) is None
+    await auth.close()
+    assert stub.requests == other.requests == 0
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_rejected():
+    """Test that expiry is still enforced for known keys."""
+    stub = JWKSStub()
+    auth = make_auth(stub)
+    await auth.start()
+
+    assert await auth.verify_jwt_token(stub.issue_token(ttl=-10)) is None
+    await auth.close()
+
+
+@pytest.mark.asyncio
+async def test_verified_tokens_are_cached_until_keys_rotate():
+    """Test that repeat tokens hit the cache and rotation flushes it."""
+    stub = JWKSStub()
+    auth = make_auth(stub)
+    await auth.start()
+    token = stub.issue_token()
+
+    await auth.verify_jwt_token(token)
+    await auth.verify_jwt_token(token)
+    assert auth.token_cache.stats()["hits"] == 1
+    assert len(auth.token_cache) == 1
+
+    stub.rotate()
+    await auth.verify_jwt_token(stub.issue_token(sub="user_2"))
+    await auth.close()
+
+    # The rotation flushed the old entry; only the new token is cached
+    assert len(auth.token_cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_issuers_sharing_a_kid_do_not_shadow_each_other():
+    """Test that keys are looked up per issuer when no issuer allow-list is configured."""
+    clerk = JWKSStub()
+    other = JWKSStub(issuer="https://other.test")
+    other.kid = clerk.kid
+    auth = ClerkAuth("sk_test", key_store=JWKSKeyStore(min_refetch_seconds=0, http_client=serve(clerk, other)))
+    auth.trusted_issuers = set()
+
+    assert (await auth.verify_jwt_token(clerk.issue_token(sub="user_1")))["sub"] == "user_1"
+    assert (await auth.verify_jwt_token(other.issue_token(sub="user_2")))["sub"] == "user_2"
+    # Neither the other issuer's key nor a forged issuer claim stands in for Clerk's
+    assert (await auth.verify_jwt_token(clerk.issue_token(sub="user_3")))["sub"] == "user_3"
+    assert await auth.verify_jwt_token(other.issue_token(iss=clerk.issuer)) is None
+    await auth.close()
+
+    assert clerk.requests == other.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_number_of_tracked_issuers_is_bounded():
+    """Test that tokens naming ever more issuers stop causing fetches at the limit."""
+    stubs = [JWKSStub(issuer=f"https://issuer{n}.test") for n in range(3)]
+    key_store = JWKSKeyStore(min_refetch_seconds=0, max_issuers=2, http_client=serve(*stubs))
+
+    keys = [await key_store.get_signing_key(stub.issuer, stub.kid) for stub in stubs]
+    await key_store.close()
+
+    assert keys[0] is not None and keys[1] is not None and keys[2] is None
+    assert [stub.requests for stub in stubs] == [1, 1, 0]
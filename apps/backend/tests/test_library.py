@@ -0,0 +1,126 @@
+import base64
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+
+from app.core.auth import get_current_user
+from app.main import app
+from app.models.library import UserLibrary
+from app.schemas.auth import UserProfileResponse
+
+
+@pytest_asyncio.fixture
+async def library(db, factory):
+    """A user whose library holds five books, and a client signed in as them."""
+    user = await factory.user()
+    purchased_at = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    books = []
+    for index, title in enumerate(["Echo", "Alpha", "Delta", "Bravo", "Charlie"]):
+        book = await factory.audiobook(title=f"{title} {uuid.uuid4().hex[:6]}")
+        await factory.purchase(user, book, purchased_at=purchased_at + timedelta(days=index))
+        books.append(book)
+
+    app.dependency_overrides[get_current_user] = lambda: UserProfileResponse.model_validate(user)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield user, books, client
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+async def all_pages(client, **params) -> list:
+    """Follow next_cursor from the first page to the last and return every item."""
+    items, cursor = [], None
+    while True:
+        response = await client.get("/api/v1/library/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page["items"]) <= params["limit"]
+        items += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+@pytest.mark.asyncio
+async def test_cursor_round_trip(library):
+    """Test that paging with the cursor visits every book once in each sort order."""
+    user, books, client = library
+
+    by_purchase = await all_pages(client, sort="purchased", limit=2)
+    assert [item["audiobook_id"] for item in by_purchase] == [str(book.id) for book in reversed(books)]
+
+    by_title = await all_pages(client, sort="title", limit=2)
+    assert [item["title"] for item in by_title] == sorted(book.title for book in books)
+
+    by_download = await all_pages(client, sort="recently_downloaded", limit=3)
+    assert sorted(item["audiobook_id"] for item in by_download) == sorted(str(book.id) for book in books)
+
+
+@pytest.mark.asyncio
+async def test_ordering_is_stable_when_purchase_times_tie(db, library):
+    """Test that books bought in the same instant are neither repeated nor skipped across pages."""
+    user, books, client = library
+    await db.execute(
+        update(UserLibrary).where(UserLibrary.user_id == user.id)
+        .values(purchased_at=datetime(2026, 3, 1, tzinfo=timezone.utc))
+    )
+    await db.commit()
+
+    for limit in (1, 2, 4):
+        items = await all_pages(client, sort="purchased", limit=limit)
+        ids = [item["id"] for item in items]
+        assert len(ids) == 5 and ids == sorted(ids, reverse=True)
+
+
+def encode(value) -> str:
+    raw = value if isinstance(value, bytes) else json.dumps(value).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort, cursor", [
+    ("purchased", "!!!not-base64!!!"),
+    ("purchased", encode(b"not json")),
+    ("purchased", encode({"sort": "purchased"})),
+    ("purchased", encode(["purchased", "yesterday", str(uuid.uuid4())])),
+    ("purchased", encode(["purchased", "2026-03-01T00:00:00", str(uuid.uuid4())])),
+    ("purchased", encode(["purchased", "2026-03-01T00:00:00+00:00", 42])),
+    ("title", encode(["title", 42, str(uuid.uuid4())])),
+])
+async def test_bad_cursor_is_rejected(library, sort, cursor):
+    """Test that garbage or tampered cursors get a 400 rather than a server error."""
+    user, books, client = library
+    response = await client.get("/api/v1/library/", params={"sort": sort, "cursor": cursor})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_cursor_from_another_sort_is_rejected(library):
+    """Test that a cursor only continues the sort order it was issued for."""
+    user, books, client = library
+    first = (await client.get("/api/v1/library/", params={"sort": "title", "limit": 2})).json()
+    response = await client.get("/api/v1/library/", params={"sort": "purchased", "cursor": first["next_cursor"]})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_library_stats(db, library):
+    """Test book and download totals."""
+    user, books, client = library
+    await db.execute(
+        update(UserLibrary).where(UserLibrary.user_id == user.id, UserLibrary.audiobook_id == books[0].id)
+        .values(download_count=3)
+    )
+    await db.execute(
+        update(UserLibrary).where(UserLibrary.user_id == user.id, UserLibrary.audiobook_id == books[1].id)
+        .values(download_count=4)
+    )
+    await db.commit()
+
+    stats = (await client.get("/api/v1/library/stats")).json()
+    assert stats == {"total_audiobooks": 5, "total_downloads": 7, "average_downloads_per_book": 1.4}
@@ -0,0 +1,111 @@
+from urllib.parse import urlsplit
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import storage
+from app.core.auth import get_current_admin_user
+from app.core.config import settings
+from app.core.storage.local import LocalStorage
+from app.main import app
+
+
+@pytest.fixture
+def local(monkeypatch, tmp_path):
+    backend = LocalStorage(
+        root=str(tmp_path),
+        base_url="http://testserver/api/v1/storage",
+        secret="test-secret",
+        public_prefixes=["images/"],
+    )
+    monkeypatch.setattr(storage, "_storage", backend)
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    yield backend
+    app.dependency_overrides.pop(get_current_admin_user, None)
+
+
+def _path(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+def test_signed_upload_and_download(local):
+    """Test uploading to a signed URL, then downloading the file."""
+    client = TestClient(app)
+    presigned = client.post("/api/v1/audio-files/presigned-url", json={
+        "file_name": "chapter.mp3", "file_type": "audio/mpeg",
+    }).json()
+    object_key = local.object_key_from_url(presigned["file_url"])
+    body = bytes(range(256)) * 16
+
+    uploaded = client.put(_path(presigned["upload_url"]), content=body)
+    assert uploaded.status_code == 200
+    assert uploaded.headers["etag"]
+    assert local.get_file_info(object_key)["size"] == len(body)
+
+    # The stored URL alone is not enough to read a private file
+    assert client.get(_path(presigned["file_url"])).status_code == 403
+
+    download_url = local.generate_download_url(object_key)
+    assert client.get(_path(download_url)).content == body
+    assert b"".join(local.iter_range(object_key, 10, 19, chunk_size=3)) == body[10:20]
+
+
+def test_bad_signatures_and_keys_are_refused(local):
+    """Test that tampered tokens, expired URLs and escaping keys are rejected."""
+    client = TestClient(app)
+    url = local.sign_upload_url("audio-files/a.mp3", "audio/mpeg", 3600)
+    assert client.put(_path(url).replace("token=", "token=0"), content=b"x").status_code == 403
+    assert client.put(_path(url).replace("a.mp3", "b.mp3"), content=b"x").status_code == 403
+    assert client.put(_path(local.sign_upload_url("audio-files/a.mp3", "audio/mpeg", -10)),
+                      content=b"x").status_code == 403
+    with pytest.raises(ValueError):
+        local.path_for("audio-files/../../etc/passwd")
+
+    (local.root / "images").mkdir()
+    (local.root / "images" / "cover.jpg").write_bytes(b"jpeg")
+    assert client.get("/api/v1/storage/images/cover.jpg").content == b"jpeg"
+
+
+def test_local_multipart_upload_and_gc(local):
+    """Test the multipart endpoints and object deletion against the filesystem."""
+    client = TestClient(app)
+    upload = client.post("/api/v1/audio-files/multipart-uploads", json={
+        "file_name": "book.mp3", "file_type": "audio/mpeg", "file_size": 12 * 1024 * 1024,
+    }).json()
+    ref = {"object_key": upload["object_key"], "upload_id": upload["upload_id"]}
+    parts = client.post("/api/v1/audio-files/multipart-uploads/parts", json={
+        **ref, "part_numbers": list(range(1, upload["part_count"] + 1)),
+    }).json()["parts"]
+
+    chunks = [bytes([n]) * 10 for n in range(len(parts))]
+    for part, chunk in zip(parts, chunks):
+        assert client.put(_path(part["upload_url"]), content=chunk).status_code == 200
+    assert [item["upload_id"] for item in local.list_multipart_uploads()] == [ref["upload_id"]]
+    assert [item["part_number"] for item in local.list_parts(**ref)] == [part["part_number"] for part in parts]
+
+    completed = client.post("/api/v1/audio-files/multipart-uploads/complete", json={
+        **ref, "part_count": len(parts),
+    })
+    assert completed.status_code == 200
+    assert local.path_for(ref["object_key"]).read_bytes() == b"".join(chunks)
+    assert not local.list_multipart_uploads()
+
+    objects, token = local.list_objects_page("audio-files/")
+    assert [item["object_key"] for item in objects] == [ref["object_key"]] and token is None
+    assert local.delete_objects([ref["object_key"]]) == []
+    assert not local.path_for(ref["object_key"]).exists()
+
+
+def test_local_storage_requires_a_secret(monkeypatch, tmp_path):
+    """Test that the local backend refuses to sign URLs with an empty key."""
+    monkeypatch.setattr(storage, "_storage", None)
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "local")
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_ROOT", str(tmp_path))
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_SECRET", "")
+    monkeypatch.setattr(settings, "CLERK_SECRET_KEY", "sk_test")
+    with pytest.raises(ValueError, match="secret"):
+        storage.get_storage()
+
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_SECRET", "local-secret")
+    assert isinstance(storage.get_storage(), LocalStorage)
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import storage
+from app.core.auth import get_current_admin_user
+from app.core.storage.s3 import S3Storage
+from app.core.upload_janitor import MultipartUploadJanitor
+from app.main import app
+from tests.s3_stub import S3Stub
+
+MIB = 1024 * 1024
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    stub = S3Stub()
+    backend = S3Storage()
+    backend._client = stub
+    backend.bucket_name = "books"
+    monkeypatch.setattr(storage, "_storage", backend)
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    yield stub
+    app.dependency_overrides.pop(get_current_admin_user, None)
+
+
+def test_multipart_upload_resumes_and_completes(s3):
+    """Test creating, partially uploading, resuming and completing a multipart upload."""
+    client = TestClient(app)
+    file_size = 40 * MIB
+    created = client.post("/api/v1/audio-files/multipart-uploads", json={
+        "file_name": "chapter-01.mp3", "file_type": "audio/mpeg", "file_size": file_size,
+    })
+    assert created.status_code == 201
+    upload = created.json()
+    assert upload["object_key"].startswith("audio-files/")
+    assert upload["part_size"] * upload["part_count"] >= file_size
+    ref = {"object_key": upload["object_key"], "upload_id": upload["upload_id"]}
+
+    presigned = client.post("/api/v1/audio-files/multipart-uploads/parts", json={
+        **ref, "part_numbers": list(range(1, upload["part_count"] + 1)),
+    }).json()
+    assert [part["part_number"] for part in presigned["parts"]] == [1, 2, 3]
+    query = parse_qs(urlsplit(presigned["parts"][1]["upload_url"]).query)
+    assert query["partNumber"] == ["2"] and query["uploadId"] == [upload["upload_id"]]
+
+    # The connection drops after parts 1 and 3
+    chunks = [bytes([n]) * 8 for n in range(1, 4)]
+    for number in (1, 3):
+        s3.upload_part(Bucket="books", Key=ref["object_key"], UploadId=ref["upload_id"],
+                       PartNumber=number, Body=chunks[number - 1])
+
+    incomplete = client.post("/api/v1/audio-files/multipart-uploads/complete", json={**ref, "part_count": 3})
+    assert incomplete.status_code == 400
+    assert "[2]" in incomplete.json()["detail"]
+
+    # Resuming lists what is already stored and uploads only the rest
+    listed = client.get("/api/v1/audio-files/multipart-uploads/parts", params=ref).json()
+    assert [part["part_number"] for part in listed["parts"]] == [1, 3]
+    s3.upload_part(Bucket="books", Key=ref["object_key"], UploadId=ref["upload_id"], PartNumber=2, Body=chunks[1])
+
+    completed = client.post("/api/v1/audio-files/multipart-uploads/complete", json={**ref, "part_count": 3})
+    assert completed.status_code == 200
+    assert completed.json()["file_size"] == 24
+    assert s3.objects[ref["object_key"]] == b"".join(chunks)
+    assert not s3.uploads
+
+
+def test_multipart_abort_and_key_check(s3):
+    """Test aborting an upload and refusing keys the API did not hand out."""
+    client = TestClient(app)
+    upload = client.post("/api/v1/audio-files/multipart-uploads", json={
+        "file_name": "a.mp3", "file_type": "audio/mpeg", "file_size": 10 * MIB,
+    }).json()
+
+    foreign = client.post("/api/v1/audio-files/multipart-uploads/abort", json={
+        "object_key": "private/a.mp3", "upload_id": upload["upload_id"],
+    })
+    assert foreign.status_code == 400
+
+    aborted = client.post("/api/v1/audio-files/multipart-uploads/abort", json={
+        "object_key": upload["object_key"], "upload_id": upload["upload_id"],
+    })
+    assert aborted.status_code == 204
+    assert not s3.uploads
+
+
+@pytest.mark.asyncio
+async def test_janitor_aborts_only_stale_uploads(s3):
+    """Test that the janitor aborts uploads older than the cutoff and keeps recent ones."""
+    for number in range(5):
+        s3.create_multipart_upload(Bucket="books", Key=f"audio-files/{number}.mp3")
+    stale_ids = list(s3.uploads)[:3]
+    for upload_id in stale_ids:
+        s3.uploads[upload_id]["initiated"] -= timedelta(days=2)
+
+    janitor = MultipartUploadJanitor(max_age_seconds=86400, interval_seconds=3600)
+    assert await janitor.run_once(now=datetime.now(timezone.utc)) == 3
+    assert not set(stale_ids) & set(s3.uploads)
+    assert len(s3.uploads) == 2
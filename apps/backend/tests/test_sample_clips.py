@@ -0,0 +1,121 @@
+import asyncio
+import struct
+import uuid
+
+import pytest
+
+from app.core import sample_clips, storage
+from app.core.sample_clips import _MAX_BYTES_BEFORE_AUDIO, SampleClipGenerator, build_sample, cut_mp3_sample
+from app.core.storage.local import LocalStorage
+from tests.mp3_frames import FRAME_LENGTH, frame, id3v2
+
+# 44.1 kHz frames of 1152 samples: the first frame at or after 10 s is frame 383
+CUT_FRAME = 383
+
+
+def chapter(frames: int = 2000) -> bytes:
+    xing = b"\x00" * 32 + b"Xing" + struct.pack(">III", 3, frames, frames * FRAME_LENGTH)
+    return id3v2(500) + frame(xing) + b"".join(frame(bytes([i % 256])) for i in range(frames)) + b"TAG" + b"\x00" * 125
+
+
+def test_cut_mp3_sample_at_frame_boundary(tmp_path):
+    """Test that a sample keeps the ID3 tag, drops the Xing frame and ends on a frame boundary."""
+    backend = LocalStorage(root=str(tmp_path), base_url="http://testserver/storage", secret="s")
+    data = chapter()
+    path = backend.path_for("audio-files/chapter.mp3")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(data)
+
+    streamed = []
+    iter_range = backend.iter_range
+
+    def counting_iter_range(*args, **kwargs):
+        for chunk in iter_range(*args, **kwargs):
+            streamed.append(len(chunk))
+            yield chunk
+
+    backend.iter_range = counting_iter_range
+    clip = cut_mp3_sample(backend, "audio-files/chapter.mp3", seconds=10, chunk_size=4096)
+
+    tag = id3v2(500)
+    audio_start = len(tag) + FRAME_LENGTH
+    assert clip == tag + data[audio_start:audio_start + CUT_FRAME * FRAME_LENGTH]
+    assert sum(streamed) < len(data) // 4
+
+    # A chapter shorter than the sample is used whole, without the ID3v1 tag
+    path.write_bytes(chapter(frames=50))
+    clip = cut_mp3_sample(backend, "audio-files/chapter.mp3", seconds=10, chunk_size=4096)
+    assert len(clip) == len(tag) + 50 * FRAME_LENGTH
+
+    path.write_bytes(b"OggS" + b"\x00" * 5000)
+    assert cut_mp3_sample(backend, "audio-files/chapter.mp3", seconds=10, chunk_size=4096) is None
+
+    # A large file with no audio frames is given up on early
+    path.write_bytes(id3v2(500) + b"\x00" * 2_000_000 + chapter())
+    streamed.clear()
+    assert cut_mp3_sample(backend, "audio-files/chapter.mp3", seconds=10, chunk_size=4096) is None
+    assert sum(streamed) <= len(id3v2(500)) + _MAX_BYTES_BEFORE_AUDIO + 4096
+
+
+def test_build_sample_is_idempotent(tmp_path, monkeypatch):
+    """Test that a sample is stored once and an existing one is not cut again."""
+    backend = LocalStorage(root=str(tmp_path), base_url="http://testserver/storage", secret="s")
+    monkeypatch.setattr(storage, "_storage", backend)
+    path = backend.path_for("audio-files/chapter.mp3")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(chapter())
+
+    assert build_sample("audio-files/chapter.mp3", "samples/book/abc-10s.mp3", 10, 4096)
+    sample = backend.path_for("samples/book/abc-10s.mp3")
+    assert sample.stat().st_size == len(id3v2(500)) + CUT_FRAME * FRAME_LENGTH
+
+    # The existing sample is kept without reading the source again
+    path.unlink()
+    assert build_sample("audio-files/chapter.mp3", "samples/book/abc-10s.mp3", 10, 4096)
+
+
+@pytest.mark.asyncio
+async def test_only_generated_samples_in_our_storage_are_replaced(tmp_path, monkeypatch):
+    """Test that samples uploaded by hand, here or elsewhere, are never regenerated."""
+    backend = LocalStorage(root=str(tmp_path), base_url="http://testserver/storage", secret="s")
+    generator = SampleClipGenerator(seconds=10, storage=backend)
+    checksum = "ab" * 32
+    books = [uuid.uuid4() for _ in range(5)]
+    chapter_url = backend.public_url("audio-files/chapter.mp3")
+    sources = [
+        (books[0], None, chapter_url, "audio/mpeg", checksum),
+        (books[1], backend.public_url("samples/old.mp3"), chapter_url, "audio/mpeg", checksum),
+        (books[2], "https://cdn.example.com/samples/uploaded.mp3", chapter_url, "audio/mpeg", checksum),
+        (books[3], backend.public_url("images/uploaded.mp3"), chapter_url, "audio/mpeg", checksum),
+        (books[4], None, chapter_url, "audio/mpeg", None),  # chapter not verified yet
+    ]
+
+    async def get_sample_sources(self):
+        return sources
+
+    monkeypatch.setattr(sample_clips.AsyncAudiobookRepository, "get_sample_sources", get_sample_sources)
+    jobs = await generator.pending(limit=10)
+    assert [job[0] for job in jobs] == books[:2]
+    assert jobs[0][2:] == ("audio-files/chapter.mp3", generator.sample_key(books[0], checksum))
+
+
+@pytest.mark.asyncio
+async def test_batches_run_in_the_background_one_at_a_time(monkeypatch):
+    """Test that start() returns at once and does not overlap batches."""
+    generator = SampleClipGenerator()
+    release = asyncio.Event()
+    runs = []
+
+    async def run_once(limit):
+        runs.append(limit)
+        await release.wait()
+
+    monkeypatch.setattr(generator, "run_once", run_once)
+    assert generator.start(5)
+    assert not generator.start(5)
+    await asyncio.sleep(0)
+    release.set()
+    await generator._task
+    assert generator.start(7)
+    await generator.close()
+    assert runs[0] == 5
@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlsplit
+
+import boto3
+import pytest
+
+from app.core.sigv4 import SigV4Presigner
+
+ENDPOINT = "https://nyc3.digitaloceanspaces.com"
+
+
+def make_clients():
+    boto_client = boto3.client(
+        "s3",
+        endpoint_url=ENDPOINT,
+        aws_access_key_id="test-access-key",
+        aws_secret_access_key="test-secret-key",
+        region_name="nyc3",
+    )
+    signer = SigV4Presigner("test-access-key", "test-secret-key", "nyc3", ENDPOINT)
+    return boto_client, signer
+
+
+def signed_at(url: str) -> datetime:
+    amz_date = parse_qs(urlsplit(url).query)["X-Amz-Date"][0]
+    return datetime.strptime(amz_date, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("key", ["audio-files/chapter-01.mp3", "audio-files/a b+c (1)*.mp3", "images/ü~'x'.jpg"])
+def test_upload_url_matches_botocore(key):
+    """Test that local upload presigning produces botocore's URL, Content-Type included."""
+    boto_client, signer = make_clients()
+    expected = boto_client.generate_presigned_url(
+        "put_object",
+        Params={"Bucket": "books", "Key": key, "ContentType": "audio/mpeg"},
+        ExpiresIn=3600,
+    )
+    url = signer.presign("PUT", "books", key, 3600, headers={"Content-Type": "audio/mpeg"}, now=signed_at(expected))
+    assert url == expected
+
+
+def test_download_url_matches_botocore():
+    """Test that local download presigning produces botocore's URL."""
+    boto_client, signer = make_clients()
+    expected = boto_client.generate_presigned_url(
+        "get_object", Params={"Bucket": "books", "Key": "audio-files/x.m4a"}, ExpiresIn=900
+    )
+    assert signer.presign("GET", "books", "audio-files/x.m4a", 900, now=signed_at(expected)) == expected
+
+
+def test_signing_key_is_cached_per_day():
+    """Test that the derived signing key is reused within a day and rederived after."""
+    _, signer = make_clients()
+    signer.presign("GET", "books", "a.mp3", now=datetime(2026, 1, 1, 9, tzinfo=timezone.utc))
+    first_key = signer._signing_key
+    signer.presign("GET", "books", "b.mp3", now=datetime(2026, 1, 1, 23, tzinfo=timezone.utc))
+    assert signer._signing_key is first_key
+    signer.presign("GET", "books", "a.mp3", now=datetime(2026, 1, 2, 0, tzinfo=timezone.utc))
+    assert signer._signing_key[0] == "20260102"
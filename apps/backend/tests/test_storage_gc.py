@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from app.api.v1.endpoints import audiobooks
+from app.core import storage
+from app.core.auth import get_current_admin_user
+from app.core.storage.s3 import S3Storage
+from app.core.storage_gc import StorageDeleter, StorageReconciler
+from app.main import app
+from tests.s3_stub import S3Stub
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    stub = S3Stub()
+    backend = S3Storage()
+    backend._client = stub
+    backend.bucket_name = "books"
+    backend.public_url_base = "https://cdn.test"
+    monkeypatch.setattr(storage, "_storage", backend)
+    return stub
+
+
+@pytest.mark.asyncio
+async def test_deleter_sends_batches_of_1000(s3):
+    """Test that queued deletes go out as delete_objects calls of at most 1000 keys."""
+    keys = [f"audio-files/{n}.mp3" for n in range(2500)]
+    for key in keys:
+        s3.put_object(Bucket="books", Key=key, Body=b"x")
+
+    deleter = StorageDeleter()
+    deleter.enqueue(keys)
+    deleter.enqueue(keys[:10])  # duplicates are queued once
+    assert len(deleter) == 2500
+    assert await deleter.flush() == 2500
+    assert [len(batch) for batch in s3.delete_batches] == [1000, 1000, 500]
+    assert not s3.objects
+
+
+@pytest.mark.asyncio
+async def test_reconciler_finds_old_unreferenced_objects(s3):
+    """Test that only unreferenced objects older than the grace period are orphans."""
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=3)
+    s3.put_object(Bucket="books", Key="audio-files/kept.mp3", Body=b"x", LastModified=old)
+    s3.put_object(Bucket="books", Key="audio-files/orphan-1.mp3", Body=b"x", LastModified=old)
+    s3.put_object(Bucket="books", Key="images/orphan-2.jpg", Body=b"x", LastModified=old)
+    s3.put_object(Bucket="books", Key="images/cover.jpg", Body=b"x", LastModified=old)
+    s3.put_object(Bucket="books", Key="audio-files/just-uploaded.mp3", Body=b"x", LastModified=now)
+    s3.put_object(Bucket="books", Key="private/other.bin", Body=b"x", LastModified=old)
+
+    reconciler = StorageReconciler(
+        StorageDeleter(), prefixes=["audio-files/", "images/"],
+        grace_seconds=86400, interval_seconds=3600, max_deletes_per_run=100,
+    )
+
+    async def referenced_keys():
+        return {"audio-files/kept.mp3", "images/cover.jpg"}
+
+    reconciler.referenced_keys = referenced_keys
+    result = await reconciler.find_orphans(now)
+    assert result["scanned"] == 5
+    assert sorted(result["orphans"]) == ["audio-files/orphan-1.mp3", "images/orphan-2.jpg"]
+
+
+def test_only_urls_under_the_public_base_are_owned():
+    """Test that deletions never derive keys from URLs outside our storage."""
+    backend = S3Storage()
+    backend.public_url_base = "https://cdn.test"
+    assert backend.owned_object_key("https://cdn.test/images/a%20b.jpg") == "images/a b.jpg"
+    assert backend.owned_object_key("https://images.example.com/images/cover.jpg") is None
+    assert backend.owned_object_key("https://cdn.test.evil.com/images/cover.jpg") is None
+
+    backend.public_url_base = ""
+    assert backend.owned_object_key("https://cdn.test/images/cover.jpg") is None
+
+
+@pytest.mark.asyncio
+async def test_reconciler_needs_a_public_url_base(s3):
+    """Test that nothing is reconciled when stored URLs cannot be matched to keys."""
+    storage.get_storage().public_url_base = ""
+    deleter = StorageDeleter()
+    reconciler = StorageReconciler(
+        deleter, prefixes=["images/"], grace_seconds=0, interval_seconds=3600, max_deletes_per_run=100,
+    )
+    assert (await reconciler.run_once())["skipped"]
+    assert len(deleter) == 0
+
+
+@pytest.mark.asyncio
+async def test_deleting_an_audiobook_leaves_external_files_alone(db, factory, s3, monkeypatch):
+    """Test that only files in our storage are queued when an audiobook is deleted."""
+    audiobook = await factory.audiobook(
+        cover_image_url="https://images.example.com/images/cover.jpg",
+        sample_url="https://cdn.test/samples/clip.mp3",
+    )
+    deleter = StorageDeleter()
+    monkeypatch.setattr(audiobooks, "storage_deleter", deleter)
+
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            response = await client.delete(f"/api/v1/audiobooks/{audiobook.id}")
+    finally:
+        app.dependency_overrides.pop(get_current_admin_user, None)
+
+    assert response.status_code == 204
+    assert list(deleter._pending) == ["samples/clip.mp3"]
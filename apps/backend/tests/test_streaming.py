@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import storage
+from app.core.storage.local import LocalStorage
+from app.core.streaming import RangeNotSatisfiable, if_range_matches, parse_range
+from app.main import app
+
+
+def test_parse_range():
+    """Test single, open-ended, suffix, clamped and coalesced byte ranges."""
+    assert parse_range("bytes=0-99", 1000) == (0, 99)
+    assert parse_range("bytes=500-", 1000) == (500, 999)
+    assert parse_range("bytes=-100", 1000) == (900, 999)
+    assert parse_range("bytes=-5000", 1000) == (0, 999)
+    assert parse_range("bytes=900-5000", 1000) == (900, 999)
+    assert parse_range("bytes=0-9, 50-59", 1000) == (0, 59)
+    assert parse_range("bytes=0-9, 2000-", 1000) == (0, 9)
+
+    # Missing, malformed or foreign units mean "send the whole file"
+    for header in (None, "", "items=0-9", "bytes=9-0", "bytes=abc", "bytes=-", "bytes=0-9;x"):
+        assert parse_range(header, 1000) is None
+
+    for header in ("bytes=1000-", "bytes=2000-3000", "bytes=-0"):
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range(header, 1000)
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=0-", 0)
+
+
+def test_if_range_matches():
+    """Test that If-Range only matches the current strong ETag or exact Last-Modified."""
+    modified = datetime(2026, 5, 1, 12, 30, 15, 250000, tzinfo=timezone.utc)
+    assert if_range_matches(None, '"abc"', modified)
+    assert if_range_matches('"abc"', '"abc"', modified)
+    assert not if_range_matches('"old"', '"abc"', modified)
+    assert not if_range_matches('W/"abc"', 'W/"abc"', modified)
+    assert if_range_matches("Fri, 01 May 2026 12:30:15 GMT", '"abc"', modified)
+    assert not if_range_matches("Fri, 01 May 2026 12:30:14 GMT", '"abc"', modified)
+    assert not if_range_matches("not a date", '"abc"', modified)
+
+
+@pytest.fixture
+def local(monkeypatch, tmp_path):
+    backend = LocalStorage(root=str(tmp_path), base_url="http://testserver/api/v1/storage", secret="test-secret")
+    monkeypatch.setattr(storage, "_storage", backend)
+    return backend
+
+
+def test_ranged_responses(local, monkeypatch):
+    """Test 206 partial content, If-Range fallback to 200, 416 and the open-ended range cap."""
+    body = bytes(range(256)) * 64
+    path = local.path_for("audio-files/a.mp3")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(body)
+    info = local.get_file_info("audio-files/a.mp3")
+    url = local.generate_download_url("audio-files/a.mp3").removeprefix("http://testserver")
+    client = TestClient(app)
+
+    ranged = client.get(url, headers={"Range": "bytes=100-199"})
+    assert ranged.status_code == 206
+    assert ranged.headers["content-range"] == f"bytes 100-199/{len(body)}"
+    assert ranged.headers["content-type"] == "audio/mpeg"
+    assert ranged.content == body[100:200]
+
+    stale = client.get(url, headers={"Range": "bytes=100-199", "If-Range": '"stale"'})
+    assert stale.status_code == 200 and stale.content == body
+    fresh = client.get(url, headers={"Range": "bytes=100-199", "If-Range": info["etag"]})
+    assert fresh.status_code == 206
+
+    unsatisfiable = client.get(url, headers={"Range": f"bytes={len(body)}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(body)}"
+
+    # A seek asks for the rest of the file but gets a bounded slice
+    monkeypatch.setattr("app.core.streaming.settings.STREAM_MAX_RANGE_BYTES", 1000)
+    seek = client.get(url, headers={"Range": "bytes=5000-"})
+    assert seek.status_code == 206
+    assert seek.headers["content-range"] == f"bytes 5000-5999/{len(body)}"
+    assert seek.content == body[5000:6000]
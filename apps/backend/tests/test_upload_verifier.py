@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+import uuid
+
+import pytest
+
+from app.core.audio_formats import sniff_mime_type
+from app.core.storage.local import LocalStorage
+from app.core.upload_verifier import AudioFileVerifier, inspect_object
+from app.models.audio_file import AudioFile
+from app.repositories.audio_file import AsyncAudioFileRepository
+from tests.mp3_frames import id3v2
+
+
+def test_sniff_mime_type():
+    """Test recognising audio containers from their first bytes."""
+    assert sniff_mime_type(b"ID3\x04\x00\x00\x00\x00\x00\x00") == "audio/mpeg"
+    assert sniff_mime_type(b"\xff\xfb\x90\x64") == "audio/mpeg"
+    assert sniff_mime_type(b"\xff\xf1\x50\x80") == "audio/aac"
+    assert sniff_mime_type(b"\x00\x00\x00\x20ftypM4B \x00\x00\x00\x00") == "audio/mp4"
+    assert sniff_mime_type(b"\x00\x00\x00\x20ftypqt  \x00\x00\x00\x00") is None
+    assert sniff_mime_type(b"OggS\x00\x02") == "audio/ogg"
+    assert sniff_mime_type(b"fLaC\x00\x00\x00\x22") == "audio/flac"
+    assert sniff_mime_type(b"RIFF\x24\x08\x00\x00WAVEfmt ") == "audio/wav"
+    assert sniff_mime_type(b"%PDF-1.7") is None
+
+
+def test_inspect_object_streams_in_chunks(tmp_path):
+    """Test that size, checksum and sniffed type match the stored bytes."""
+    storage = LocalStorage(root=str(tmp_path), base_url="http://testserver/storage", secret="s")
+    body = b"ID3\x04\x00" + bytes(range(256)) * 1000
+    path = storage.path_for("audio-files/a.bin")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(body)
+
+    values = inspect_object(storage, "audio-files/a.bin", chunk_size=1000)
+    assert values == {
+        "file_size_bytes": len(body),
+        "mime_type": "audio/mpeg",
+        "checksum": hashlib.sha256(body).hexdigest(),
+        "duration_seconds": None,
+        "bitrate_bps": None,
+        "sample_rate_hz": None,
+        "seek_index": None,
+    }
+    assert inspect_object(storage, "audio-files/missing.mp3", chunk_size=1000) is None
+
+
+@pytest.mark.asyncio
+async def test_verifier_bounds_concurrency():
+    """Test that a bulk upload is verified by at most ``workers`` files at a time."""
+    verifier = AudioFileVerifier(workers=3)
+    running = 0
+    peak = 0
+
+    async def verify(audio_file_id):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        if audio_file_id == failing:
+            raise RuntimeError("storage unavailable")
+        return {}
+
+    verifier.verify = verify
+    ids = [uuid.uuid4() for _ in range(50)]
+    failing = ids[7]
+
+    verifier.start()
+    verifier.enqueue(ids)
+    await verifier.join()
+    await verifier.close()
+    assert peak == 3
+    assert (verifier.verified, verifier.failed) == (49, 1)
+
+
+@pytest.mark.asyncio
+async def test_unverified_files_are_found_until_verified(db, factory, tmp_path):
+    """Test that client-sent checksums do not count as verified, and files without a seek index are verified once."""
+    storage = LocalStorage(root=str(tmp_path), base_url="http://testserver/storage", secret="s")
+    body = id3v2(100) + b"\x00" * 5000  # claims to be MP3 but has no frames, so no seek index
+    path = storage.path_for("audio-files/chapter.mp3")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(body)
+
+    audiobook = await factory.audiobook()
+    audio_file = AudioFile(
+        audiobook_id=audiobook.id,
+        chapter_number=1,
+        file_url=storage.public_url("audio-files/chapter.mp3"),
+        mime_type="audio/mpeg",
+        checksum="0" * 64,  # sent by the client
+    )
+    db.add(audio_file)
+    await db.commit()
+
+    repo = AsyncAudioFileRepository(db)
+    assert audio_file.id in await repo.get_unverified_ids(limit=10000)
+
+    values = await AudioFileVerifier(storage=storage).verify(audio_file.id)
+    assert values["seek_index"] is None
+    assert values["checksum"] == hashlib.sha256(body).hexdigest()
+
+    await db.refresh(audio_file)
+    assert audio_file.verified_at is not None and audio_file.checksum == values["checksum"]
+    assert audio_file.id not in await repo.get_unverified_ids(limit=10000)
@@ -0,0 +1,148 @@
+import time
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.core.auth import ClerkAuth
+from app.core.config import settings
+from app.models.enums import UserRole
+from app.models.user import UserProfile
+from app.repositories.user import AsyncUserRepository
+from app.schemas.auth import ClerkUser
+
+
+def clerk_user(clerk_user_id: str, updated_at: int, email: str = None, **values) -> ClerkUser:
+    email = email or f"{clerk_user_id}@example.com"
+    return ClerkUser(
+        id=clerk_user_id,
+        email_addresses=[{"id": "idn_1", "email_address": email}],
+        primary_email_address_id="idn_1",
+        updated_at=updated_at,
+        **values,
+    )
+
+
+@pytest_asyncio.fixture
+async def users(db, factory):
+    """Repository plus a function that loads (and schedules cleanup of) synced profiles."""
+    async def load(clerk_user_id: str) -> UserProfile:
+        db.expire_all()
+        user = await db.scalar(select(UserProfile).where(UserProfile.clerk_user_id == clerk_user_id))
+        if user is not None and user.id not in factory.user_ids:
+            factory.track_user(user.id)
+        return user
+
+    return AsyncUserRepository(db), load
+
+
+def new_clerk_id() -> str:
+    return f"user_test_{uuid.uuid4().hex}"
+
+
+@pytest.mark.asyncio
+async def test_batch_upsert_keeps_the_newest_event_per_user(users, monkeypatch):
+    """Test that one statement inserts a batch and duplicates resolve to the latest data."""
+    monkeypatch.setattr(settings, "BOOTSTRAP_ADMIN_EMAILS", "nobody@example.com")
+    repo, load = users
+    first, second = new_clerk_id(), new_clerk_id()
+
+    upserted = await repo.upsert_from_clerk([
+        clerk_user(first, 2000, first_name="New"),
+        clerk_user(first, 1000, first_name="Old"),
+        clerk_user(second, 1000, first_name="Only"),
+    ])
+
+    assert upserted == 2
+    assert (await load(first)).first_name == "New"
+    assert (await load(second)).first_name == "Only"
+
+
+@pytest.mark.asyncio
+async def test_update_keeps_role_and_ignores_stale_events(users, factory):
+    """Test that updates leave roles alone and out-of-order deliveries change nothing."""
+    repo, load = users
+    clerk_id = new_clerk_id()
+    await factory.user(clerk_user_id=clerk_id, role=UserRole.ADMIN, first_name="Jit")
+
+    # A just-in-time profile has no Clerk timestamp yet, so any event applies
+    assert await repo.upsert_from_clerk([clerk_user(clerk_id, 2000, first_name="Ada")]) == 1
+    assert await repo.upsert_from_clerk([clerk_user(clerk_id, 1000, first_name="Stale")]) == 0
+    assert await repo.upsert_from_clerk([clerk_user(clerk_id, 2000, first_name="Replay")]) == 0
+
+    user = await load(clerk_id)
+    assert (user.first_name, user.role) == ("Ada", UserRole.ADMIN)
+    assert user.clerk_updated_at.timestamp() == 2
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_admin_emails(users, monkeypatch):
+    """Test that only configured emails get the admin role on first sync."""
+    monkeypatch.setattr(settings, "BOOTSTRAP_ADMIN_EMAILS", " Boss@Example.com ,other@example.com")
+    repo, load = users
+    boss, customer = new_clerk_id(), new_clerk_id()
+
+    await repo.upsert_from_clerk([clerk_user(customer, 1000), clerk_user(boss, 1000, email="boss@example.com")])
+
+    assert (await load(boss)).role == UserRole.ADMIN
+    assert (await load(customer)).role == UserRole.CUSTOMER
+
+
+@pytest.mark.asyncio
+async def test_mark_deleted(users, factory):
+    """Test that deletion is recorded once and the row is kept."""
+    repo, load = users
+    user = await factory.user()
+
+    assert await repo.mark_deleted([user.clerk_user_id, new_clerk_id()]) == 1
+    assert await repo.mark_deleted([user.clerk_user_id]) == 0
+    assert await repo.mark_deleted([]) == 0
+    assert (await load(user.clerk_user_id)).deleted_at is not None
+
+
+@pytest.mark.asyncio
+async def test_first_sign_in_before_the_webhook_creates_the_profile(db, users, monkeypatch):
+    """Test just-in-time provisioning through get_user_from_token, and that the webhook still applies afterwards."""
+    monkeypatch.setattr(settings, "CLERK_JIT_PROVISIONING", True)
+    monkeypatch.setattr(settings, "BOOTSTRAP_ADMIN_EMAILS", "nobody@example.com")
+    repo, load = users
+    clerk_id = new_clerk_id()
+    auth = ClerkAuth("sk_test")
+
+    async def verify_jwt_token(token):
+        return {"sub": clerk_id, "exp": time.time() + 60}
+
+    async def get_clerk_user(user_id, expires_at=None):
+        return clerk_user(user_id, 2000, first_name="Ada")
+
+    monkeypatch.setattr(auth, "verify_jwt_token", verify_jwt_token)
+    monkeypatch.setattr(auth, "get_clerk_user", get_clerk_user)
+
+    profile = await auth.get_user_from_token("token", db)
+    await auth.close()
+
+    user = await load(clerk_id)
+    assert profile.id == user.id and profile.role == UserRole.CUSTOMER
+    assert user.first_name == "Ada" and user.clerk_updated_at.timestamp() == 2
+    # A webhook for the same Clerk data is not applied twice; newer data is
+    assert await repo.upsert_from_clerk([clerk_user(clerk_id, 2000, first_name="Old")]) == 0
+    assert await repo.upsert_from_clerk([clerk_user(clerk_id, 3000, first_name="Grace")]) == 1
+
+
+@pytest.mark.asyncio
+async def test_deleted_user_is_rejected_by_auth(db, users, factory, monkeypatch):
+    """Test that a valid token for a user deleted in Clerk no longer authenticates."""
+    repo, load = users
+    user = await factory.user()
+    auth = ClerkAuth("sk_test")
+
+    async def verify_jwt_token(token):
+        return {"sub": user.clerk_user_id, "exp": time.time() + 60}
+
+    monkeypatch.setattr(auth, "verify_jwt_token", verify_jwt_token)
+
+    assert (await auth.get_user_from_token("token", db)).id == user.id
+    await repo.mark_deleted([user.clerk_user_id])
+    assert await auth.get_user_from_token("token", db) is None
+    await auth.close()
@@ -24,6 +24,151 @@ interface UploadProgress {
   percentage: number;
 }
 
+interface MultipartUpload {
+  upload_id: string;
+  object_key: string;
+  file_url: string;
+  part_size: number;
+  part_count: number;
+}
+
+// Files above this size are uploaded in parts, in parallel, and can resume
+// after a dropped connection or page reload instead of starting over.
+const MULTIPART_THRESHOLD = 32 * 1024 * 1024;
+const PART_CONCURRENCY = 4;
+const PART_RETRIES = 3;
+
+const multipartEndpoint = (path = '') =>
+  `${apiConfig.endpoints.audioFiles.replace(/\/$/, '')}` +
+  `/multipart-uploads${path}`;
+
+const resumeKey = (file: File) =>
+  `multipart-upload:${file.name}:${file.size}:${file.lastModified}`;
+
+const presignParts = async (
+  upload: MultipartUpload,
+  partNumbers: number[]
+): Promise<Map<number, string>> => {
+  const { parts } = await apiRequest(multipartEndpoint('/parts'), {
+    method: 'POST',
+    body: JSON.stringify({
+      object_key: upload.object_key,
+      upload_id: upload.upload_id,
+      part_numbers: partNumbers,
+    }),
+  });
+  return new Map(
+    parts.map((part: { part_number: number; upload_url: string }) => [
+      part.part_number,
+      part.upload_url,
+    ])
+  );
+};
+
+// Reuse an unfinished upload of the same file if the server still has it
+const resumeOrCreateUpload = async (
+  file: File
+): Promise<{ upload: MultipartUpload; uploaded: Map<number, number> }> => {
+  const saved = localStorage.getItem(resumeKey(file));
+  if (saved) {
+    const upload: MultipartUpload = JSON.parse(saved);
+    try {
+      const params = new URLSearchParams({
+        object_key: upload.object_key,
+        upload_id: upload.upload_id,
+      });
+      const { parts } = await apiRequest(
+        `${multipartEndpoint('/parts')}?${params}`
+      );
+      return {
+        upload,
+        uploaded: new Map(
+          parts.map((part: { part_number: number; size: number }) => [
+            part.part_number,
+            part.size,
+          ])
+        ),
+      };
+    } catch {
+      localStorage.removeItem(resumeKey(file));
+    }
+  }
+
+  const upload: MultipartUpload = await apiRequest(multipartEndpoint(), {
+    method: 'POST',
+    body: JSON.stringify({
+      file_name: file.name,
+      file_type: file.type,
+      file_size: file.size,
+    }),
+  });
+  localStorage.setItem(resumeKey(file), JSON.stringify(upload));
+  return { upload, uploaded: new Map() };
+};
+
+const uploadMultipart = async (
+  file: File,
+  onProgress: (loaded: number) => void
+): Promise<string> => {
+  const { upload, uploaded } = await resumeOrCreateUpload(file);
+  let loaded = Array.from(uploaded.values()).reduce((a, b) => a + b, 0);
+  onProgress(loaded);
+
+  const pending: number[] = [];
+  for (let part = 1; part <= upload.part_count; part++) {
+    if (!uploaded.has(part)) pending.push(part);
+  }
+  const urls = pending.length
+    ? await presignParts(upload, pending)
+    : new Map<number, string>();
+
+  const uploadPart = async (partNumber: number) => {
+    const start = (partNumber - 1) * upload.part_size;
+    const body = file.slice(start, start + upload.part_size);
+    for (let attempt = 1; ; attempt++) {
+      try {
+        // URLs expire after an hour; fetch a fresh one when retrying
+        const url =
+          attempt === 1
+            ? urls.get(partNumber)
+            : (await presignParts(upload, [partNumber])).get(partNumber);
+        const response = await fetch(url!, { method: 'PUT', body });
+        if (!response.ok) {
+          throw new Error(`Part ${partNumber} failed: ${response.status}`);
+        }
+        loaded += body.size;
+        onProgress(loaded);
+        return;
+      } catch (err) {
+        if (attempt >= PART_RETRIES) throw err;
+        await new Promise(resolve => setTimeout(resolve, 1000 * 2 ** attempt));
+      }
+    }
+  };
+
+  // A few parts in flight at once; each worker takes the next pending part
+  const queue = [...pending];
+  const workers = Math.min(PART_CONCURRENCY, queue.length);
+  await Promise.all(
+    Array.from({ length: workers }, async () => {
+      while (queue.length) {
+        await uploadPart(queue.shift()!);
+      }
+    })
+  );
+
+  const { file_url } = await apiRequest(multipartEndpoint('/complete'), {
+    method: 'POST',
+    body: JSON.stringify({
+      object_key: upload.object_key,
+      upload_id: upload.upload_id,
+      part_count: upload.part_count,
+    }),
+  });
+  localStorage.removeItem(resumeKey(file));
+  return file_url;
+};
+
 export function FileUpload({
   onFileUploaded,
   fileType = 'audio',
@@ -75,30 +220,40 @@ export function FileUpload({
     setSuccess(false);
 
     try {
-      // Step 1: Get pre-signed URL from backend
-      const { upload_url, file_url } = await apiRequest(
-        apiConfig.endpoints.presignedUrl,
-        {
+      let file_url: string;
+      if (file.size > MULTIPART_THRESHOLD) {
+        // Large files: resumable multipart upload
+        file_url = await uploadMultipart(file, loaded =>
+          setUploadProgress({
+            loaded,
+            total: file.size,
+            percentage: Math.round((loaded / file.size) * 100),
+          })
+        );
+      } else {
+        // Step 1: Get pre-signed URL from backend
+        const presigned = await apiRequest(apiConfig.endpoints.presignedUrl, {
           method: 'POST',
           body: JSON.stringify({
             file_name: file.name,
             file_type: file.type,
             file_size: file.size,
           }),
-        }
-      );
+        });
+        file_url = presigned.file_url;
 
-      // Step 2: Upload file directly to DigitalOcean Spaces
-      const uploadResponse = await fetch(upload_url, {
-        method: 'PUT',
-        body: file,
-        headers: {
-          'Content-Type': file.type,
-        },
-      });
+        // Step 2: Upload file directly to DigitalOcean Spaces
+        const uploadResponse = await fetch(presigned.upload_url, {
+          method: 'PUT',
+          body: file,
+          headers: {
+            'Content-Type': file.type,
+          },
+        });
 
-      if (!uploadResponse.ok) {
-        throw new Error('Failed to upload file');
+        if (!uploadResponse.ok) {
+          throw new Error('Failed to upload file');
+        }
       }
 
       // Step 3: Get file duration for audio files